@@ -1,22 +1,50 @@
 """CLI entry point for the multi-agent startup evaluator."""
 
 import sys
+import uuid
 
 from src.client import get_client
-from src.pipeline import run_pipeline
+from src.pipeline import resume, run_pipeline
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python main.py \"<startup idea>\"")
+    args = sys.argv[1:]
+    if args and args[0] == "bench":
+        from src.bench.cli import main as bench_main
+        sys.exit(bench_main(args[1:]))
+    if args and args[0] == "batch":
+        from src.batch.cli import main as batch_main
+        sys.exit(batch_main(args[1:]))
+    if args and args[0] == "worker":
+        from src.gateway.worker import main as worker_main
+        sys.exit(worker_main(args[1:]))
+
+    # Screening mode: stop running specialists once GO/NO-GO is settled
+    early_decision = bool(args) and args[0] == "--early-decision"
+    if early_decision:
+        args = args[1:]
+    options = {"concurrent": True, "early_decision": True} if early_decision else {}
+
+    if len(args) < 1 or (args[0] in ("--resume", "--checkpoint") and len(args) < 2):
+        print("Usage: python main.py [--early-decision] [--checkpoint] \"<startup idea>\"")
+        print("       python main.py [--early-decision] --resume <evaluation id>")
+        print("       python main.py batch <ideas.jsonl|ideas.csv> --out <results.jsonl> [--help]")
+        print("       python main.py worker [--concurrency N]")
+        print("       python main.py bench [--help]")
         print()
         print("Example:")
         print('  python main.py "An AI platform that optimizes indoor farming"')
         sys.exit(1)
 
-    idea = " ".join(sys.argv[1:])
     client = get_client()
-    state = run_pipeline(client, idea)
+    if args[0] == "--resume":
+        state = resume(client, args[1], **options)
+    elif args[0] == "--checkpoint":
+        evaluation_id = uuid.uuid4().hex[:12]
+        print(f"Evaluation ID: {evaluation_id} (resume with: python main.py --resume {evaluation_id})")
+        state = run_pipeline(client, " ".join(args[1:]), evaluation_id=evaluation_id, **options)
+    else:
+        state = run_pipeline(client, " ".join(args), **options)
 
     print(f"\nFinal recommendation: {state.recommendation}")
     print(f"Average score: {state.average_score:.1f}/10")
@@ -0,0 +1,23 @@
+#!/bin/bash
+# Start the fake LlamaStack server for load and latency testing (no Ollama needed)
+# Reads FAKESTACK_PORT and FAKESTACK_PROFILE from .env or environment
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+PROJECT_DIR="$(dirname "$SCRIPT_DIR")"
+
+source "$PROJECT_DIR/.venv/bin/activate"
+
+# Load .env if present
+if [ -f "$PROJECT_DIR/.env" ]; then
+    set -a
+    source "$PROJECT_DIR/.env"
+    set +a
+fi
+
+export FAKESTACK_PORT="${FAKESTACK_PORT:-8321}"
+export FAKESTACK_PROFILE="${FAKESTACK_PROFILE:-$PROJECT_DIR/config/fakestack-profile.yaml}"
+
+echo "Fake LlamaStack: http://0.0.0.0:$FAKESTACK_PORT"
+echo "Profile: $FAKESTACK_PROFILE"
+echo ""
+
+python -m src.fakestack.server
@@ -1,9 +1,27 @@
 """Base helpers for creating and running agents."""
 
+import asyncio
 import re
-from typing import Callable
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable
 
-from llama_stack_client import Agent, LlamaStackClient
+from llama_stack_client import Agent, AsyncLlamaStackClient, LlamaStackClient
+from llama_stack_client.lib.agents.agent import AsyncAgent
+
+from src.agents.pool import AgentSpec, get_agent_pool, get_async_agent_pool
+from src.agents.response_cache import get_response_cache
+from src.config import AGENT_POOL
+from src.limiter import TURN, limited, limited_async
+from src.state import AgentEvaluation
+
+# Receives the text deltas of async agent turns run in the current context.
+# Set per stage by the streaming pipeline; when unset, turns are not streamed.
+turn_deltas: ContextVar[Callable[[str], None] | None] = ContextVar("turn_deltas", default=None)
+
+# Admits async agent turns by model (the gateway's ModelScheduler); anything
+# with a ``turn(model)`` async context manager. When unset, turns run immediately.
+turn_scheduler: ContextVar[Any | None] = ContextVar("turn_scheduler", default=None)
 
 
 def create_agent(
@@ -21,19 +39,123 @@ def create_agent(
     )
 
 
-def run_agent_turn(agent: Agent, session_id: str, message: str) -> str:
-    """Run a single agent turn and return the text output."""
-    response = agent.create_turn(
-        session_id=session_id,
-        messages=[{"role": "user", "content": message}],
-        stream=False,
+def create_async_agent(
+    client: AsyncLlamaStackClient,
+    model: str,
+    instructions: str,
+    tools: list[Callable] | None = None,
+) -> AsyncAgent:
+    """Create a LlamaStack agent bound to the async client."""
+    return AsyncAgent(
+        client,
+        model=model,
+        instructions=instructions,
+        tools=tools or [],
     )
+
+
+@contextmanager
+def agent_session(client: LlamaStackClient, spec: AgentSpec):
+    """Yield (agent, session_id) for ``spec``, from the agent pool when enabled."""
+    if AGENT_POOL == "off":
+        agent = create_agent(client, spec.model, spec.instructions, list(spec.tools))
+        yield agent, agent.create_session(spec.session_name)
+        return
+    with get_agent_pool(client).lease(spec) as leased:
+        yield leased
+
+
+@asynccontextmanager
+async def agent_session_async(client: AsyncLlamaStackClient, spec: AgentSpec):
+    """Async variant of agent_session."""
+    if AGENT_POOL == "off":
+        agent = create_async_agent(client, spec.model, spec.instructions, list(spec.tools))
+        yield agent, await agent.create_session(spec.session_name)
+        return
+    async with get_async_agent_pool(client).lease(spec) as leased:
+        yield leased
+
+
+def _turn_text(response) -> str:
     content = response.output_message.content
     if isinstance(content, list):
         return " ".join(str(c) for c in content)
     return str(content)
 
 
+def run_agent_turn(agent: Agent, session_id: str, message: str) -> str:
+    """Run a single agent turn and return the text output.
+
+    When the response cache is enabled (LLM_CACHE), an identical agent
+    config and message is answered from the cache without a server call.
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cached = cache.get(agent.agent_config, message)
+        if cached is not None:
+            return cached
+
+    with limited(TURN):
+        response = agent.create_turn(
+            session_id=session_id,
+            messages=[{"role": "user", "content": message}],
+            stream=False,
+        )
+    output = _turn_text(response)
+    if cache is not None:
+        cache.put(agent.agent_config, message, output)
+    return output
+
+
+async def _stream_turn(agent: AsyncAgent, session_id: str, message: str, on_delta: Callable[[str], None]):
+    """Run a streamed turn, passing text deltas to ``on_delta``; returns the completed turn."""
+    last = None
+    stream = await agent.create_turn(
+        session_id=session_id,
+        messages=[{"role": "user", "content": message}],
+        stream=True,
+    )
+    async for chunk in stream:
+        payload = chunk.event.payload
+        if payload.event_type == "step_progress" and getattr(payload.delta, "type", None) == "text":
+            on_delta(payload.delta.text)
+        last = chunk
+    return last.event.payload.turn
+
+
+async def run_agent_turn_async(agent: AsyncAgent, session_id: str, message: str) -> str:
+    """Run a single agent turn on the event loop and return the text output.
+
+    If a ``turn_deltas`` callback is set in the current context, the turn
+    is streamed and each text delta is passed to it as it arrives. If a
+    ``turn_scheduler`` is set, the turn waits for it to admit the agent's model.
+    """
+    on_delta = turn_deltas.get()
+    cache = get_response_cache()
+    if cache is not None:
+        # The cache locks and may hit SQLite, so keep it off the event loop
+        cached = await asyncio.to_thread(cache.get, agent.agent_config, message)
+        if cached is not None:
+            if on_delta is not None:
+                on_delta(cached)
+            return cached
+
+    scheduler = turn_scheduler.get()
+    async with scheduler.turn(agent.agent_config["model"]) if scheduler else nullcontext(), limited_async(TURN):
+        if on_delta is not None:
+            response = await _stream_turn(agent, session_id, message, on_delta)
+        else:
+            response = await agent.create_turn(
+                session_id=session_id,
+                messages=[{"role": "user", "content": message}],
+                stream=False,
+            )
+    output = _turn_text(response)
+    if cache is not None:
+        await asyncio.to_thread(cache.put, agent.agent_config, message, output)
+    return output
+
+
 def extract_score(text: str) -> float:
     """Extract a numeric score (0-10) from agent output.
 
@@ -50,3 +172,13 @@ def extract_score(text: str) -> float:
             score = float(match.group(1))
             return min(score, 10.0)
     return 5.0  # default if no score found
+
+
+def evaluation_from_output(agent_name: str, output: str) -> AgentEvaluation:
+    """Build a specialist's AgentEvaluation from its raw turn output."""
+    return AgentEvaluation(
+        agent_name=agent_name,
+        score=extract_score(output),
+        analysis=output,
+        raw_output=output,
+    )
@@ -1,8 +1,14 @@
 """Coordinator agent -- decomposes ideas and synthesizes final reports."""
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.agents.base import create_agent, run_agent_turn
+from src.agents.base import (
+    AgentSpec,
+    agent_session,
+    agent_session_async,
+    run_agent_turn,
+    run_agent_turn_async,
+)
 from src.config import COORDINATOR_MODEL
 from src.state import EvaluationState
 
@@ -26,35 +32,43 @@ You are the lead coordinator of a startup evaluation team. You have two responsi
 Keep responses concise and structured.
 """
 
+# Minimum average specialist score for a GO recommendation
+GO_THRESHOLD = 6.0
+
+BRIEF_AGENT = AgentSpec(
+    model=COORDINATOR_MODEL,
+    instructions=COORDINATOR_INSTRUCTIONS,
+    session_name="coordinator-brief",
+)
+SYNTHESIS_AGENT = AgentSpec(
+    model=COORDINATOR_MODEL,
+    instructions=COORDINATOR_INSTRUCTIONS,
+    session_name="coordinator-synthesis",
+)
 
-def create_brief(client: LlamaStackClient, state: EvaluationState) -> str:
-    """Have the coordinator create a structured brief from the startup idea."""
-    agent = create_agent(client, COORDINATOR_MODEL, COORDINATOR_INSTRUCTIONS)
-    session = agent.create_session("coordinator-brief")
 
-    prompt = (
+def _brief_prompt(state: EvaluationState) -> str:
+    return (
         f"Create a structured evaluation brief for this startup idea:\n\n"
         f"{state.startup_idea}\n\n"
         f"Format it clearly with sections: Summary, Target Market, "
         f"Value Proposition, Revenue Model, Key Assumptions."
     )
-    brief = run_agent_turn(agent, session, prompt)
-    state.brief = brief
-    return brief
 
 
-def synthesize_report(client: LlamaStackClient, state: EvaluationState) -> str:
-    """Have the coordinator synthesize specialist evaluations into a final report."""
-    agent = create_agent(client, COORDINATOR_MODEL, COORDINATOR_INSTRUCTIONS)
-    session = agent.create_session("coordinator-synthesis")
-
+def _synthesis_prompt(state: EvaluationState) -> str:
+    if state.skipped:
+        return _decided_synthesis_prompt(state)
     eval_summary = ""
     for name, evaluation in state.evaluations.items():
         eval_summary += f"\n--- {name.upper()} EVALUATION ---\n"
         eval_summary += f"Score: {evaluation.score}/10\n"
         eval_summary += f"Analysis: {evaluation.analysis}\n"
+    for name, reason in state.errors.items():
+        eval_summary += f"\n--- {name.upper()} EVALUATION ---\n"
+        eval_summary += f"Not available (evaluation failed: {reason})\n"
 
-    prompt = (
+    return (
         f"Here is the startup brief:\n{state.brief}\n\n"
         f"Here are the specialist evaluations:\n{eval_summary}\n\n"
         f"Synthesize a final evaluation report. Include:\n"
@@ -64,7 +78,60 @@ def synthesize_report(client: LlamaStackClient, state: EvaluationState) -> str:
         f"- Final recommendation: GO or NO-GO\n"
         f"- Brief reasoning"
     )
-    report = run_agent_turn(agent, session, prompt)
+
+
+def _decided_synthesis_prompt(state: EvaluationState) -> str:
+    """Short screening summary for a run stopped early because its outcome was fixed."""
+    scores = "\n".join(
+        f"- {name}: {evaluation.score}/10" for name, evaluation in state.evaluations.items()
+    )
+    recommendation = recommendation_for(state.average_score)
+    return (
+        f"Here is the startup brief:\n{state.brief}\n\n"
+        f"Specialist scores:\n{scores}\n\n"
+        f"The {', '.join(state.skipped)} evaluation(s) were skipped: no score they could "
+        f"receive would change the outcome, which is {recommendation}.\n\n"
+        f"Write a short screening summary (at most 4 sentences) giving the overall score "
+        f"out of 10, the main reasons, and \"Final recommendation: {recommendation}\"."
+    )
+
+
+def recommendation_for(average_score: float) -> str:
+    return "GO" if average_score >= GO_THRESHOLD else "NO-GO"
+
+
+def _apply_report(state: EvaluationState, report: str):
     state.final_report = report
-    state.recommendation = "GO" if state.average_score >= 6.0 else "NO-GO"
+    state.recommendation = recommendation_for(state.average_score)
+
+
+def create_brief(client: LlamaStackClient, state: EvaluationState) -> str:
+    """Have the coordinator create a structured brief from the startup idea."""
+    with agent_session(client, BRIEF_AGENT) as (agent, session):
+        brief = run_agent_turn(agent, session, _brief_prompt(state))
+    state.brief = brief
+    return brief
+
+
+async def create_brief_async(client: AsyncLlamaStackClient, state: EvaluationState) -> str:
+    """Async variant of create_brief."""
+    async with agent_session_async(client, BRIEF_AGENT) as (agent, session):
+        brief = await run_agent_turn_async(agent, session, _brief_prompt(state))
+    state.brief = brief
+    return brief
+
+
+def synthesize_report(client: LlamaStackClient, state: EvaluationState) -> str:
+    """Have the coordinator synthesize specialist evaluations into a final report."""
+    with agent_session(client, SYNTHESIS_AGENT) as (agent, session):
+        report = run_agent_turn(agent, session, _synthesis_prompt(state))
+    _apply_report(state, report)
+    return report
+
+
+async def synthesize_report_async(client: AsyncLlamaStackClient, state: EvaluationState) -> str:
+    """Async variant of synthesize_report."""
+    async with agent_session_async(client, SYNTHESIS_AGENT) as (agent, session):
+        report = await run_agent_turn_async(agent, session, _synthesis_prompt(state))
+    _apply_report(state, report)
     return report
@@ -1,8 +1,15 @@
 """Financial viability specialist agent."""
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.agents.base import create_agent, extract_score, run_agent_turn
+from src.agents.base import (
+    AgentSpec,
+    agent_session,
+    agent_session_async,
+    evaluation_from_output,
+    run_agent_turn,
+    run_agent_turn_async,
+)
 from src.config import SPECIALIST_MODEL
 from src.state import AgentEvaluation
 from src.tools.calculator import calculator
@@ -27,27 +34,35 @@ Scoring guide:
 - 1-4: Poor unit economics, unclear revenue model, excessive capital needs
 """
 
+FINANCE_AGENT = AgentSpec(
+    model=SPECIALIST_MODEL,
+    instructions=FINANCE_INSTRUCTIONS,
+    tools=(calculator,),
+    session_name="finance-eval",
+)
 
-def run_finance_evaluation(
-    client: LlamaStackClient, brief: str
-) -> AgentEvaluation:
-    """Run financial viability evaluation on a startup brief."""
-    agent = create_agent(
-        client, SPECIALIST_MODEL, FINANCE_INSTRUCTIONS, tools=[calculator]
-    )
-    session = agent.create_session("finance-eval")
 
-    prompt = (
+def _build_prompt(brief: str) -> str:
+    return (
         f"Evaluate the financial viability of this startup:\n\n{brief}\n\n"
         f"Use calculator to compute key metrics (margins, burn rate, etc.), "
         f"then give your analysis and score."
     )
-    output = run_agent_turn(agent, session, prompt)
-    score = extract_score(output)
-
-    return AgentEvaluation(
-        agent_name="finance",
-        score=score,
-        analysis=output,
-        raw_output=output,
-    )
+
+
+def run_finance_evaluation(
+    client: LlamaStackClient, brief: str
+) -> AgentEvaluation:
+    """Run financial viability evaluation on a startup brief."""
+    with agent_session(client, FINANCE_AGENT) as (agent, session):
+        output = run_agent_turn(agent, session, _build_prompt(brief))
+    return evaluation_from_output("finance", output)
+
+
+async def run_finance_evaluation_async(
+    client: AsyncLlamaStackClient, brief: str
+) -> AgentEvaluation:
+    """Async variant of run_finance_evaluation."""
+    async with agent_session_async(client, FINANCE_AGENT) as (agent, session):
+        output = await run_agent_turn_async(agent, session, _build_prompt(brief))
+    return evaluation_from_output("finance", output)
@@ -1,8 +1,15 @@
 """Market evaluation specialist agent."""
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.agents.base import create_agent, extract_score, run_agent_turn
+from src.agents.base import (
+    AgentSpec,
+    agent_session,
+    agent_session_async,
+    evaluation_from_output,
+    run_agent_turn,
+    run_agent_turn_async,
+)
 from src.config import SPECIALIST_MODEL
 from src.state import AgentEvaluation
 from src.tools.market_data import search_comparables
@@ -25,26 +32,34 @@ Scoring guide:
 - 1-4: Small market, saturated, or poor timing
 """
 
+MARKET_AGENT = AgentSpec(
+    model=SPECIALIST_MODEL,
+    instructions=MARKET_INSTRUCTIONS,
+    tools=(search_comparables,),
+    session_name="market-eval",
+)
+
+
+def _build_prompt(brief: str) -> str:
+    return (
+        f"Evaluate the market opportunity for this startup:\n\n{brief}\n\n"
+        f"Use search_comparables to find similar companies, then give your analysis and score."
+    )
+
 
 def run_market_evaluation(
     client: LlamaStackClient, brief: str
 ) -> AgentEvaluation:
     """Run market evaluation on a startup brief."""
-    agent = create_agent(
-        client, SPECIALIST_MODEL, MARKET_INSTRUCTIONS, tools=[search_comparables]
-    )
-    session = agent.create_session("market-eval")
+    with agent_session(client, MARKET_AGENT) as (agent, session):
+        output = run_agent_turn(agent, session, _build_prompt(brief))
+    return evaluation_from_output("market", output)
 
-    prompt = (
-        f"Evaluate the market opportunity for this startup:\n\n{brief}\n\n"
-        f"Use search_comparables to find similar companies, then give your analysis and score."
-    )
-    output = run_agent_turn(agent, session, prompt)
-    score = extract_score(output)
-
-    return AgentEvaluation(
-        agent_name="market",
-        score=score,
-        analysis=output,
-        raw_output=output,
-    )
+
+async def run_market_evaluation_async(
+    client: AsyncLlamaStackClient, brief: str
+) -> AgentEvaluation:
+    """Async variant of run_market_evaluation."""
+    async with agent_session_async(client, MARKET_AGENT) as (agent, session):
+        output = await run_agent_turn_async(agent, session, _build_prompt(brief))
+    return evaluation_from_output("market", output)
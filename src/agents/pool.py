@@ -0,0 +1,349 @@
+"""Process-wide pools of LlamaStack agents and pre-created sessions.
+
+Creating an ``Agent`` registers its instructions and tool definitions
+with the server, and each session is another round trip. The pools here
+create one agent per (model, instructions, tool set) and keep a few
+sessions ready for it, topped up in the background, so a pipeline step
+usually starts its turn straight away.
+
+Sessions carry conversation history, so by default each one is used for
+a single turn (AGENT_POOL_SESSION_MAX_USES=1) and the pipeline's
+results are unchanged. Idle sessions older than AGENT_POOL_SESSION_MAX_AGE
+are discarded rather than handed out. A discarded or used-up session is
+dropped from its agent's session list and deleted on the server in the
+background, so neither grows for the life of the process.
+
+Only a pool that has been warmed (by a long-lived process: the gateway,
+a worker, a batch run) keeps sessions topped up. Otherwise sessions are
+created on demand, so a one-shot CLI run makes no round trips for
+sessions it will never use.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
+
+from src.config import (
+    AGENT_POOL_PREWARM,
+    AGENT_POOL_SESSION_MAX_AGE,
+    AGENT_POOL_SESSION_MAX_USES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """Everything needed to create an agent and name its sessions."""
+    model: str
+    instructions: str
+    tools: tuple[Callable, ...] = ()
+    session_name: str = "session"
+
+    @property
+    def key(self) -> tuple:
+        tool_names = tuple(getattr(t, "__name__", str(t)) for t in self.tools)
+        return (self.model, self.instructions, tool_names)
+
+
+@dataclass
+class _Session:
+    session_id: str
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+
+@dataclass
+class _Entry:
+    agent: Any
+    idle: deque = field(default_factory=deque)
+    pending: int = 0
+
+
+@dataclass
+class PoolStats:
+    agents_created: int = 0
+    sessions_created: int = 0
+    session_hits: int = 0
+    session_misses: int = 0
+    sessions_expired: int = 0
+    sessions_retired: int = 0
+
+
+class _PoolBase(ABC):
+    def __init__(
+        self,
+        agent_factory: Callable,
+        prewarm: int = AGENT_POOL_PREWARM,
+        session_max_uses: int = AGENT_POOL_SESSION_MAX_USES,
+        session_max_age: float = AGENT_POOL_SESSION_MAX_AGE,
+    ):
+        self.agent_factory = agent_factory
+        self.prewarm = prewarm
+        self.session_max_uses = session_max_uses
+        self.session_max_age = session_max_age
+        self.stats = PoolStats()
+        self.long_lived = False  # set by warm(); only then are idle sessions topped up
+        self._entries: dict[tuple, _Entry] = {}
+
+    def _expired(self, session: _Session) -> bool:
+        return time.monotonic() - session.created_at > self.session_max_age
+
+    def _take_idle(self, entry: _Entry) -> _Session | None:
+        while entry.idle:
+            session = entry.idle.popleft()
+            if not self._expired(session):
+                self.stats.session_hits += 1
+                return session
+            self.stats.sessions_expired += 1
+            self._retire(entry, session)
+        self.stats.session_misses += 1
+        return None
+
+    def _release(self, entry: _Entry, session: _Session, ok: bool):
+        session.uses += 1
+        if ok and session.uses < self.session_max_uses and not self._expired(session):
+            entry.idle.append(session)
+        else:
+            self._retire(entry, session)
+
+    def _retire(self, entry: _Entry, session: _Session):
+        """Forget a session that will not be handed out again and delete it on the server."""
+        try:
+            entry.agent.sessions.remove(session.session_id)
+        except ValueError:
+            pass
+        self.stats.sessions_retired += 1
+        self._delete_later(entry.agent, session.session_id)
+
+    @abstractmethod
+    def _delete_later(self, agent, session_id: str):
+        """Delete ``session_id`` on the server without waiting for it."""
+
+    def _shortfall(self, entry: _Entry) -> int:
+        if not self.long_lived:
+            return 0
+        return max(0, self.prewarm - len(entry.idle) - entry.pending)
+
+    def snapshot(self) -> dict:
+        return {
+            "agents": len(self._entries),
+            "idle_sessions": sum(len(e.idle) for e in self._entries.values()),
+            "agents_created": self.stats.agents_created,
+            "sessions_created": self.stats.sessions_created,
+            "session_hits": self.stats.session_hits,
+            "session_misses": self.stats.session_misses,
+            "sessions_expired": self.stats.sessions_expired,
+            "sessions_retired": self.stats.sessions_retired,
+        }
+
+
+class AgentPool(_PoolBase):
+    """Agent/session pool for the synchronous client.
+
+    Sessions are topped up on a small background thread pool.
+    """
+
+    def __init__(self, client: LlamaStackClient, agent_factory: Callable | None = None, **kwargs):
+        if agent_factory is None:
+            from src.agents.base import create_agent
+            agent_factory = create_agent
+        super().__init__(agent_factory, **kwargs)
+        self.client = client
+        self._lock = threading.Lock()
+        self._creating: dict[tuple, threading.Lock] = {}
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-pool")
+
+    def _entry(self, spec: AgentSpec) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(spec.key)
+            if entry is not None:
+                return entry
+            creating = self._creating.setdefault(spec.key, threading.Lock())
+        # Creating the agent is a server round trip: hold only this spec's lock for it
+        with creating:
+            with self._lock:
+                entry = self._entries.get(spec.key)
+            if entry is not None:
+                return entry
+            agent = self.agent_factory(self.client, spec.model, spec.instructions, list(spec.tools))
+            with self._lock:
+                entry = self._entries[spec.key] = _Entry(agent=agent)
+                self.stats.agents_created += 1
+            return entry
+
+    def _create_session(self, entry: _Entry, spec: AgentSpec) -> _Session:
+        session = _Session(entry.agent.create_session(spec.session_name))
+        with self._lock:
+            self.stats.sessions_created += 1
+        return session
+
+    def _background_session(self, entry: _Entry, spec: AgentSpec):
+        try:
+            session = self._create_session(entry, spec)
+            with self._lock:
+                entry.idle.append(session)
+        except Exception:
+            logger.warning("Background session creation failed for %s", spec.session_name, exc_info=True)
+        finally:
+            with self._lock:
+                entry.pending -= 1
+
+    def _delete_session(self, agent, session_id: str):
+        try:
+            self.client.agents.session.delete(session_id, agent_id=agent.agent_id)
+        except Exception:
+            logger.warning("Deleting retired session %s failed", session_id, exc_info=True)
+
+    def _delete_later(self, agent, session_id: str):
+        self._executor.submit(self._delete_session, agent, session_id)
+
+    def _refill(self, entry: _Entry, spec: AgentSpec):
+        with self._lock:
+            missing = self._shortfall(entry)
+            entry.pending += missing
+        for _ in range(missing):
+            self._executor.submit(self._background_session, entry, spec)
+
+    @contextmanager
+    def lease(self, spec: AgentSpec):
+        """Yield (agent, session_id) for one unit of work."""
+        entry = self._entry(spec)
+        with self._lock:
+            session = self._take_idle(entry)
+        if session is None:
+            session = self._create_session(entry, spec)
+        ok = False
+        try:
+            yield entry.agent, session.session_id
+            ok = True
+        finally:
+            with self._lock:
+                self._release(entry, session, ok)
+            self._refill(entry, spec)
+
+    def warm(self, specs: list[AgentSpec]):
+        """Create agents now and keep sessions topped up in the background from here on."""
+        self.long_lived = True
+        for spec in specs:
+            self._refill(self._entry(spec), spec)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncAgentPool(_PoolBase):
+    """Agent/session pool for the async client; sessions are topped up as event-loop tasks."""
+
+    def __init__(self, client: AsyncLlamaStackClient, agent_factory: Callable | None = None, **kwargs):
+        if agent_factory is None:
+            from src.agents.base import create_async_agent
+            agent_factory = create_async_agent
+        super().__init__(agent_factory, **kwargs)
+        self.client = client
+        self._creating: dict[tuple, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def _entry(self, spec: AgentSpec) -> _Entry:
+        entry = self._entries.get(spec.key)
+        if entry is not None:
+            return entry
+        async with self._creating.setdefault(spec.key, asyncio.Lock()):
+            entry = self._entries.get(spec.key)
+            if entry is None:
+                agent = self.agent_factory(self.client, spec.model, spec.instructions, list(spec.tools))
+                await agent.initialize()
+                entry = self._entries[spec.key] = _Entry(agent=agent)
+                self.stats.agents_created += 1
+            return entry
+
+    async def _create_session(self, entry: _Entry, spec: AgentSpec) -> _Session:
+        session = _Session(await entry.agent.create_session(spec.session_name))
+        self.stats.sessions_created += 1
+        return session
+
+    async def _background_session(self, entry: _Entry, spec: AgentSpec):
+        try:
+            entry.idle.append(await self._create_session(entry, spec))
+        except Exception:
+            logger.warning("Background session creation failed for %s", spec.session_name, exc_info=True)
+        finally:
+            entry.pending -= 1
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _delete_session(self, agent, session_id: str):
+        try:
+            await self.client.agents.session.delete(session_id, agent_id=agent.agent_id)
+        except Exception:
+            logger.warning("Deleting retired session %s failed", session_id, exc_info=True)
+
+    def _delete_later(self, agent, session_id: str):
+        self._spawn(self._delete_session(agent, session_id))
+
+    def _refill(self, entry: _Entry, spec: AgentSpec):
+        missing = self._shortfall(entry)
+        entry.pending += missing
+        for _ in range(missing):
+            self._spawn(self._background_session(entry, spec))
+
+    @asynccontextmanager
+    async def lease(self, spec: AgentSpec):
+        """Yield (agent, session_id) for one unit of work."""
+        entry = await self._entry(spec)
+        session = self._take_idle(entry)
+        if session is None:
+            session = await self._create_session(entry, spec)
+        ok = False
+        try:
+            yield entry.agent, session.session_id
+            ok = True
+        finally:
+            self._release(entry, session, ok)
+            self._refill(entry, spec)
+
+    async def warm(self, specs: list[AgentSpec]):
+        """Create agents now and keep sessions topped up in the background from here on."""
+        self.long_lived = True
+        for spec in specs:
+            self._refill(await self._entry(spec), spec)
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+_pools: "weakref.WeakKeyDictionary[Any, AgentPool | AsyncAgentPool]" = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+
+
+def get_agent_pool(client: LlamaStackClient) -> AgentPool:
+    """Return the process-wide pool bound to ``client``."""
+    with _pools_lock:
+        pool = _pools.get(client)
+        if pool is None:
+            pool = _pools[client] = AgentPool(client)
+        return pool
+
+
+def get_async_agent_pool(client: AsyncLlamaStackClient) -> AsyncAgentPool:
+    """Return the process-wide async pool bound to ``client``."""
+    with _pools_lock:
+        pool = _pools.get(client)
+        if pool is None:
+            pool = _pools[client] = AsyncAgentPool(client)
+        return pool
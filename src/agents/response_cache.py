@@ -0,0 +1,90 @@
+"""Opt-in content-addressed cache for agent turn responses.
+
+A turn's output is keyed on a hash of everything that determines it:
+the agent config (model, instructions, tool definitions, sampling) and
+the user message. Entries are tagged with the model id, and on startup
+any entry whose model is no longer configured as COORDINATOR_MODEL or
+SPECIALIST_MODEL is dropped.
+
+Enable with LLM_CACHE=memory (LRU only) or LLM_CACHE=disk (LRU + SQLite).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+from src.cache import LRUCache, SQLiteCache, TieredCache
+from src.config import (
+    COORDINATOR_MODEL,
+    LLM_CACHE,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+    SPECIALIST_MODEL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def turn_cache_key(agent_config: dict, message: str) -> str:
+    """Hash the agent config and message into a stable cache key."""
+    payload = json.dumps(
+        {"agent_config": agent_config, "message": message},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Tiered cache of agent turn outputs, keyed by turn_cache_key."""
+
+    def __init__(self, cache: TieredCache, active_models: set[str] | None = None):
+        self.cache = cache
+        if active_models is not None:
+            dropped = cache.invalidate_tags(active_models)
+            if dropped:
+                logger.info("Dropped %d cached responses from inactive models", dropped)
+
+    def get(self, agent_config: dict, message: str) -> str | None:
+        return self.cache.get(turn_cache_key(agent_config, message))
+
+    def put(self, agent_config: dict, message: str, output: str):
+        self.cache.put(turn_cache_key(agent_config, message), output, tag=agent_config["model"])
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+_response_cache: ResponseCache | None = None
+_lock = threading.Lock()
+
+
+def build_response_cache(mode: str = LLM_CACHE) -> ResponseCache | None:
+    """Build a ResponseCache for mode "memory" or "disk"; None when "off"."""
+    if mode == "off":
+        return None
+    memory = LRUCache(max_entries=LLM_CACHE_MAX_ENTRIES, max_bytes=LLM_CACHE_MAX_BYTES, ttl_seconds=LLM_CACHE_TTL)
+    if mode == "memory":
+        disk = None
+    elif mode == "disk":
+        disk = SQLiteCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES, ttl_seconds=LLM_CACHE_TTL)
+    else:
+        raise ValueError(f"Unknown LLM_CACHE mode: {mode!r}")
+    return ResponseCache(
+        TieredCache(memory, disk),
+        active_models={COORDINATOR_MODEL, SPECIALIST_MODEL},
+    )
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide response cache, or None if caching is off."""
+    global _response_cache
+    if LLM_CACHE == "off":
+        return None
+    with _lock:
+        if _response_cache is None:
+            _response_cache = build_response_cache()
+        return _response_cache
@@ -1,8 +1,15 @@
 """Risk assessment specialist agent."""
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.agents.base import create_agent, extract_score, run_agent_turn
+from src.agents.base import (
+    AgentSpec,
+    agent_session,
+    agent_session_async,
+    evaluation_from_output,
+    run_agent_turn,
+    run_agent_turn_async,
+)
 from src.config import SPECIALIST_MODEL
 from src.state import AgentEvaluation
 from src.tools.risk_checklist import risk_checklist
@@ -25,26 +32,34 @@ Scoring guide (NOTE: higher score = LOWER risk, i.e. more favorable):
 - 1-4: High risk profile, multiple critical risks with no clear mitigation
 """
 
+RISK_AGENT = AgentSpec(
+    model=SPECIALIST_MODEL,
+    instructions=RISK_INSTRUCTIONS,
+    tools=(risk_checklist,),
+    session_name="risk-eval",
+)
+
+
+def _build_prompt(brief: str) -> str:
+    return (
+        f"Evaluate the risks for this startup:\n\n{brief}\n\n"
+        f"Use risk_checklist for at least 2 categories, then give your analysis and score."
+    )
+
 
 def run_risk_evaluation(
     client: LlamaStackClient, brief: str
 ) -> AgentEvaluation:
     """Run risk assessment on a startup brief."""
-    agent = create_agent(
-        client, SPECIALIST_MODEL, RISK_INSTRUCTIONS, tools=[risk_checklist]
-    )
-    session = agent.create_session("risk-eval")
+    with agent_session(client, RISK_AGENT) as (agent, session):
+        output = run_agent_turn(agent, session, _build_prompt(brief))
+    return evaluation_from_output("risk", output)
 
-    prompt = (
-        f"Evaluate the risks for this startup:\n\n{brief}\n\n"
-        f"Use risk_checklist for at least 2 categories, then give your analysis and score."
-    )
-    output = run_agent_turn(agent, session, prompt)
-    score = extract_score(output)
-
-    return AgentEvaluation(
-        agent_name="risk",
-        score=score,
-        analysis=output,
-        raw_output=output,
-    )
+
+async def run_risk_evaluation_async(
+    client: AsyncLlamaStackClient, brief: str
+) -> AgentEvaluation:
+    """Async variant of run_risk_evaluation."""
+    async with agent_session_async(client, RISK_AGENT) as (agent, session):
+        output = await run_agent_turn_async(agent, session, _build_prompt(brief))
+    return evaluation_from_output("risk", output)
@@ -1,8 +1,15 @@
 """Technical feasibility specialist agent."""
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.agents.base import create_agent, extract_score, run_agent_turn
+from src.agents.base import (
+    AgentSpec,
+    agent_session,
+    agent_session_async,
+    evaluation_from_output,
+    run_agent_turn,
+    run_agent_turn_async,
+)
 from src.config import SPECIALIST_MODEL
 from src.state import AgentEvaluation
 from src.tools.complexity import complexity_estimator
@@ -25,26 +32,34 @@ Scoring guide:
 - 1-4: Unproven technology, massive engineering effort, high risk
 """
 
+TECH_AGENT = AgentSpec(
+    model=SPECIALIST_MODEL,
+    instructions=TECH_INSTRUCTIONS,
+    tools=(complexity_estimator,),
+    session_name="tech-eval",
+)
+
+
+def _build_prompt(brief: str) -> str:
+    return (
+        f"Evaluate the technical feasibility of this startup:\n\n{brief}\n\n"
+        f"Use complexity_estimator to assess the components, then give your analysis and score."
+    )
+
 
 def run_tech_evaluation(
     client: LlamaStackClient, brief: str
 ) -> AgentEvaluation:
     """Run technical feasibility evaluation on a startup brief."""
-    agent = create_agent(
-        client, SPECIALIST_MODEL, TECH_INSTRUCTIONS, tools=[complexity_estimator]
-    )
-    session = agent.create_session("tech-eval")
+    with agent_session(client, TECH_AGENT) as (agent, session):
+        output = run_agent_turn(agent, session, _build_prompt(brief))
+    return evaluation_from_output("tech", output)
 
-    prompt = (
-        f"Evaluate the technical feasibility of this startup:\n\n{brief}\n\n"
-        f"Use complexity_estimator to assess the components, then give your analysis and score."
-    )
-    output = run_agent_turn(agent, session, prompt)
-    score = extract_score(output)
-
-    return AgentEvaluation(
-        agent_name="tech",
-        score=score,
-        analysis=output,
-        raw_output=output,
-    )
+
+async def run_tech_evaluation_async(
+    client: AsyncLlamaStackClient, brief: str
+) -> AgentEvaluation:
+    """Async variant of run_tech_evaluation."""
+    async with agent_session_async(client, TECH_AGENT) as (agent, session):
+        output = await run_agent_turn_async(agent, session, _build_prompt(brief))
+    return evaluation_from_output("tech", output)
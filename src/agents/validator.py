@@ -6,9 +6,15 @@ format violations, and reasoning inconsistencies.
 
 import re
 
-from llama_stack_client import LlamaStackClient
-
-from src.agents.base import create_agent, run_agent_turn
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
+
+from src.agents.base import (
+    AgentSpec,
+    agent_session,
+    agent_session_async,
+    run_agent_turn,
+    run_agent_turn_async,
+)
 from src.config import SPECIALIST_MODEL
 
 VALIDATOR_INSTRUCTIONS = """\
@@ -30,25 +36,21 @@ FAIL:No score found in output
 FAIL:Analysis contains only vague statements with no specifics
 """
 
+VALIDATOR_AGENT = AgentSpec(
+    model=SPECIALIST_MODEL,
+    instructions=VALIDATOR_INSTRUCTIONS,
+    session_name="validator",
+)
 
-def validate_output(
-    client: LlamaStackClient,
-    agent_name: str,
-    output: str,
-) -> tuple[bool, str]:
-    """Validate a specialist agent's output using an LLM-based validator.
-
-    Returns (passed, reason) tuple.
-    """
-    agent = create_agent(client, SPECIALIST_MODEL, VALIDATOR_INSTRUCTIONS)
-    session = agent.create_session("validator")
 
-    prompt = (
+def _validation_prompt(agent_name: str, output: str) -> str:
+    return (
         f"Validate this output from the {agent_name} agent:\n\n"
         f"---\n{output}\n---"
     )
-    result = run_agent_turn(agent, session, prompt).strip()
 
+
+def _parse_verdict(result: str) -> tuple[bool, str]:
     if result.startswith("PASS"):
         return True, "ok"
 
@@ -57,6 +59,31 @@ def validate_output(
     return False, reason
 
 
+def validate_output(
+    client: LlamaStackClient,
+    agent_name: str,
+    output: str,
+) -> tuple[bool, str]:
+    """Validate a specialist agent's output using an LLM-based validator.
+
+    Returns (passed, reason) tuple.
+    """
+    with agent_session(client, VALIDATOR_AGENT) as (agent, session):
+        result = run_agent_turn(agent, session, _validation_prompt(agent_name, output))
+    return _parse_verdict(result.strip())
+
+
+async def validate_output_async(
+    client: AsyncLlamaStackClient,
+    agent_name: str,
+    output: str,
+) -> tuple[bool, str]:
+    """Async variant of validate_output."""
+    async with agent_session_async(client, VALIDATOR_AGENT) as (agent, session):
+        result = await run_agent_turn_async(agent, session, _validation_prompt(agent_name, output))
+    return _parse_verdict(result.strip())
+
+
 def validate_score_consistency(output: str) -> tuple[bool, str]:
     """Quick heuristic check that score and sentiment align.
 
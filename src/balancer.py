@@ -0,0 +1,641 @@
+"""Client-side load balancing across several LlamaStack backends.
+
+With more than one URL in LLAMASTACK_URLS, the shared clients (src/client.py)
+send every request through a BalancingTransport, which rewrites its origin
+to the backend the Balancer picks:
+
+- ``least-outstanding``: the backend with the fewest requests in flight
+  (a streamed turn counts until its stream is closed)
+- ``ewma``: lowest (EWMA time-to-headers) x (requests in flight + 1), so a
+  slow backend gets proportionally less traffic
+
+Agents are long-lived (the agent pool keeps them for the life of the
+process), so they are created on every healthy backend and each new
+session, not each agent, is balanced: it is opened on the best backend
+and its turns stay there. Backends number their agents and sessions
+independently, so the client only sees ids minted here, which the
+transport maps to each backend's own on the way through. An agent missing
+from a backend (down when the agent was created, or since restarted) is
+created there when a session first needs it. A session whose backend is
+ejected moves to a healthy one on its next request, as a new session
+there; its earlier turns stay behind. Registrations (shields, scoring
+functions, tool groups, vector DBs) and their lookups by id are sent to
+every healthy backend, so "retrieve, register if missing" leaves all of
+them set up; a backend that cannot be reached is skipped. Data inserted
+into a vector DB is not replicated.
+
+A backend is ejected for LLAMASTACK_EJECT_SECONDS after
+LLAMASTACK_EJECT_AFTER consecutive connection errors or 5xx responses, and
+a background thread probes ``/v1/health`` every
+LLAMASTACK_HEALTH_INTERVAL seconds to eject or readmit backends. If every
+backend is ejected, requests are spread over all of them anyway.
+
+Backends are given as origins (``http://host:port``); a path on one is ignored.
+"""
+
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import httpx
+
+from src.config import (
+    LLAMASTACK_BALANCER,
+    LLAMASTACK_EJECT_AFTER,
+    LLAMASTACK_EJECT_SECONDS,
+    LLAMASTACK_HEALTH_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+LEAST_OUTSTANDING = "least-outstanding"
+EWMA = "ewma"
+POLICIES = (LEAST_OUTSTANDING, EWMA)
+
+# Weight of the newest sample in the latency EWMA
+EWMA_ALPHA = 0.3
+# Agents and sessions mapped to their backends; the least recently used are forgotten past this
+AFFINITY_SIZE = 10_000
+
+_AGENT_PATH = re.compile(r"^/v1/agents/([^/]+)(.*)$")
+_SESSION_PATH = re.compile(r"^/session/([^/]+)(.*)$")
+_CREATE_AGENT = re.compile(r"^/v1/agents/?$")
+_REGISTRY = re.compile(r"^/v1/(shields|scoring-functions|toolgroups|vector-dbs)(/[^/]+)?/?$")
+
+
+@dataclass
+class Backend:
+    """One LlamaStack endpoint and its live load/health counters."""
+    url: httpx.URL
+    outstanding: int = 0
+    ewma: float | None = None  # seconds to response headers
+    failures: int = 0  # consecutive
+    ejected_until: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    ejections: int = 0
+
+    @property
+    def name(self) -> str:
+        return str(self.url).rstrip("/")
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def as_dict(self, now: float) -> dict:
+        return {
+            "url": self.name,
+            "healthy": self.available(now),
+            "outstanding": self.outstanding,
+            "ewma_ms": round(self.ewma * 1000, 1) if self.ewma is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+        }
+
+
+@dataclass
+class Agent:
+    """An agent as the client sees it: its create request and its id on each backend that has it."""
+    create: httpx.Request
+    ids: dict[str, str] = field(default_factory=dict)  # backend name -> that backend's agent id
+
+
+@dataclass
+class Session:
+    """A session of ``agent_id`` (the client's id), open on one backend."""
+    agent_id: str
+    create: httpx.Request
+    backend: Backend
+    real_id: str
+
+
+def _touch(cache: OrderedDict, key: str, value, size: int):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+class Balancer:
+    """Picks a backend per request; shared by the sync and async transports (thread-safe)."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        policy: str = LLAMASTACK_BALANCER,
+        eject_after: int = LLAMASTACK_EJECT_AFTER,
+        eject_seconds: float = LLAMASTACK_EJECT_SECONDS,
+        affinity_size: int = AFFINITY_SIZE,
+    ):
+        if not urls:
+            raise ValueError("Balancer needs at least one backend URL")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown balancing policy: {policy!r} (choose from {', '.join(POLICIES)})")
+        self.backends = [Backend(httpx.URL(url)) for url in urls]
+        self.policy = policy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.affinity_size = affinity_size
+        self._agents: OrderedDict[str, Agent] = OrderedDict()
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._rotation = 0
+        self._lock = threading.Lock()
+        self._health_thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # ── Routing ──────────────────────────────────────────────────────────
+
+    def targets(self, request: httpx.Request) -> list[Backend]:
+        """Backends to send a request outside any agent to: every healthy one, or the best one."""
+        with self._lock:
+            candidates = self._candidates()
+            if _REGISTRY.match(request.url.path) and request.method in ("GET", "POST"):
+                return candidates
+            return [self._best(candidates)]
+
+    def candidates(self) -> list[Backend]:
+        with self._lock:
+            return self._candidates()
+
+    def best(self) -> Backend:
+        with self._lock:
+            return self._best(self._candidates())
+
+    def _candidates(self) -> list[Backend]:
+        now = time.monotonic()
+        healthy = [b for b in self.backends if b.available(now)]
+        return healthy or list(self.backends)
+
+    def _best(self, candidates: list[Backend]) -> Backend:
+        if self.policy == EWMA:
+            def cost(b: Backend) -> float:
+                # Unmeasured backends cost nothing, so each gets tried early
+                return (b.ewma or 0.0) * (b.outstanding + 1)
+        else:
+            def cost(b: Backend) -> float:
+                return b.outstanding
+        lowest = min(cost(b) for b in candidates)
+        ties = [b for b in candidates if cost(b) == lowest]
+        self._rotation += 1  # spread ties round-robin, e.g. when every backend is idle
+        return ties[self._rotation % len(ties)]
+
+    def session_backend(self, session: Session) -> Backend:
+        """The session's backend, or the best healthy one if its own has been ejected."""
+        with self._lock:
+            if session.backend.available(time.monotonic()):
+                return session.backend
+            return self._best(self._candidates())
+
+    def agent_backends(self, agent: Agent) -> list[Backend]:
+        """The backends that have ``agent``, the healthy ones if there are any."""
+        with self._lock:
+            having = [b for b in self.backends if b.name in agent.ids]
+            candidates = self._candidates()
+            return [b for b in having if b in candidates] or having
+
+    # ── Agents and sessions ──────────────────────────────────────────────
+
+    def agent(self, agent_id: str) -> Agent | None:
+        with self._lock:
+            agent = self._agents.get(agent_id)
+            if agent is not None:
+                self._agents.move_to_end(agent_id)
+            return agent
+
+    def add_agent(self, create: httpx.Request, ids: dict[str, str]) -> str:
+        """Remember an agent created on the backends in ``ids``; returns the client's id for it."""
+        agent_id = uuid.uuid4().hex
+        with self._lock:
+            _touch(self._agents, agent_id, Agent(create, ids), self.affinity_size)
+        return agent_id
+
+    def add_agent_id(self, agent: Agent, backend: Backend, real_id: str):
+        with self._lock:
+            agent.ids[backend.name] = real_id
+
+    def drop_agent(self, agent_id: str):
+        with self._lock:
+            self._agents.pop(agent_id, None)
+            for session_id in [k for k, s in self._sessions.items() if s.agent_id == agent_id]:
+                del self._sessions[session_id]
+
+    def session(self, session_id: str) -> Session | None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def add_session(self, agent_id: str, create: httpx.Request, backend: Backend, real_id: str) -> str:
+        """Pin a new session to ``backend``; returns the client's id for it."""
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            _touch(self._sessions, session_id, Session(agent_id, create, backend, real_id), self.affinity_size)
+        return session_id
+
+    def move_session(self, session: Session, backend: Backend, real_id: str):
+        with self._lock:
+            session.backend, session.real_id = backend, real_id
+
+    def drop_session(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    # ── Accounting ───────────────────────────────────────────────────────
+
+    def started(self, backend: Backend):
+        with self._lock:
+            backend.outstanding += 1
+            backend.requests += 1
+
+    def responded(self, backend: Backend, elapsed: float, ok: bool):
+        """Record the time to response headers (or to the error) for one request."""
+        with self._lock:
+            if ok:
+                backend.failures = 0
+                backend.ewma = elapsed if backend.ewma is None else (
+                    EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * backend.ewma
+                )
+                return
+            backend.errors += 1
+            backend.failures += 1
+            if backend.failures >= self.eject_after:
+                self._eject(backend, f"{backend.failures} consecutive failures")
+
+    def finished(self, backend: Backend):
+        """The request's response (or stream) is done with."""
+        with self._lock:
+            backend.outstanding -= 1
+
+    def _eject(self, backend: Backend, reason: str):
+        if backend.available(time.monotonic()):
+            backend.ejections += 1
+            logger.warning("Ejecting backend %s for %.0fs: %s", backend.name, self.eject_seconds, reason)
+        backend.ejected_until = time.monotonic() + self.eject_seconds
+        backend.failures = 0
+
+    # ── Health checks ────────────────────────────────────────────────────
+
+    def check_health(self, http: httpx.Client):
+        """Probe every backend's /v1/health once, ejecting or readmitting it."""
+        for backend in self.backends:
+            try:
+                ok = http.get(backend.url.join("/v1/health")).status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            with self._lock:
+                if not ok:
+                    self._eject(backend, "health check failed")
+                elif not backend.available(time.monotonic()):
+                    logger.info("Backend %s is healthy again", backend.name)
+                    backend.ejected_until = 0.0
+
+    def start_health_checks(self, interval: float = LLAMASTACK_HEALTH_INTERVAL, timeout: float = 5.0):
+        """Run check_health every ``interval`` seconds on a daemon thread."""
+        if self._health_thread is not None or interval <= 0:
+            return
+
+        def loop():
+            with httpx.Client(timeout=timeout) as http:
+                while not self._stop.wait(interval):
+                    self.check_health(http)
+
+        self._health_thread = threading.Thread(target=loop, name="backend-health", daemon=True)
+        self._health_thread.start()
+
+    def close(self):
+        """Stop the health checks, waiting for a probe in progress to finish."""
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "agents": len(self._agents),
+                "sessions": len(self._sessions),
+                "backends": [b.as_dict(now) for b in self.backends],
+            }
+
+
+def _retarget(request: httpx.Request, backend: Backend, path: str | None = None) -> httpx.Request:
+    """``request`` sent to ``backend``, and to ``path`` there if given."""
+    url = request.url.copy_with(scheme=backend.url.scheme, host=backend.url.host, port=backend.url.port)
+    if path is not None:
+        url = url.copy_with(path=path)
+    headers = request.headers.copy()
+    headers["host"] = url.netloc.decode()
+    return httpx.Request(request.method, url, headers=headers, content=request.content, extensions=request.extensions)
+
+
+def _created_id(response: httpx.Response, key: str) -> str | None:
+    """The new ``key`` ("agent_id", "session_id") in a create response that has been read."""
+    if response.status_code != 200:
+        return None
+    try:
+        return response.json().get(key)
+    except ValueError:
+        return None
+
+
+def _with_id(response: httpx.Response, key: str, value: str) -> httpx.Response:
+    """A create response that reports ``value`` as the new ``key``."""
+    return httpx.Response(response.status_code, json={key: value}, request=response.request)
+
+
+def _pick_response(method: str, responses: list[httpx.Response]) -> int:
+    """Index of the broadcast response to return.
+
+    A lookup (GET) fails if any backend lacks the resource, so it gets
+    registered everywhere; anything else succeeds if any backend accepted
+    it (for a registration, the others typically already had it).
+    """
+    failed = [i for i, r in enumerate(responses) if r.status_code >= 400]
+    if method == "GET":
+        return failed[0] if failed else 0
+    return next((i for i in range(len(responses)) if i not in failed), 0)
+
+
+class _TrackedStream(httpx.SyncByteStream):
+    def __init__(self, inner: httpx.SyncByteStream, on_close):
+        self.inner = inner
+        self.on_close = on_close
+
+    def __iter__(self):
+        yield from self.inner
+
+    def close(self):
+        try:
+            self.inner.close()
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+                self.on_close = None
+
+
+class _AsyncTrackedStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, on_close):
+        self.inner = inner
+        self.on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self.inner:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.inner.aclose()
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+                self.on_close = None
+
+
+class BalancingTransport(httpx.BaseTransport):
+    """Sends each request through ``inner`` to the backend ``balancer`` picks."""
+
+    def __init__(self, balancer: Balancer, inner: httpx.BaseTransport):
+        self.balancer = balancer
+        self.inner = inner
+
+    def _send(self, request: httpx.Request, backend: Backend, path: str | None = None) -> httpx.Response:
+        self.balancer.started(backend)
+        start = time.perf_counter()
+        try:
+            response = self.inner.handle_request(_retarget(request, backend, path))
+        except httpx.TransportError:
+            self.balancer.responded(backend, time.perf_counter() - start, ok=False)
+            self.balancer.finished(backend)
+            raise
+        self.balancer.responded(backend, time.perf_counter() - start, ok=response.status_code < 500)
+        if response.is_closed:
+            self.balancer.finished(backend)  # the body came fully read (an in-memory transport)
+        else:
+            response.stream = _TrackedStream(response.stream, lambda: self.balancer.finished(backend))
+        return response
+
+    def _broadcast(self, sends: list[tuple[Backend, str | None]], request: httpx.Request):
+        """Send ``request`` to each (backend, path) and read every response, which closes it.
+
+        A backend that cannot be reached is skipped (its failure is already
+        counted); the error is raised only if none could be.
+        """
+        reached: list[Backend] = []
+        responses: list[httpx.Response] = []
+        error: httpx.TransportError | None = None
+        for backend, path in sends:
+            try:
+                response = self._send(request, backend, path)
+            except httpx.TransportError as e:
+                error = e
+                continue
+            response.read()
+            reached.append(backend)
+            responses.append(response)
+        if not responses:
+            raise error
+        return reached, responses
+
+    def _ensure_agent(self, agent: Agent, backend: Backend) -> httpx.Response | None:
+        """Create ``agent`` on ``backend`` if it isn't there yet; the failed response if that fails."""
+        if backend.name in agent.ids:
+            return None
+        response = self._send(agent.create, backend)
+        response.read()
+        real_id = _created_id(response, "agent_id")
+        if real_id is None:
+            return response
+        self.balancer.add_agent_id(agent, backend, real_id)
+        return None
+
+    def _open_session(self, agent: Agent, create: httpx.Request, backend: Backend) -> httpx.Response:
+        failed = self._ensure_agent(agent, backend)
+        if failed is not None:
+            return failed
+        response = self._send(create, backend, f"/v1/agents/{agent.ids[backend.name]}/session")
+        response.read()
+        return response
+
+    def _create_agent(self, request: httpx.Request) -> httpx.Response:
+        reached, responses = self._broadcast([(b, None) for b in self.balancer.candidates()], request)
+        ids = {b.name: real_id for b, r in zip(reached, responses) if (real_id := _created_id(r, "agent_id"))}
+        if not ids:
+            return responses[0]
+        return _with_id(responses[0], "agent_id", self.balancer.add_agent(request, ids))
+
+    def _agent_request(self, request: httpx.Request, agent_id: str, agent: Agent, rest: str) -> httpx.Response:
+        if request.method == "DELETE" and rest in ("", "/"):
+            backends = self.balancer.agent_backends(agent)
+            self.balancer.drop_agent(agent_id)
+            _, responses = self._broadcast([(b, f"/v1/agents/{agent.ids[b.name]}") for b in backends], request)
+            return responses[_pick_response(request.method, responses)]
+        if request.method == "POST" and rest in ("/session", "/session/"):
+            backend = self.balancer.best()
+            response = self._open_session(agent, request, backend)
+            if (real_id := _created_id(response, "session_id")) is None:
+                return response
+            return _with_id(response, "session_id", self.balancer.add_session(agent_id, request, backend, real_id))
+        if (match := _SESSION_PATH.match(rest)) and (session := self.balancer.session(match.group(1))):
+            return self._session_request(request, agent, match.group(1), session, match.group(2))
+        backend = self.balancer.best()
+        failed = self._ensure_agent(agent, backend)
+        if failed is not None:
+            return failed
+        return self._send(request, backend, f"/v1/agents/{agent.ids[backend.name]}{rest}")
+
+    def _session_request(
+        self, request: httpx.Request, agent: Agent, session_id: str, session: Session, rest: str
+    ) -> httpx.Response:
+        backend = self.balancer.session_backend(session)
+        if backend is not session.backend:
+            response = self._open_session(agent, session.create, backend)
+            if (real_id := _created_id(response, "session_id")) is None:
+                return response
+            self.balancer.move_session(session, backend, real_id)
+        path = f"/v1/agents/{agent.ids[backend.name]}/session/{session.real_id}{rest}"
+        response = self._send(request, backend, path)
+        if request.method == "DELETE" and rest in ("", "/") and response.status_code < 500:
+            self.balancer.drop_session(session_id)
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        path = request.url.path
+        if request.method == "POST" and _CREATE_AGENT.match(path):
+            return self._create_agent(request)
+        if (match := _AGENT_PATH.match(path)) and (agent := self.balancer.agent(match.group(1))):
+            return self._agent_request(request, match.group(1), agent, match.group(2))
+        targets = self.balancer.targets(request)
+        if len(targets) == 1:
+            return self._send(request, targets[0])
+        _, responses = self._broadcast([(b, None) for b in targets], request)
+        return responses[_pick_response(request.method, responses)]
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncBalancingTransport(httpx.AsyncBaseTransport):
+    """Async variant of BalancingTransport."""
+
+    def __init__(self, balancer: Balancer, inner: httpx.AsyncBaseTransport):
+        self.balancer = balancer
+        self.inner = inner
+
+    async def _send(self, request: httpx.Request, backend: Backend, path: str | None = None) -> httpx.Response:
+        self.balancer.started(backend)
+        start = time.perf_counter()
+        try:
+            response = await self.inner.handle_async_request(_retarget(request, backend, path))
+        except httpx.TransportError:
+            self.balancer.responded(backend, time.perf_counter() - start, ok=False)
+            self.balancer.finished(backend)
+            raise
+        self.balancer.responded(backend, time.perf_counter() - start, ok=response.status_code < 500)
+        if response.is_closed:
+            self.balancer.finished(backend)  # the body came fully read (an in-memory transport)
+        else:
+            response.stream = _AsyncTrackedStream(response.stream, lambda: self.balancer.finished(backend))
+        return response
+
+    async def _broadcast(self, sends: list[tuple[Backend, str | None]], request: httpx.Request):
+        reached: list[Backend] = []
+        responses: list[httpx.Response] = []
+        error: httpx.TransportError | None = None
+        for backend, path in sends:
+            try:
+                response = await self._send(request, backend, path)
+            except httpx.TransportError as e:
+                error = e
+                continue
+            await response.aread()
+            reached.append(backend)
+            responses.append(response)
+        if not responses:
+            raise error
+        return reached, responses
+
+    async def _ensure_agent(self, agent: Agent, backend: Backend) -> httpx.Response | None:
+        if backend.name in agent.ids:
+            return None
+        response = await self._send(agent.create, backend)
+        await response.aread()
+        real_id = _created_id(response, "agent_id")
+        if real_id is None:
+            return response
+        self.balancer.add_agent_id(agent, backend, real_id)
+        return None
+
+    async def _open_session(self, agent: Agent, create: httpx.Request, backend: Backend) -> httpx.Response:
+        failed = await self._ensure_agent(agent, backend)
+        if failed is not None:
+            return failed
+        response = await self._send(create, backend, f"/v1/agents/{agent.ids[backend.name]}/session")
+        await response.aread()
+        return response
+
+    async def _create_agent(self, request: httpx.Request) -> httpx.Response:
+        reached, responses = await self._broadcast([(b, None) for b in self.balancer.candidates()], request)
+        ids = {b.name: real_id for b, r in zip(reached, responses) if (real_id := _created_id(r, "agent_id"))}
+        if not ids:
+            return responses[0]
+        return _with_id(responses[0], "agent_id", self.balancer.add_agent(request, ids))
+
+    async def _agent_request(self, request: httpx.Request, agent_id: str, agent: Agent, rest: str) -> httpx.Response:
+        if request.method == "DELETE" and rest in ("", "/"):
+            backends = self.balancer.agent_backends(agent)
+            self.balancer.drop_agent(agent_id)
+            _, responses = await self._broadcast([(b, f"/v1/agents/{agent.ids[b.name]}") for b in backends], request)
+            return responses[_pick_response(request.method, responses)]
+        if request.method == "POST" and rest in ("/session", "/session/"):
+            backend = self.balancer.best()
+            response = await self._open_session(agent, request, backend)
+            if (real_id := _created_id(response, "session_id")) is None:
+                return response
+            return _with_id(response, "session_id", self.balancer.add_session(agent_id, request, backend, real_id))
+        if (match := _SESSION_PATH.match(rest)) and (session := self.balancer.session(match.group(1))):
+            return await self._session_request(request, agent, match.group(1), session, match.group(2))
+        backend = self.balancer.best()
+        failed = await self._ensure_agent(agent, backend)
+        if failed is not None:
+            return failed
+        return await self._send(request, backend, f"/v1/agents/{agent.ids[backend.name]}{rest}")
+
+    async def _session_request(
+        self, request: httpx.Request, agent: Agent, session_id: str, session: Session, rest: str
+    ) -> httpx.Response:
+        backend = self.balancer.session_backend(session)
+        if backend is not session.backend:
+            response = await self._open_session(agent, session.create, backend)
+            if (real_id := _created_id(response, "session_id")) is None:
+                return response
+            self.balancer.move_session(session, backend, real_id)
+        path = f"/v1/agents/{agent.ids[backend.name]}/session/{session.real_id}{rest}"
+        response = await self._send(request, backend, path)
+        if request.method == "DELETE" and rest in ("", "/") and response.status_code < 500:
+            self.balancer.drop_session(session_id)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        path = request.url.path
+        if request.method == "POST" and _CREATE_AGENT.match(path):
+            return await self._create_agent(request)
+        if (match := _AGENT_PATH.match(path)) and (agent := self.balancer.agent(match.group(1))):
+            return await self._agent_request(request, match.group(1), agent, match.group(2))
+        targets = self.balancer.targets(request)
+        if len(targets) == 1:
+            return await self._send(request, targets[0])
+        _, responses = await self._broadcast([(b, None) for b in targets], request)
+        return responses[_pick_response(request.method, responses)]
+
+    async def aclose(self):
+        await self.inner.aclose()
@@ -0,0 +1,91 @@
+"""``multia batch``: evaluate a JSONL or CSV file of ideas.
+
+Examples:
+    multia batch ideas.jsonl --out results.jsonl
+    multia batch portfolio.csv --concurrency 8 --out .data/batch/portfolio.jsonl
+    multia batch ideas.jsonl --early-decision --out screening.jsonl
+
+Results are appended to --out as JSONL, one record per idea. Running the
+same command again resumes: ideas that already succeeded are skipped and
+failed ones retried. Progress (throughput and ETA) goes to stderr.
+"""
+
+import argparse
+import logging
+import sys
+from functools import partial
+from pathlib import Path
+
+from src.batch.runner import ProgressDisplay, run_batch
+from src.config import AGENT_POOL, SPECIALIST_CONCURRENCY
+from src.event_sink import NullSink
+
+logger = logging.getLogger(__name__)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="multia batch", description="Evaluate a file of startup ideas")
+    parser.add_argument("input", type=Path, help="ideas as JSONL ({\"idea\": ..., \"id\": ...}) or CSV (idea[,id])")
+    parser.add_argument("--out", type=Path, required=True, help="results JSONL (appended to; resumable)")
+    parser.add_argument("--concurrency", type=int, default=4, help="ideas evaluated at once")
+    parser.add_argument("--secure", action="store_true", help="use the secure pipeline (shield + validator gates)")
+    parser.add_argument("--early-decision", action="store_true",
+                        help="skip the remaining specialists once GO/NO-GO is settled")
+    return parser
+
+
+def _evaluator(args: argparse.Namespace):
+    if args.secure:
+        from src.pipeline_secure import run_secure_pipeline
+        return partial(run_secure_pipeline, sink=NullSink())
+    from src.pipeline import run_pipeline
+    return partial(
+        run_pipeline, concurrent=True, max_workers=SPECIALIST_CONCURRENCY,
+        early_decision=args.early_decision, sink=NullSink(),
+    )
+
+
+def _warm_agent_pool(client):
+    """A batch is long-lived enough for pre-created sessions to pay off."""
+    from src.agents.pool import get_agent_pool
+    from src.pipeline import PIPELINE_AGENTS
+
+    if AGENT_POOL == "off":
+        return
+    try:
+        get_agent_pool(client).warm(PIPELINE_AGENTS)
+    except Exception:
+        logger.warning("Agent pool warm-up failed; agents will be created on demand", exc_info=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.input.exists():
+        parser.error(f"no such file: {args.input}")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.secure and args.early_decision:
+        parser.error("--early-decision is not supported with --secure")
+    # llama_stack_client configures the root logger at INFO on import; keep the readout readable
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    from src.client import get_client
+    client = get_client()
+    _warm_agent_pool(client)
+    try:
+        progress = run_batch(
+            client, args.input, args.out,
+            concurrency=args.concurrency, evaluate=_evaluator(args), display=ProgressDisplay(),
+        )
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; rerun the same command to resume from {args.out}", file=sys.stderr)
+        return 130
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Results written to {args.out}")
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Evaluate a file of ideas, streaming input and output.
+
+Input is JSONL (one ``{"idea": ..., "id": ...}`` object, or a bare JSON
+string, per line) or CSV with an ``idea`` column and optional ``id``
+column. Ideas without an id are keyed on a hash of their normalised text.
+
+Each result is appended to the output JSONL file as soon as it finishes
+and flushed, so an interrupted run loses at most the ideas in flight.
+Rerunning with the same output skips every idea that already has a
+``succeeded`` record there; failed ones are retried.
+
+Only ``concurrency`` ideas are read ahead of the results being written,
+so memory does not grow with the input beyond a set of ids (those done
+in the output file, and those seen so far to skip duplicates).
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, TextIO
+
+from llama_stack_client import LlamaStackClient
+
+from src.event_sink import NullSink
+from src.gateway.coalesce import normalise_idea
+from src.pipeline import run_pipeline
+from src.state import EvaluationState
+
+logger = logging.getLogger(__name__)
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Runs one idea's evaluation; the default is a concurrent run_pipeline
+Evaluate = Callable[[LlamaStackClient, str], EvaluationState]
+
+
+@dataclass
+class BatchItem:
+    """One idea from the input file; ``line`` is its 1-based line (or CSV row) number."""
+    id: str
+    idea: str
+    line: int
+    error: str | None = None  # set when the input line itself could not be parsed
+
+
+def idea_id(idea: str) -> str:
+    """Stable id for an idea given without one."""
+    return hashlib.sha256(normalise_idea(idea).encode()).hexdigest()[:16]
+
+
+def _item(line: int, idea, item_id=None) -> BatchItem:
+    if not isinstance(idea, str) or not idea.strip():
+        return BatchItem(id=str(item_id or f"line-{line}"), idea="", line=line, error="missing idea")
+    return BatchItem(id=str(item_id) if item_id else idea_id(idea), idea=idea, line=line)
+
+
+def _read_jsonl(f: TextIO) -> Iterator[BatchItem]:
+    for line, text in enumerate(f, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield BatchItem(id=f"line-{line}", idea="", line=line, error=f"invalid JSON: {e}")
+            continue
+        if isinstance(record, dict):
+            yield _item(line, record.get("idea"), record.get("id"))
+        else:
+            yield _item(line, record)
+
+
+def _read_csv(f: TextIO) -> Iterator[BatchItem]:
+    reader = csv.DictReader(f)
+    if "idea" not in (reader.fieldnames or []):
+        raise ValueError("CSV input needs an 'idea' column")
+    for row_number, row in enumerate(reader, 2):
+        yield _item(row_number, row.get("idea"), row.get("id"))
+
+
+def read_ideas(path: Path) -> Iterator[BatchItem]:
+    """Stream the ideas in ``path`` (CSV if it ends in .csv, JSONL otherwise)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from (_read_csv(f) if path.suffix.lower() == ".csv" else _read_jsonl(f))
+
+
+def count_ideas(path: Path) -> int:
+    """Number of input records, for the ETA; one streaming pass."""
+    with open(path, "rb") as f:
+        lines = sum(1 for line in f if line.strip())
+    return lines - 1 if path.suffix.lower() == ".csv" else lines
+
+
+def _ends_mid_line(path: Path) -> bool:
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, 2)
+        return f.read(1) != b"\n"
+
+
+def completed_ids(out: Path) -> set[str]:
+    """Ids with a succeeded record in an existing output file."""
+    done: set[str] = set()
+    if not out.exists():
+        return done
+    with open(out, encoding="utf-8") as f:
+        for text in f:
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if record.get("status") == SUCCEEDED:
+                done.add(record["id"])
+    return done
+
+
+def result_record(item: BatchItem, state: EvaluationState, elapsed: float) -> dict:
+    return {
+        "id": item.id,
+        "line": item.line,
+        "idea": item.idea,
+        "status": SUCCEEDED,
+        "recommendation": state.recommendation,
+        "average_score": round(state.average_score, 2),
+        "scores": {name: e.score for name, e in state.evaluations.items()},
+        "errors": dict(state.errors),
+        "skipped": list(state.skipped),
+        "report": state.final_report,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def error_record(item: BatchItem, error: str, elapsed: float = 0.0) -> dict:
+    return {
+        "id": item.id,
+        "line": item.line,
+        "idea": item.idea,
+        "status": FAILED,
+        "error": error,
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+def default_evaluate(client: LlamaStackClient, idea: str) -> EvaluationState:
+    return run_pipeline(client, idea, concurrent=True, sink=NullSink())
+
+
+@dataclass
+class BatchProgress:
+    """Counters for a batch run, rendered as a one-line throughput/ETA readout."""
+    total: int | None = None
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0  # already in the output from an earlier run, or repeated in the input
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    def throughput(self) -> float:
+        """Ideas evaluated per minute in this run."""
+        elapsed = time.monotonic() - self.started
+        return self.processed / elapsed * 60 if elapsed else 0.0
+
+    def eta_seconds(self) -> float | None:
+        if self.total is None or not self.processed:
+            return None
+        remaining = max(0, self.total - self.skipped - self.processed)
+        return remaining / (self.throughput() / 60)
+
+    def line(self) -> str:
+        done = self.processed + self.skipped
+        of = f"/{self.total}" if self.total is not None else ""
+        eta = self.eta_seconds()
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "--:--:--"
+        return (
+            f"{done}{of} done ({self.succeeded} ok, {self.failed} failed, {self.skipped} skipped)"
+            f" | {self.throughput():.1f}/min | ETA {eta_text}"
+        )
+
+
+class ProgressDisplay:
+    """Redraws BatchProgress on a terminal, or logs a line every ``interval`` seconds otherwise."""
+
+    def __init__(self, stream: TextIO | None = None, interval: float = 10.0):
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self._tty = self.stream.isatty()
+        self._last = 0.0
+
+    def update(self, progress: BatchProgress, final: bool = False):
+        now = time.monotonic()
+        if self._tty:
+            end = "\n" if final else ""
+            print(f"\r\033[K{progress.line()}", end=end, file=self.stream, flush=True)
+        elif final or now - self._last >= self.interval:
+            print(progress.line(), file=self.stream, flush=True)
+            self._last = now
+
+
+def run_batch(
+    client: LlamaStackClient,
+    input_path: Path,
+    out: Path,
+    concurrency: int = 4,
+    evaluate: Evaluate = default_evaluate,
+    display: ProgressDisplay | None = None,
+) -> BatchProgress:
+    """Evaluate every idea in ``input_path`` not already done in ``out``.
+
+    Up to ``concurrency`` ideas run at once on a thread pool. An idea that
+    fails (or whose input line is malformed) gets a ``failed`` record and
+    the batch carries on. On KeyboardInterrupt the ideas in flight are
+    abandoned and the interrupt re-raised; everything written so far counts
+    as done for the next run.
+    """
+    done = completed_ids(out)
+    progress = BatchProgress(total=count_ideas(input_path))
+    out.parent.mkdir(parents=True, exist_ok=True)
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch")
+    in_flight: dict[Future, BatchItem] = {}
+    interrupted = False
+
+    def attempt(item: BatchItem) -> dict:
+        start = time.monotonic()
+        try:
+            state = evaluate(client, item.idea)
+        except Exception as e:
+            logger.warning("Idea %s (line %d) failed: %s: %s", item.id, item.line, type(e).__name__, e)
+            return error_record(item, f"{type(e).__name__}: {e}", time.monotonic() - start)
+        return result_record(item, state, time.monotonic() - start)
+
+    def write(f: TextIO, record: dict):
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        if record["status"] == SUCCEEDED:
+            progress.succeeded += 1
+        else:
+            progress.failed += 1
+        if display is not None:
+            display.update(progress)
+
+    def drain(f: TextIO, block_until: int):
+        """Write finished results until at most ``block_until`` ideas are in flight."""
+        while len(in_flight) > block_until:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.pop(future)
+                write(f, future.result())
+
+    try:
+        cut_short = _ends_mid_line(out)
+        with open(out, "a", encoding="utf-8") as f:
+            if cut_short:
+                f.write("\n")  # keep the next record off a line an interrupted run left unfinished
+            for item in read_ideas(input_path):
+                if item.id in done:
+                    progress.skipped += 1
+                    continue
+                if item.error:
+                    write(f, error_record(item, item.error))
+                    continue
+                done.add(item.id)  # a duplicate later in the input is skipped too
+                in_flight[pool.submit(attempt, item)] = item
+                drain(f, block_until=concurrency - 1)
+            drain(f, block_until=0)
+    except KeyboardInterrupt:
+        interrupted = True
+        raise
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+        if display is not None:
+            display.update(progress, final=True)
+    return progress
@@ -0,0 +1,88 @@
+"""``multia bench``: end-to-end latency and throughput benchmark.
+
+Examples:
+    multia bench                                    # all scenarios, fake backend, zero latency
+    multia bench --profile config/fakestack-profile.yaml --concurrency 1 4 16
+    multia bench --scenario gateway --backend live --iterations 5
+    multia bench --backend replay --recording .data/recordings/llamastack.jsonl.gz
+
+Results are written as JSON (default .data/bench/results.json). If that
+file already exists, or --baseline is given, the new run is compared
+against it and the command exits 1 when p95 stage latency or throughput
+regressed by more than --threshold.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from src.bench.report import REGRESSION_THRESHOLD, compare, format_table, load_results, write_results
+from src.bench.runner import DEFAULT_IDEA, SCENARIOS, fake_backend, live_backend, replay_backend, run_benchmarks
+from src.fakestack.replay import TIMING_NONE, TIMING_ORIGINAL
+
+DEFAULT_OUT = Path(__file__).resolve().parent.parent.parent / ".data" / "bench" / "results.json"
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="multia bench", description="Benchmark the evaluation pipelines")
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--backend", choices=("fake", "live", "replay"), default="fake",
+                        help="in-process fake LlamaStack, the one at LLAMASTACK_URL, or a recording")
+    parser.add_argument("--profile", type=Path, help="fake backend profile (YAML/JSON)")
+    parser.add_argument("--recording", type=Path, help="replay backend capture (from LLAMASTACK_RECORD)")
+    parser.add_argument("--replay-timing", choices=(TIMING_NONE, TIMING_ORIGINAL), default=TIMING_NONE,
+                        help="replay at memory speed, or with the recorded latencies")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--iterations", type=int, default=20, help="runs per concurrency level")
+    parser.add_argument("--idea", default=DEFAULT_IDEA)
+    parser.add_argument("--no-scoring", action="store_true", help="skip the scoring.score stage")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--baseline", type=Path, help="results to compare against (default: previous --out)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.backend == "replay" and args.recording is None:
+        parser.error("--backend replay needs --recording")
+    # llama_stack_client configures the root logger at INFO on import; keep the report readable
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    if args.backend == "fake":
+        backend = fake_backend(args.profile)
+    elif args.backend == "replay":
+        backend = replay_backend(args.recording, args.replay_timing)
+    else:
+        backend = live_backend()
+    baseline_path = args.baseline or (args.out if args.out.exists() else None)
+    baseline = load_results(baseline_path) if baseline_path else None
+
+    results = run_benchmarks(
+        backend,
+        scenarios=args.scenario,
+        levels=args.concurrency,
+        iterations=args.iterations,
+        idea=args.idea,
+        scoring=not args.no_scoring,
+    )
+    print(format_table(results))
+    write_results(results, args.out)
+    print(f"\nResults written to {args.out}")
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    print(f"Compared with {baseline_path} ({baseline['meta'].get('git_commit') or 'unknown commit'}):")
+    if not regressions:
+        print("  no regressions")
+        return 0
+    for regression in regressions:
+        print(f"  REGRESSION {regression}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
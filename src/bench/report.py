@@ -0,0 +1,103 @@
+"""Benchmark result summaries, JSON persistence and regression checks."""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+# Default tolerance before a slowdown counts as a regression (10%)
+REGRESSION_THRESHOLD = 0.10
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Linear-interpolated percentile, ``p`` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarise(values: list[float]) -> dict:
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(values),
+        "mean_ms": 1000 * sum(values) / len(values) if values else 0.0,
+        "p50_ms": 1000 * percentile(values, 50),
+        "p95_ms": 1000 * percentile(values, 95),
+        "p99_ms": 1000 * percentile(values, 99),
+        "max_ms": 1000 * max(values) if values else 0.0,
+    }
+
+
+@dataclass
+class Regression:
+    scenario: str
+    concurrency: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.scenario} @ c={self.concurrency} {self.metric}: "
+            f"{self.baseline:.1f} -> {self.current:.1f} ({self.change:+.0%})"
+        )
+
+
+def compare(current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list[Regression]:
+    """Find stages whose p95 grew, or levels whose throughput fell, by more than ``threshold``.
+
+    Only scenarios and concurrency levels present in both results are compared.
+    """
+    regressions = []
+    for scenario, levels in current.get("scenarios", {}).items():
+        base_levels = baseline.get("scenarios", {}).get(scenario, {})
+        for level, result in levels.items():
+            base = base_levels.get(level)
+            if base is None:
+                continue
+            before, after = base["throughput_per_s"], result["throughput_per_s"]
+            if before and after < before * (1 - threshold):
+                regressions.append(Regression(scenario, level, "throughput_per_s", before, after))
+            for stage, summary in result["stages"].items():
+                base_summary = base["stages"].get(stage)
+                if base_summary is None:
+                    continue
+                before, after = base_summary["p95_ms"], summary["p95_ms"]
+                if before and after > before * (1 + threshold):
+                    regressions.append(Regression(scenario, level, f"{stage} p95_ms", before, after))
+    return regressions
+
+
+def write_results(results: dict, path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def format_table(results: dict) -> str:
+    """Human-readable summary: throughput per level, then per-stage percentiles."""
+    lines = []
+    for scenario, levels in results["scenarios"].items():
+        for level, result in levels.items():
+            lines.append(
+                f"\n{scenario} @ concurrency {level}: "
+                f"{result['throughput_per_s']:.2f} runs/s, "
+                f"{result['completed']} ok, {result['failed']} failed, {result['wall_s']:.2f}s"
+            )
+            lines.append(f"  {'stage':<20}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+            for stage, s in result["stages"].items():
+                lines.append(
+                    f"  {stage:<20}{s['count']:>6}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}"
+                )
+    return "\n".join(lines)
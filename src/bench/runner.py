@@ -0,0 +1,199 @@
+"""Benchmark scenarios and the concurrency sweep.
+
+Each scenario runs ``iterations`` evaluations at a given concurrency
+against a ``Backend`` (the in-process fake by default, or a live
+LlamaStack) and reports throughput plus per-stage latency percentiles.
+Every run gets a distinct idea so gateway coalescing and the response
+cache never turn a run into a no-op.
+"""
+
+import asyncio
+import logging
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import httpx
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
+
+from src.bench.report import summarise
+from src.bench.timing import StageTimings, TimingSink
+from src.evaluation.evaluator import evaluate_report
+from src.fakestack.backend import FakeLlamaStack
+from src.fakestack.profile import load_profile
+from src.fakestack.replay import TIMING_NONE, ReplayTransport
+from src.fakestack.transport import FAKE_BASE_URL, fake_async_client, fake_client
+from src.pipeline import run_pipeline
+from src.pipeline_secure import run_secure_pipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDEA = "An AI platform that optimizes indoor farming for urban grocery chains"
+SCENARIOS = ("pipeline", "pipeline-concurrent", "secure", "gateway")
+# Stages in pipeline order, for stable report ordering
+_STAGE_ORDER = ["total", "shield:user-input", "brief", "market", "tech", "finance", "risk", "synthesis", "scoring"]
+
+
+@dataclass
+class Backend:
+    """Where benchmark runs send their LlamaStack calls."""
+    name: str
+    client: LlamaStackClient
+    # Async clients are bound to one event loop, so each loop builds its own
+    async_client_factory: Callable[[], AsyncLlamaStackClient]
+
+
+def fake_backend(profile_path: Path | None = None) -> Backend:
+    stack = FakeLlamaStack(load_profile(profile_path) if profile_path else None)
+    return Backend("fake", fake_client(stack=stack), lambda: fake_async_client(stack=stack))
+
+
+def replay_backend(recording: Path, timing: str = TIMING_NONE) -> Backend:
+    """Serve a LLAMASTACK_RECORD capture back in-process."""
+    transport = ReplayTransport(recording, timing=timing)
+    client = LlamaStackClient(base_url=FAKE_BASE_URL, http_client=httpx.Client(transport=transport), max_retries=0)
+    return Backend("replay", client, lambda: AsyncLlamaStackClient(
+        base_url=FAKE_BASE_URL, http_client=httpx.AsyncClient(transport=transport), max_retries=0
+    ))
+
+
+def live_backend() -> Backend:
+    from src.client import get_client
+    from src.config import LLAMASTACK_URL
+    return Backend("live", get_client(), lambda: AsyncLlamaStackClient(base_url=LLAMASTACK_URL))
+
+
+def _stage_rank(stage: str) -> tuple:
+    return (_STAGE_ORDER.index(stage) if stage in _STAGE_ORDER else len(_STAGE_ORDER), stage)
+
+
+def _level_result(timings: StageTimings, concurrency: int, iterations: int, errors: list[str], wall: float) -> dict:
+    samples = timings.samples()
+    completed = iterations - len(errors)
+    return {
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "completed": completed,
+        "failed": len(errors),
+        "errors": errors[:5],
+        "wall_s": wall,
+        "throughput_per_s": completed / wall if wall else 0.0,
+        "stages": {stage: summarise(samples[stage]) for stage in sorted(samples, key=_stage_rank)},
+    }
+
+
+def _sync_scenario(scenario: str, backend: Backend, scoring: bool) -> Callable[[str, StageTimings], None]:
+    def run(idea: str, timings: StageTimings):
+        with timings.measure("total"):
+            if scenario == "secure":
+                state = run_secure_pipeline(backend.client, idea, sink=TimingSink(timings))
+            else:
+                state = run_pipeline(
+                    backend.client, idea, concurrent=scenario == "pipeline-concurrent", sink=TimingSink(timings)
+                )
+        if scoring:
+            with timings.measure("scoring"):
+                evaluate_report(backend.client, state)
+    return run
+
+
+def _run_sync_level(run: Callable, idea: str, concurrency: int, iterations: int) -> dict:
+    timings = StageTimings()
+    errors: list[str] = []
+
+    def attempt(i: int):
+        try:
+            run(f"{idea} (run {i})", timings)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(attempt, range(iterations)))
+    return _level_result(timings, concurrency, iterations, errors, time.perf_counter() - start)
+
+
+async def _run_gateway_level(backend: Backend, idea: str, concurrency: int, iterations: int) -> dict:
+    """POST /evaluate through the gateway app in-process (no sockets, no lifespan).
+
+    Each request runs with the backend's client, a throwaway store and a
+    TimingSink through ``gateway_context``, so the gateway's own client,
+    store and event sink are left alone.
+    """
+    from src.gateway import server
+    from src.gateway.store import MemoryEvaluationStore
+
+    timings = StageTimings()
+    errors: list[str] = []
+    client = backend.async_client_factory()
+    store = MemoryEvaluationStore()
+    server.app.dependency_overrides[server.rate_limiter] = lambda: None
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def attempt(http: httpx.AsyncClient, i: int):
+        # Each attempt is its own task, so the context covers just its request
+        server.gateway_context.set(server.GatewayContext(client, store, TimingSink(timings)))
+        async with semaphore:
+            try:
+                with timings.measure("total"):
+                    response = await http.post("/evaluate", json={"idea": f"{idea} (run {i})"})
+                    response.raise_for_status()
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://gateway", timeout=None) as http:
+            await asyncio.gather(*(attempt(http, i) for i in range(iterations)))
+    finally:
+        server.app.dependency_overrides.pop(server.rate_limiter, None)
+        await client.close()
+    return _level_result(timings, concurrency, iterations, errors, time.perf_counter() - start)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    backend: Backend,
+    scenarios: list[str],
+    levels: list[int],
+    iterations: int,
+    idea: str = DEFAULT_IDEA,
+    scoring: bool = True,
+) -> dict:
+    """Run every scenario at every concurrency level and collect the results."""
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "backend": backend.name,
+            "iterations": iterations,
+            "levels": levels,
+        },
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {scenario!r} (choose from {', '.join(SCENARIOS)})")
+        per_level = results["scenarios"][scenario] = {}
+        for concurrency in levels:
+            logger.info("Benchmarking %s at concurrency %d", scenario, concurrency)
+            if scenario == "gateway":
+                result = asyncio.run(_run_gateway_level(backend, idea, concurrency, iterations))
+            else:
+                run = _sync_scenario(scenario, backend, scoring)
+                result = _run_sync_level(run, idea, concurrency, iterations)
+            per_level[str(concurrency)] = result
+    return results
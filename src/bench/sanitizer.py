@@ -0,0 +1,113 @@
+"""Micro-benchmark of PII sanitization: compiled single-pass sanitizer vs the per-call original.
+
+Examples:
+    python -m src.bench.sanitizer
+    python -m src.bench.sanitizer --chars 2000 20000 --repeat 200
+
+``legacy_sanitize`` is the sanitizer as it was before the patterns were
+compiled once: it reloads the patterns file, recompiles every pattern and
+makes a finditer and a sub pass per pattern on every call. It is kept
+here as the reference the compiled sanitizer is timed (and tested) against.
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import time
+from pathlib import Path
+
+from src.security.sanitizer import PATTERNS_FILE, SanitizeResult, get_sanitizer
+
+PROSE = (
+    "The founders plan to launch in 3 cities next spring with $250k of seed money, starting with "
+    "independent cafes and expanding to office catering once the unit "
+    "economics hold up. "
+)
+PII = [
+    "jane.doe@example.com",
+    "(555) 123-4567",
+    "123-45-6789",
+    "4111 1111 1111 1111",
+    "192.168.0.12",
+]
+
+
+def legacy_sanitize(text: str, patterns_path: Path = PATTERNS_FILE) -> SanitizeResult:
+    """The original implementation: load, compile and scan once per pattern on every call."""
+    with open(patterns_path) as f:
+        patterns = json.load(f)["patterns"]
+    redactions = []
+    sanitized = text
+    for pattern in patterns:
+        regex = re.compile(pattern["regex"])
+        for match in regex.finditer(sanitized):
+            redactions.append({
+                "type": pattern["name"],
+                "matched": match.group(),
+                "replacement": pattern["replacement"],
+            })
+        sanitized = regex.sub(pattern["replacement"], sanitized)
+    return SanitizeResult(original=text, sanitized=sanitized, redactions=redactions)
+
+
+def sample_text(chars: int, pii_every: int = 0, seed: int = 0) -> str:
+    """About ``chars`` of prose, with a PII value after every ``pii_every`` sentences (0: none)."""
+    rng = random.Random(seed)
+    parts, length, sentences = [], 0, 0
+    while length < chars:
+        parts.append(PROSE)
+        length += len(PROSE)
+        sentences += 1
+        if pii_every and sentences % pii_every == 0:
+            value = f"Contact: {rng.choice(PII)}. "
+            parts.append(value)
+            length += len(value)
+    return "".join(parts)
+
+
+def _per_call_us(fn, text: str, repeat: int) -> float:
+    fn(text)  # warm up: the compiled sanitizer loads its patterns here
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    compiled = get_sanitizer().sanitize
+    rows = []
+    for chars in sizes:
+        for label, pii_every in (("clean", 0), ("pii", 3)):
+            text = sample_text(chars, pii_every)
+            if compiled(text) != legacy_sanitize(text):
+                raise AssertionError(f"compiled and legacy sanitizers disagree on the {label} {chars}-char text")
+            legacy = _per_call_us(legacy_sanitize, text, repeat)
+            fast = _per_call_us(compiled, text, repeat)
+            rows.append({"text": label, "chars": len(text), "legacy_us": legacy,
+                         "compiled_us": fast, "speedup": legacy / fast})
+    return rows
+
+
+def format_table(rows: list[dict]) -> str:
+    lines = [f"{'text':<6} {'chars':>8} {'legacy µs':>12} {'compiled µs':>12} {'speedup':>8}"]
+    for row in rows:
+        lines.append(f"{row['text']:<6} {row['chars']:>8} {row['legacy_us']:>12.1f} "
+                     f"{row['compiled_us']:>12.1f} {row['speedup']:>7.1f}x")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.bench.sanitizer",
+                                     description="Time the compiled PII sanitizer against the original")
+    parser.add_argument("--chars", nargs="+", type=int, default=[500, 5000, 50000], help="text sizes")
+    parser.add_argument("--repeat", type=int, default=100, help="calls timed per size")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, force=True)
+    print(format_table(run(args.chars, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""Per-stage timing for benchmark runs.
+
+``TimingSink`` is an EventSink that turns a run's progress events into
+stage latencies: each stage (brief, each specialist, synthesis) is
+timed from its StageStarted to its StageFinished or StageFailed. The
+benchmark passes one to every pipeline it runs, so nothing outside the
+run is touched.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from src.event_sink import EventSink
+from src.events import GateResult, PipelineEvent, StageFailed, StageFinished, StageSkipped, StageStarted
+
+
+class StageTimings:
+    """Thread-safe collection of latency samples (seconds) per stage."""
+
+    def __init__(self):
+        self._samples: dict[str, list[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def samples(self) -> dict[str, list[float]]:
+        with self._lock:
+            return {stage: list(values) for stage, values in self._samples.items()}
+
+
+class TimingSink(EventSink):
+    """Records the stage latencies of one run into ``timings``.
+
+    In the secure pipeline a specialist's stage lasts until its gates
+    have passed, so gate latency not hidden behind the next specialist
+    shows up there. The input check, which has no stage events, is
+    recorded as "shield:user-input", timed from the sink's creation.
+    """
+
+    def __init__(self, timings: StageTimings):
+        self.timings = timings
+        self._created = time.perf_counter()
+        self._started: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event: PipelineEvent):
+        now = time.perf_counter()
+        with self._lock:
+            if isinstance(event, StageStarted):
+                self._started[event.stage] = now
+            elif isinstance(event, (StageFinished, StageFailed)):
+                start = self._started.pop(event.stage, None)
+                if start is not None:
+                    self.timings.record(event.stage, now - start)
+            elif isinstance(event, StageSkipped):
+                self._started.pop(event.stage, None)
+            elif isinstance(event, GateResult) and event.stage == "user-input":
+                self.timings.record("shield:user-input", now - self._created)
@@ -0,0 +1,272 @@
+"""Generic two-tier cache: in-memory LRU backed by an optional SQLite tier.
+
+Both tiers support a TTL and size-based eviction, and every entry carries
+a ``tag`` (e.g. the model id that produced it) so whole groups of entries
+can be invalidated at once. Values are strings; callers serialise
+structured data themselves.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hit_rate,
+        }
+
+
+@dataclass
+class _Entry:
+    value: str
+    tag: str
+    expires_at: float | None
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU bounded by entry count and total value size."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.value
+
+    def put(self, key: str, value: str, tag: str = ""):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, tag, expires_at)
+            self._bytes += len(value)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_tags(self, keep: set[str]) -> int:
+        """Drop every entry whose tag is not in ``keep``. Returns the count dropped."""
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e.tag not in keep]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.value)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_cache_tag ON cache (tag);
+"""
+
+
+class SQLiteCache:
+    """Persistent cache tier in a SQLite file, evicting least-recently-used past ``max_bytes``.
+
+    Expiry uses wall-clock time so entries survive restarts.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def get(self, key: str) -> str | None:
+        entry = self.get_with_tag(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_tag(self, key: str) -> tuple[str, str] | None:
+        """Return (value, tag) for a live entry, or None."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, tag, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, tag, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+            return value, tag
+
+    def put(self, key: str, value: str, tag: str = ""):
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, tag, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, tag, len(value), expires_at, now),
+            )
+            if self.max_bytes is not None:
+                self._evict()
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def invalidate_tags(self, keep: set[str]) -> int:
+        """Drop every entry whose tag is not in ``keep``. Returns the count dropped."""
+        placeholders = ",".join("?" * len(keep))
+        where = f"tag NOT IN ({placeholders})" if keep else "1"
+        with self._lock, self._conn:
+            return self._conn.execute(f"DELETE FROM cache WHERE {where}", list(keep)).rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at").fetchall():
+            victims.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+        self.stats.evictions += len(victims)
+
+
+class TieredCache:
+    """Memory LRU in front of an optional SQLite tier; disk hits are promoted to memory."""
+
+    def __init__(self, memory: LRUCache, disk: SQLiteCache | None = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> str | None:
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+        entry = self.disk.get_with_tag(key)
+        if entry is None:
+            return None
+        value, tag = entry
+        self.memory.put(key, value, tag)
+        return value
+
+    def put(self, key: str, value: str, tag: str = ""):
+        self.memory.put(key, value, tag)
+        if self.disk is not None:
+            self.disk.put(key, value, tag)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def invalidate_tags(self, keep: set[str]) -> int:
+        dropped = self.memory.invalidate_tags(keep)
+        if self.disk is not None:
+            dropped += self.disk.invalidate_tags(keep)
+        return dropped
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        stats = {"memory": self.memory.stats.as_dict(), "memory_entries": len(self.memory)}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats.as_dict()
+        return stats
@@ -1,15 +1,221 @@
-"""LlamaStack client wrapper."""
+"""LlamaStack client factory.
 
+The process shares one sync and one async client, each with its own
+keep-alive connection pool, instead of building a new client (and a new
+pool) per request. Pool size, keep-alive, timeouts and HTTP/2 come from
+config. Connection reuse is tracked through httpcore's trace hook so it
+can be checked in production via ``connection_stats()``.
+
+The async client's connections belong to the event loop that opened
+them; use it from a single long-lived loop (e.g. the gateway's).
+
+LLAMASTACK_RECORD captures every exchange to a file, and
+LLAMASTACK_REPLAY serves a capture back without a server (see
+src/fakestack/replay.py). With several LLAMASTACK_URLS, both clients
+share one Balancer that spreads requests over them (see src/balancer.py).
+"""
+
+import asyncio
 import logging
+import threading
+from dataclasses import dataclass, field
 
-from llama_stack_client import LlamaStackClient
+import httpx
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.config import LLAMASTACK_URL
+from src.balancer import AsyncBalancingTransport, Balancer, BalancingTransport
+from src.config import (
+    LLAMASTACK_CONNECT_TIMEOUT,
+    LLAMASTACK_HTTP2,
+    LLAMASTACK_KEEPALIVE_EXPIRY,
+    LLAMASTACK_MAX_CONNECTIONS,
+    LLAMASTACK_MAX_KEEPALIVE,
+    LLAMASTACK_MAX_RETRIES,
+    LLAMASTACK_RECORD,
+    LLAMASTACK_REPLAY,
+    LLAMASTACK_REPLAY_TIMING,
+    LLAMASTACK_TIMEOUT,
+    LLAMASTACK_URL,
+    LLAMASTACK_URLS,
+)
+
+logger = logging.getLogger(__name__)
 
 # Suppress noisy httpx request logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
+@dataclass
+class ConnectionStats:
+    """Requests sent vs. TCP connections opened across the shared clients."""
+    requests: int = 0
+    connections_opened: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def as_dict(self) -> dict:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused": reused,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+        }
+
+
+_stats = ConnectionStats()
+_client: LlamaStackClient | None = None
+_async_client: AsyncLlamaStackClient | None = None
+_balancer: Balancer | None = None
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLAMASTACK_MAX_CONNECTIONS,
+        max_keepalive_connections=LLAMASTACK_MAX_KEEPALIVE,
+        keepalive_expiry=LLAMASTACK_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLAMASTACK_TIMEOUT, connect=LLAMASTACK_CONNECT_TIMEOUT)
+
+
+def _trace(event_name: str, info: dict):
+    if event_name == "connection.connect_tcp.complete":
+        _stats.record_connection()
+
+
+async def _async_trace(event_name: str, info: dict):
+    _trace(event_name, info)
+
+
+def _on_request(request: httpx.Request):
+    _stats.record_request()
+    request.extensions["trace"] = _trace
+
+
+async def _on_async_request(request: httpx.Request):
+    _stats.record_request()
+    request.extensions["trace"] = _async_trace
+
+
+def _http2_enabled() -> bool:
+    if not LLAMASTACK_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("LLAMASTACK_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1")
+        return False
+    return True
+
+
+def _get_balancer() -> Balancer | None:
+    """The process-wide balancer when several backends are configured. Call with _lock held."""
+    global _balancer
+    if _balancer is None and len(LLAMASTACK_URLS) > 1:
+        _balancer = Balancer(LLAMASTACK_URLS)
+        _balancer.start_health_checks()
+        logger.info("Balancing LlamaStack requests across %s", ", ".join(LLAMASTACK_URLS))
+    return _balancer
+
+
+def _transport(transport_cls: type) -> httpx.BaseTransport | httpx.AsyncBaseTransport | None:
+    """Replay, balancing and/or recording transport when configured; None keeps httpx's default."""
+    if LLAMASTACK_REPLAY:
+        from src.fakestack.replay import ReplayTransport
+        return ReplayTransport(LLAMASTACK_REPLAY, timing=LLAMASTACK_REPLAY_TIMING)
+    balancer = _get_balancer()
+    if balancer is None and not LLAMASTACK_RECORD:
+        return None
+    transport = transport_cls(limits=_limits(), http2=_http2_enabled())
+    if balancer is not None:
+        balancing_cls = AsyncBalancingTransport if transport_cls is httpx.AsyncHTTPTransport else BalancingTransport
+        transport = balancing_cls(balancer, transport)
+    if LLAMASTACK_RECORD:
+        from src.fakestack.replay import RecordingTransport
+        transport = RecordingTransport(transport, LLAMASTACK_RECORD)
+    return transport
+
+
 def get_client() -> LlamaStackClient:
-    """Return a configured LlamaStack client."""
-    return LlamaStackClient(base_url=LLAMASTACK_URL)
+    """Return the shared, configured LlamaStack client."""
+    global _client
+    with _lock:
+        if _client is None:
+            http_client = httpx.Client(
+                limits=_limits(),
+                timeout=_timeout(),
+                http2=_http2_enabled(),
+                transport=_transport(httpx.HTTPTransport),
+                event_hooks={"request": [_on_request]},
+            )
+            _client = LlamaStackClient(
+                base_url=LLAMASTACK_URL,
+                http_client=http_client,
+                timeout=_timeout(),
+                max_retries=LLAMASTACK_MAX_RETRIES,
+            )
+        return _client
+
+
+def get_async_client() -> AsyncLlamaStackClient:
+    """Return the shared, configured async LlamaStack client for event-loop callers."""
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            http_client = httpx.AsyncClient(
+                limits=_limits(),
+                timeout=_timeout(),
+                http2=_http2_enabled(),
+                transport=_transport(httpx.AsyncHTTPTransport),
+                event_hooks={"request": [_on_async_request]},
+            )
+            _async_client = AsyncLlamaStackClient(
+                base_url=LLAMASTACK_URL,
+                http_client=http_client,
+                timeout=_timeout(),
+                max_retries=LLAMASTACK_MAX_RETRIES,
+            )
+        return _async_client
+
+
+def close_client():
+    """Close the shared sync client's connection pool and stop the balancer's health checks."""
+    global _client, _balancer
+    with _lock:
+        client, _client = _client, None
+        balancer, _balancer = _balancer, None
+    if client is not None:
+        client.close()
+    if balancer is not None:
+        balancer.close()
+
+
+async def aclose_async_client():
+    """Close the shared async client's connection pool (e.g. from a FastAPI lifespan)."""
+    global _async_client, _balancer
+    with _lock:
+        client, _async_client = _async_client, None
+        balancer, _balancer = _balancer, None
+    if client is not None:
+        await client.close()
+    if balancer is not None:
+        await asyncio.to_thread(balancer.close)  # joins the health thread
+
+
+def connection_stats() -> dict:
+    """Connection reuse counters for the shared clients, plus per-backend load when balancing."""
+    stats = _stats.as_dict()
+    if _balancer is not None:
+        stats["balancer"] = _balancer.stats()
+    return stats
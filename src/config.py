@@ -17,12 +17,81 @@ OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 # LlamaStack server URL (can point to a remote machine)
 LLAMASTACK_URL = os.getenv("LLAMASTACK_URL", "http://localhost:8321")
 
+# Several backends (comma-separated origins) to balance across; see src/balancer.py.
+# Empty, or a single URL, means LLAMASTACK_URL only.
+LLAMASTACK_URLS = [u.strip() for u in os.getenv("LLAMASTACK_URLS", "").split(",") if u.strip()]
+LLAMASTACK_BALANCER = os.getenv("LLAMASTACK_BALANCER", "least-outstanding")  # or "ewma"
+LLAMASTACK_HEALTH_INTERVAL = float(os.getenv("LLAMASTACK_HEALTH_INTERVAL", "10"))  # seconds; 0 disables
+LLAMASTACK_EJECT_AFTER = int(os.getenv("LLAMASTACK_EJECT_AFTER", "3"))  # consecutive failures
+LLAMASTACK_EJECT_SECONDS = float(os.getenv("LLAMASTACK_EJECT_SECONDS", "30"))
+
+# Shared LlamaStack client connection pool and timeouts
+LLAMASTACK_MAX_CONNECTIONS = int(os.getenv("LLAMASTACK_MAX_CONNECTIONS", "100"))
+LLAMASTACK_MAX_KEEPALIVE = int(os.getenv("LLAMASTACK_MAX_KEEPALIVE", "20"))
+LLAMASTACK_KEEPALIVE_EXPIRY = float(os.getenv("LLAMASTACK_KEEPALIVE_EXPIRY", "30"))  # seconds
+LLAMASTACK_TIMEOUT = float(os.getenv("LLAMASTACK_TIMEOUT", "600"))  # seconds; LLM turns are slow
+LLAMASTACK_CONNECT_TIMEOUT = float(os.getenv("LLAMASTACK_CONNECT_TIMEOUT", "10"))
+LLAMASTACK_MAX_RETRIES = int(os.getenv("LLAMASTACK_MAX_RETRIES", "2"))
+LLAMASTACK_HTTP2 = os.getenv("LLAMASTACK_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Record every LlamaStack exchange to a file, or replay one in-process
+# instead of calling the server (timing: none or original)
+LLAMASTACK_RECORD = os.getenv("LLAMASTACK_RECORD", "")
+LLAMASTACK_REPLAY = os.getenv("LLAMASTACK_REPLAY", "")
+LLAMASTACK_REPLAY_TIMING = os.getenv("LLAMASTACK_REPLAY_TIMING", "none")
+
 # Coordinator uses larger model for better reasoning
 COORDINATOR_MODEL = os.getenv("COORDINATOR_MODEL", "ollama/llama3.1:8b")
 
 # Specialist agents use smaller model
 SPECIALIST_MODEL = os.getenv("SPECIALIST_MODEL", "ollama/llama3.2:3b")
 
+# Agent pool: reuse agent definitions and keep sessions pre-created.
+# Sessions are single-use by default because they carry turn history.
+AGENT_POOL = os.getenv("AGENT_POOL", "on")
+AGENT_POOL_PREWARM = int(os.getenv("AGENT_POOL_PREWARM", "1"))  # idle sessions kept per agent
+AGENT_POOL_SESSION_MAX_USES = int(os.getenv("AGENT_POOL_SESSION_MAX_USES", "1"))
+AGENT_POOL_SESSION_MAX_AGE = float(os.getenv("AGENT_POOL_SESSION_MAX_AGE", "600"))  # seconds
+
+# Max specialists evaluated in parallel when the pipeline runs concurrently
+SPECIALIST_CONCURRENCY = int(os.getenv("SPECIALIST_CONCURRENCY", "4"))
+
+# Agent turn response cache: "off" (default), "memory" (LRU) or "disk" (LRU + SQLite)
+LLM_CACHE = os.getenv("LLM_CACHE", "off")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))  # seconds; 0 disables expiry
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+LLM_CACHE_PATH = Path(os.getenv(
+    "LLM_CACHE_PATH",
+    str(Path(__file__).resolve().parent.parent / ".data" / "llm_cache.db"),
+))
+
+# Shield verdict cache: "off", "memory" (LRU only) or "disk" (LRU + SQLite).
+# Bump SHIELD_VERSION when the shield model or its config changes; verdicts
+# from other versions are dropped. Violations are only cached if
+# SHIELD_CACHE_VIOLATIONS is set.
+SHIELD_CACHE = os.getenv("SHIELD_CACHE", "off")
+SHIELD_VERSION = os.getenv("SHIELD_VERSION", "1")
+SHIELD_CACHE_TTL = float(os.getenv("SHIELD_CACHE_TTL", "86400"))  # seconds; 0 disables expiry
+SHIELD_CACHE_MAX_ENTRIES = int(os.getenv("SHIELD_CACHE_MAX_ENTRIES", "10000"))
+SHIELD_CACHE_MAX_BYTES = int(os.getenv("SHIELD_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SHIELD_CACHE_VIOLATIONS = os.getenv("SHIELD_CACHE_VIOLATIONS", "false").lower() in ("1", "true", "yes")
+SHIELD_CACHE_PATH = Path(os.getenv(
+    "SHIELD_CACHE_PATH",
+    str(Path(__file__).resolve().parent.parent / ".data" / "shield_cache.db"),
+))
+
+# Shield gating of long agent outputs in overlapping windows, checked in
+# parallel: characters per window (0 checks the whole text in one call),
+# characters shared by neighbouring windows, and windows checked at once.
+# Prompt-guard reads 512 tokens, roughly 2000 characters of English. The
+# overlap is capped at half a window, so small windows still advance.
+SHIELD_CHUNK_CHARS = int(os.getenv("SHIELD_CHUNK_CHARS", "0"))
+SHIELD_CHUNK_OVERLAP = int(os.getenv("SHIELD_CHUNK_OVERLAP", "200"))
+if SHIELD_CHUNK_CHARS:
+    SHIELD_CHUNK_OVERLAP = min(SHIELD_CHUNK_OVERLAP, SHIELD_CHUNK_CHARS // 2)
+SHIELD_CHUNK_CONCURRENCY = int(os.getenv("SHIELD_CHUNK_CONCURRENCY", "4"))
+
 # Embedding model for RAG
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "ollama/nomic-embed-text")
 
@@ -32,5 +101,59 @@ GATEWAY_PORT = int(os.getenv("GATEWAY_PORT", "8080"))
 RATE_LIMIT_CAPACITY = int(os.getenv("RATE_LIMIT_CAPACITY", "5"))
 RATE_LIMIT_REFILL_RATE = float(os.getenv("RATE_LIMIT_REFILL_RATE", "0.1"))
 
+# Gateway evaluation store: "sqlite" (durable, default) or "memory"
+EVALUATION_STORE = os.getenv("EVALUATION_STORE", "sqlite")
+EVALUATION_DB_PATH = Path(os.getenv(
+    "EVALUATION_DB_PATH",
+    str(Path(__file__).resolve().parent.parent / ".data" / "evaluations.db"),
+))
+
+# Gateway job queue: pipelines run concurrently, pending jobs waiting in queue,
+# finished jobs kept for status lookups
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_HISTORY_LIMIT = int(os.getenv("JOB_HISTORY_LIMIT", "1000"))
+
+# Where gateway jobs run: "local" (the in-process worker pool above) or "queue"
+# (a durable SQLite queue drained by separate `multia worker` processes, which
+# renew a JOB_LEASE_SECONDS lease while running; expired leases are requeued
+# up to JOB_MAX_ATTEMPTS times)
+JOB_BACKEND = os.getenv("JOB_BACKEND", "local")
+JOB_QUEUE_DB_PATH = Path(os.getenv(
+    "JOB_QUEUE_DB_PATH",
+    str(Path(__file__).resolve().parent.parent / ".data" / "jobs.db"),
+))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+
+# Gateway pipeline progress events: "log" (structured logging), "console" or "none".
+# Delivered from a background thread; events beyond the queue size are dropped.
+GATEWAY_EVENT_SINK = os.getenv("GATEWAY_EVENT_SINK", "log")
+EVENT_SINK_QUEUE_SIZE = int(os.getenv("EVENT_SINK_QUEUE_SIZE", "10000"))
+
+# Gateway model-affinity scheduling ("on"/"off"): run agent turns for one model
+# at a time across pipelines so Ollama swaps models less. SLOTS turns run at
+# once; switch models after MAX_BATCH turns or once a turn waits MAX_WAIT seconds.
+MODEL_SCHEDULER = os.getenv("MODEL_SCHEDULER", "off")
+MODEL_SCHEDULER_SLOTS = int(os.getenv("MODEL_SCHEDULER_SLOTS", "4"))
+MODEL_SCHEDULER_MAX_BATCH = int(os.getenv("MODEL_SCHEDULER_MAX_BATCH", "16"))
+MODEL_SCHEDULER_MAX_WAIT = float(os.getenv("MODEL_SCHEDULER_MAX_WAIT", "30"))
+
+# Adaptive concurrency limits on agent turns, shield runs and scoring calls
+# (src/limiter.py): "off" or "on". Each call kind gets its own AIMD limit
+# between MIN and MAX; calls over it queue (up to QUEUE waiting, for at most
+# QUEUE_TIMEOUT seconds) or are shed. A call slower than TOLERANCE x the
+# baseline latency, or failing with a connection error/5xx, multiplies the
+# limit by BACKOFF.
+ADAPTIVE_LIMIT = os.getenv("ADAPTIVE_LIMIT", "off")
+ADAPTIVE_LIMIT_INITIAL = int(os.getenv("ADAPTIVE_LIMIT_INITIAL", "4"))
+ADAPTIVE_LIMIT_MIN = int(os.getenv("ADAPTIVE_LIMIT_MIN", "1"))
+ADAPTIVE_LIMIT_MAX = int(os.getenv("ADAPTIVE_LIMIT_MAX", "64"))
+ADAPTIVE_LIMIT_QUEUE = int(os.getenv("ADAPTIVE_LIMIT_QUEUE", "256"))
+ADAPTIVE_LIMIT_QUEUE_TIMEOUT = float(os.getenv("ADAPTIVE_LIMIT_QUEUE_TIMEOUT", "120"))  # seconds
+ADAPTIVE_LIMIT_TOLERANCE = float(os.getenv("ADAPTIVE_LIMIT_TOLERANCE", "2.0"))
+ADAPTIVE_LIMIT_BACKOFF = float(os.getenv("ADAPTIVE_LIMIT_BACKOFF", "0.9"))
+
 # MCP demo server
 MCP_DEMO_PORT = int(os.getenv("MCP_DEMO_PORT", "8888"))
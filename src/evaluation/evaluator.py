@@ -3,10 +3,15 @@
 import logging
 from dataclasses import dataclass, field
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
 from src.config import COORDINATOR_MODEL
-from src.evaluation.scoring_setup import get_scoring_function_ids, register_scoring_functions
+from src.evaluation.scoring_setup import (
+    get_scoring_function_ids,
+    register_scoring_functions,
+    register_scoring_functions_async,
+)
+from src.limiter import SCORE, limited, limited_async
 from src.state import EvaluationState
 
 logger = logging.getLogger(__name__)
@@ -22,17 +27,8 @@ class EvalResult:
     details: dict = field(default_factory=dict)
 
 
-def evaluate_report(
-    client: LlamaStackClient,
-    state: EvaluationState,
-) -> EvalResult:
-    """Score a pipeline's final report using LLM-as-Judge.
-
-    Registers scoring functions if needed, then scores the report
-    against all configured evaluation dimensions.
-    """
-    register_scoring_functions(client)
-
+def _scoring_request(state: EvaluationState) -> tuple[dict, dict]:
+    """Build the (input_row, scoring_functions) pair for a scoring call."""
     fn_ids = get_scoring_function_ids()
 
     # Build the input row — the report text goes into generated_answer
@@ -51,12 +47,10 @@ def evaluate_report(
         }
         for fn_id in fn_ids
     }
+    return input_row, scoring_functions
 
-    response = client.scoring.score(
-        input_rows=[input_row],
-        scoring_functions=scoring_functions,
-    )
 
+def _eval_result(response) -> EvalResult:
     scores = {}
     details = {}
     for fn_id, result in response.results.items():
@@ -78,3 +72,39 @@ def evaluate_report(
         needs_review=avg_score <= REVIEW_SCORE_THRESHOLD,
         details=details,
     )
+
+
+def evaluate_report(
+    client: LlamaStackClient,
+    state: EvaluationState,
+) -> EvalResult:
+    """Score a pipeline's final report using LLM-as-Judge.
+
+    Registers scoring functions if needed, then scores the report
+    against all configured evaluation dimensions.
+    """
+    register_scoring_functions(client)
+
+    input_row, scoring_functions = _scoring_request(state)
+    with limited(SCORE):
+        response = client.scoring.score(
+            input_rows=[input_row],
+            scoring_functions=scoring_functions,
+        )
+    return _eval_result(response)
+
+
+async def evaluate_report_async(
+    client: AsyncLlamaStackClient,
+    state: EvaluationState,
+) -> EvalResult:
+    """Async variant of evaluate_report."""
+    await register_scoring_functions_async(client)
+
+    input_row, scoring_functions = _scoring_request(state)
+    async with limited_async(SCORE):
+        response = await client.scoring.score(
+            input_rows=[input_row],
+            scoring_functions=scoring_functions,
+        )
+    return _eval_result(response)
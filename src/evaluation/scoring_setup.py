@@ -5,7 +5,7 @@ from pathlib import Path
 
 import yaml
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
 from src.config import COORDINATOR_MODEL
 
@@ -19,6 +19,16 @@ def _load_scoring_config(path: Path = CONFIG_FILE) -> dict:
         return yaml.safe_load(f)
 
 
+def _registration_params(fn_config: dict) -> dict:
+    return {
+        "type": "llm_as_judge",
+        "judge_model": COORDINATOR_MODEL,
+        "prompt_template": fn_config["prompt_template"],
+        "judge_score_regexes": [r"Score:\s*\[?(\d+)\]?"],
+        "aggregation_functions": ["average"],
+    }
+
+
 def register_scoring_functions(client: LlamaStackClient, config_path: Path = CONFIG_FILE):
     """Register all scoring functions from config with LlamaStack."""
     config = _load_scoring_config(config_path)
@@ -31,13 +41,28 @@ def register_scoring_functions(client: LlamaStackClient, config_path: Path = CON
                 description=fn_config["description"],
                 return_type={"type": "number"},
                 provider_id="llm-as-judge",
-                params={
-                    "type": "llm_as_judge",
-                    "judge_model": COORDINATOR_MODEL,
-                    "prompt_template": fn_config["prompt_template"],
-                    "judge_score_regexes": [r"Score:\s*\[?(\d+)\]?"],
-                    "aggregation_functions": ["average"],
-                },
+                params=_registration_params(fn_config),
+            )
+            logger.info("Registered scoring function: %s", scoring_fn_id)
+        except Exception as e:
+            logger.warning("Could not register %s: %s", scoring_fn_id, e)
+
+
+async def register_scoring_functions_async(
+    client: AsyncLlamaStackClient, config_path: Path = CONFIG_FILE
+):
+    """Async variant of register_scoring_functions."""
+    config = _load_scoring_config(config_path)
+
+    for fn_id, fn_config in config.get("scoring_functions", {}).items():
+        scoring_fn_id = f"multia-{fn_id}"
+        try:
+            await client.scoring_functions.register(
+                scoring_fn_id=scoring_fn_id,
+                description=fn_config["description"],
+                return_type={"type": "number"},
+                provider_id="llm-as-judge",
+                params=_registration_params(fn_config),
             )
             logger.info("Registered scoring function: %s", scoring_fn_id)
         except Exception as e:
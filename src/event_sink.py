@@ -0,0 +1,282 @@
+"""Where pipeline progress events go.
+
+run_pipeline and run_secure_pipeline (and their async variants) report
+progress by emitting events (src/events.py) to an EventSink instead of
+printing:
+
+- ConsoleSink renders the familiar CLI output (the default)
+- NullSink discards everything
+- LoggingSink writes one structured log record per event
+- BackgroundSink hands events to a worker thread so emit() never blocks
+  the caller; the gateway wraps its sink in one
+
+    run_pipeline(client, idea, sink=NullSink())
+"""
+
+import json
+import logging
+import queue
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import TextIO
+
+from src.config import EVENT_SINK_QUEUE_SIZE
+from src.events import (
+    FinalReport,
+    GateResult,
+    PipelineEvent,
+    StageFailed,
+    StageFinished,
+    StageSkipped,
+    StageStarted,
+    TokenDelta,
+)
+from src.state import EvaluationState
+
+logger = logging.getLogger(__name__)
+
+RULE = "=" * 60
+
+
+class EventSink(ABC):
+    """Interface for receiving pipeline progress events."""
+
+    @abstractmethod
+    def emit(self, event: PipelineEvent):
+        ...
+
+    def close(self):
+        pass
+
+
+class NullSink(EventSink):
+    """Discards every event."""
+
+    def emit(self, event: PipelineEvent):
+        pass
+
+
+# Events after which a stage has nothing more to print
+_STAGE_ENDS = (StageFinished, StageFailed, StageSkipped)
+
+
+def _starts_run(event: PipelineEvent) -> bool:
+    """The first event of a run: its input gate (secure pipeline) or the brief starting."""
+    return event == StageStarted("brief") or (isinstance(event, GateResult) and event.stage == "user-input")
+
+
+class ConsoleSink(EventSink):
+    """Prints progress the way the CLI always has: headers, brief, scores, summary.
+
+    Stages are printed one at a time, in the order they started. Events
+    of a stage that starts while an earlier one is still open (the next
+    specialist running while the previous one's gates settle, or
+    concurrent specialists) are held back until the earlier stages end,
+    so the output reads the same however the stages overlapped.
+
+    Output goes to ``stream``, or to whatever sys.stdout is at the time
+    (so contextlib.redirect_stdout still works). Meant for one run at a
+    time; a new run (its input gate or brief) drops anything still held
+    from a run that raised.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream
+        # Stages whose output went through security gates in the current run
+        self._gated: set[str] = set()
+        # Started stages that have not ended yet, in start order, and the
+        # events held back for all but the first of them
+        self._open: list[str] = []
+        self._held: dict[str, list[PipelineEvent]] = {}
+        self._lock = threading.Lock()
+
+    def _print(self, *lines: str):
+        stream = self.stream or sys.stdout
+        for line in lines:
+            print(line, file=stream)
+
+    def emit(self, event: PipelineEvent):
+        if isinstance(event, TokenDelta):
+            return
+        with self._lock:
+            if isinstance(event, FinalReport):
+                for stage in self._open:
+                    for held in self._held.get(stage, []):
+                        self._render(held)
+                self._reset()
+                self._render(event)
+                return
+            if _starts_run(event):
+                self._reset()
+            if isinstance(event, StageStarted) and event.stage not in self._open:
+                self._open.append(event.stage)
+            stage = getattr(event, "stage", None)
+            if stage not in self._open:
+                self._render(event)
+            elif stage != self._open[0]:
+                self._held.setdefault(stage, []).append(event)
+            else:
+                self._render(event)
+                if isinstance(event, _STAGE_ENDS):
+                    self._next_stage()
+
+    def _reset(self):
+        self._open.clear()
+        self._held.clear()
+
+    def _next_stage(self):
+        """Close the first open stage and print what the stages after it held back."""
+        self._open.pop(0)
+        while self._open:
+            held = self._held.pop(self._open[0], [])
+            for event in held:
+                self._render(event)
+            if not any(isinstance(event, _STAGE_ENDS) for event in held):
+                return
+            self._open.pop(0)
+
+    def _render(self, event: PipelineEvent):
+        if isinstance(event, StageStarted):
+            self._stage_started(event.stage)
+        elif isinstance(event, StageFinished):
+            self._stage_finished(event)
+        elif isinstance(event, StageFailed):
+            self._print(f"FAILED: {event.error}")
+        elif isinstance(event, StageSkipped):
+            self._print(f"SKIPPED: {event.reason}")
+        elif isinstance(event, GateResult):
+            self._gate_result(event)
+        elif isinstance(event, FinalReport):
+            self._summary(event.state)
+            self._gated.clear()
+
+    def _stage_started(self, stage: str):
+        self._gated.discard(stage)
+        if stage == "brief":
+            # The secure pipeline's input check comes first
+            lead = "\n" if "user-input" in self._gated else ""
+            self._print(f"{lead}{RULE}", "[Coordinator] Creating evaluation brief...", RULE)
+        elif stage == "synthesis":
+            self._print(f"\n{RULE}", "[Coordinator] Synthesizing final report...", RULE)
+        else:
+            self._print(f"\n{RULE}", f"[{stage.title()} Agent] Evaluating...", RULE)
+
+    def _stage_finished(self, event: StageFinished):
+        if event.stage == "brief":
+            self._print(event.output)
+        elif event.stage == "synthesis":
+            pass  # printed with the summary
+        elif event.stage in self._gated:
+            self._print(f"[Security] {event.stage.title()} output passed all checks", f"Score: {event.score}/10")
+        else:
+            self._print(f"Score: {event.score}/10", event.output[:500])
+            if len(event.output) > 500:
+                self._print("...")
+
+    def _gate_result(self, event: GateResult):
+        self._gated.add(event.stage)
+        name = event.stage.title()
+        if event.stage == "user-input":
+            self._print(RULE, "[Security] Checking input through shield gate...", RULE)
+            if event.passed:
+                self._print("Input passed shield check")
+        elif event.gate == "shield":
+            self._print(f"[Security] Shield gate on {name} output...")
+        elif event.gate == "heuristic":
+            if not event.passed:
+                self._print(f"[Security] Heuristic warning: {event.reason}")
+        elif event.gate == "validator":
+            self._print(f"[Security] LLM validation of {name} output...")
+
+    def _summary(self, state: EvaluationState):
+        self._print(state.final_report, f"\n{RULE}", "SUMMARY", RULE)
+        for name, evaluation in state.evaluations.items():
+            self._print(f"  {name:>10}: {evaluation.score}/10")
+        for name in state.errors:
+            self._print(f"  {name:>10}: FAILED")
+        for name in state.skipped:
+            self._print(f"  {name:>10}: SKIPPED")
+        self._print(f"  {'Average':>10}: {state.average_score:.1f}/10", f"  Recommendation: {state.recommendation}")
+
+
+# Free-text event fields that can run to kilobytes
+_TEXT_FIELDS = {"output", "text", "report", "error", "reason"}
+
+
+class LoggingSink(EventSink):
+    """One structured log record per event.
+
+    The message is the event as JSON (long text fields cut to
+    ``max_chars``) and the full dict is attached as ``record.pipeline_event``
+    for JSON formatters. Token deltas are logged at DEBUG.
+    """
+
+    def __init__(self, log: logging.Logger | None = None, max_chars: int = 200):
+        self.log = log or logger
+        self.max_chars = max_chars
+
+    def emit(self, event: PipelineEvent):
+        level = logging.DEBUG if isinstance(event, TokenDelta) else logging.INFO
+        if not self.log.isEnabledFor(level):
+            return
+        data = {
+            key: value[:self.max_chars] if key in _TEXT_FIELDS else value
+            for key, value in event.to_dict().items()
+        }
+        self.log.log(level, json.dumps(data), extra={"pipeline_event": data})
+
+
+_CLOSE = object()
+
+
+class BackgroundSink(EventSink):
+    """Forwards events to ``inner`` on a worker thread; emit() never blocks.
+
+    The queue is bounded: when it is full, events are dropped (and
+    counted in ``dropped``) rather than stalling the pipeline.
+    """
+
+    def __init__(self, inner: EventSink, maxsize: int = EVENT_SINK_QUEUE_SIZE):
+        self.inner = inner
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._drain, name="event-sink", daemon=True)
+        self._thread.start()
+
+    def emit(self, event: PipelineEvent):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self):
+        while (event := self._queue.get()) is not _CLOSE:
+            try:
+                self.inner.emit(event)
+            except Exception:
+                logger.warning("Event sink failed on %s", type(event).__name__, exc_info=True)
+
+    def close(self):
+        """Deliver everything queued so far, then stop the worker."""
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+        self.inner.close()
+
+
+def create_event_sink(kind: str, background: bool = False) -> EventSink:
+    """Build a sink by name ("console", "log" or "none").
+
+    ``background=True`` wraps it in a BackgroundSink so a slow console or
+    log handler cannot block the caller.
+    """
+    if kind == "none":
+        return NullSink()
+    if kind == "console":
+        sink = ConsoleSink()
+    elif kind == "log":
+        sink = LoggingSink()
+    else:
+        raise ValueError(f"Unknown event sink: {kind!r}")
+    return BackgroundSink(sink) if background else sink
@@ -0,0 +1,82 @@
+"""Typed progress events emitted while an evaluation runs."""
+
+from dataclasses import asdict, dataclass
+from typing import ClassVar
+
+from src.state import EvaluationState
+
+
+@dataclass
+class PipelineEvent:
+    """Base class; ``type`` names the event on the wire (e.g. the SSE event name)."""
+    type: ClassVar[str] = "event"
+
+    def to_dict(self) -> dict:
+        return {"type": self.type, **asdict(self)}
+
+
+@dataclass
+class StageStarted(PipelineEvent):
+    """A stage (brief, a specialist, synthesis) began."""
+    type: ClassVar[str] = "stage_started"
+    stage: str
+
+
+@dataclass
+class TokenDelta(PipelineEvent):
+    """A chunk of text streamed from a stage's agent turn."""
+    type: ClassVar[str] = "token"
+    stage: str
+    text: str
+
+
+@dataclass
+class StageFinished(PipelineEvent):
+    """A stage completed; specialists carry their score."""
+    type: ClassVar[str] = "stage_finished"
+    stage: str
+    output: str
+    score: float | None = None
+
+
+@dataclass
+class StageFailed(PipelineEvent):
+    type: ClassVar[str] = "stage_failed"
+    stage: str
+    error: str
+
+
+@dataclass
+class StageSkipped(PipelineEvent):
+    """A specialist was not run (or was cancelled) because the outcome was already decided."""
+    type: ClassVar[str] = "stage_skipped"
+    stage: str
+    reason: str
+
+
+@dataclass
+class GateResult(PipelineEvent):
+    """Outcome of one security gate (shield, heuristic, validator) on a stage's output."""
+    type: ClassVar[str] = "gate_result"
+    stage: str
+    gate: str
+    passed: bool
+    reason: str | None = None
+
+
+@dataclass
+class FinalReport(PipelineEvent):
+    """The evaluation finished; the last event of a run."""
+    type: ClassVar[str] = "final_report"
+    state: EvaluationState
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type,
+            "report": self.state.final_report,
+            "recommendation": self.state.recommendation,
+            "average_score": self.state.average_score,
+            "scores": {name: e.score for name, e in self.state.evaluations.items()},
+            "errors": dict(self.state.errors),
+            "skipped": list(self.state.skipped),
+        }
@@ -0,0 +1,396 @@
+"""Transport-independent core of the fake LlamaStack.
+
+``FakeLlamaStack.handle`` takes a method, path and JSON body and returns
+a ``FakeResponse`` describing what to send back and how long to wait.
+The HTTP server (server.py) and the in-process httpx transport
+(transport.py) both sit on top of it.
+
+Only the subset of the API this project calls is implemented: agents,
+sessions and turns, shields and run_shield, scoring functions and
+scoring.score, telemetry events, toolgroups/tools, vector DBs, models.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from src.fakestack.profile import FakeProfile, recorded_turn_key
+
+_FILLER = (
+    "the team targets a clear customer segment with a focused offering and a credible "
+    "path to revenue while competition and execution remain the main open questions "
+    "early pilots suggest steady demand and the plan needs validation at larger scale"
+).split()
+
+
+@dataclass
+class FakeResponse:
+    status: int = 200
+    body: Any = None                 # JSON body; None means an empty response
+    chunks: list[dict] | None = None  # SSE events, for streaming responses
+    delay: float = 0.0               # seconds before the response (or first chunk)
+    chunk_delay: float = 0.0         # seconds between streamed chunks
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _error(status: int, detail: str) -> FakeResponse:
+    return FakeResponse(status=status, body={"detail": detail})
+
+
+class FakeLlamaStack:
+    """In-memory LlamaStack stand-in driven by a FakeProfile."""
+
+    def __init__(self, profile: FakeProfile | None = None):
+        self.profile = profile or FakeProfile()
+        self.requests: Counter = Counter()
+        self.faults_injected: Counter = Counter()
+        self.events_logged = 0
+        self._lock = threading.Lock()
+        self._draws: Counter = Counter()
+        self._ids: Counter = Counter()
+        self._agents: dict[str, dict] = {}
+        self._sessions: dict[str, dict] = {}
+        self._shields: dict[str, dict] = {}
+        self._scoring_fns: dict[str, dict] = {}
+        self._toolgroups: dict[str, dict] = {}
+        self._vector_dbs: dict[str, dict] = {}
+        self._routes: list[tuple[str, re.Pattern, str, Callable]] = [
+            ("GET", r"/v1/health", "other", self._health),
+            ("GET", r"/v1/models", "other", self._list_models),
+            ("POST", r"/v1/agents", "agents", self._create_agent),
+            ("DELETE", r"/v1/agents/(?P<agent_id>[^/]+)", "agents", self._delete_agent),
+            ("POST", r"/v1/agents/(?P<agent_id>[^/]+)/session", "agents", self._create_session),
+            ("GET", r"/v1/agents/(?P<agent_id>[^/]+)/session/(?P<session_id>[^/]+)", "agents", self._get_session),
+            ("DELETE", r"/v1/agents/(?P<agent_id>[^/]+)/session/(?P<session_id>[^/]+)", "agents", self._delete_session),
+            ("POST", r"/v1/agents/(?P<agent_id>[^/]+)/session/(?P<session_id>[^/]+)/turn", "turn", self._create_turn),
+            ("GET", r"/v1/shields", "shield", self._list_shields),
+            ("POST", r"/v1/shields", "shield", self._register_shield),
+            ("GET", r"/v1/shields/(?P<shield_id>[^/]+)", "shield", self._get_shield),
+            ("POST", r"/v1/safety/run-shield", "shield", self._run_shield),
+            ("GET", r"/v1/scoring-functions", "scoring", self._list_scoring_fns),
+            ("POST", r"/v1/scoring-functions", "scoring", self._register_scoring_fn),
+            ("GET", r"/v1/scoring-functions/(?P<fn_id>[^/]+)", "scoring", self._get_scoring_fn),
+            ("POST", r"/v1/scoring/score", "scoring", self._score),
+            ("POST", r"/v1/telemetry/events", "telemetry", self._log_event),
+            ("POST", r"/v1/telemetry/spans/(?P<span_id>[^/]+)/tree", "telemetry", self._empty_data),
+            ("POST", r"/v1/telemetry/traces", "telemetry", self._empty_list),
+            ("POST", r"/v1/telemetry/spans", "telemetry", self._empty_list),
+            ("GET", r"/v1/toolgroups", "toolgroups", self._list_toolgroups),
+            ("POST", r"/v1/toolgroups", "toolgroups", self._register_toolgroup),
+            ("GET", r"/v1/toolgroups/(?P<toolgroup_id>[^/]+)", "toolgroups", self._get_toolgroup),
+            ("DELETE", r"/v1/toolgroups/(?P<toolgroup_id>[^/]+)", "toolgroups", self._unregister_toolgroup),
+            ("GET", r"/v1/tools", "toolgroups", self._list_tools),
+            ("GET", r"/v1/vector-dbs", "vector_dbs", self._list_vector_dbs),
+            ("POST", r"/v1/vector-dbs", "vector_dbs", self._register_vector_db),
+            ("GET", r"/v1/vector-dbs/(?P<vector_db_id>[^/]+)", "vector_dbs", self._get_vector_db),
+            ("DELETE", r"/v1/vector-dbs/(?P<vector_db_id>[^/]+)", "vector_dbs", self._unregister_vector_db),
+            ("POST", r"/v1/tool-runtime/rag-tool/insert", "vector_dbs", self._rag_insert),
+        ]
+        self._routes = [(m, re.compile(p + "$"), op, fn) for m, p, op, fn in self._routes]
+
+    # ── Dispatch ──────────────────────────────────────────────────────────
+
+    def handle(self, method: str, path: str, body: Any = None, query: dict | None = None) -> FakeResponse:
+        for route_method, pattern, operation, fn in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return _error(404, f"Fake LlamaStack does not implement {method} {path}")
+
+        with self._lock:
+            self.requests[operation] += 1
+        rng = self._rng(operation, body if body is not None else path)
+
+        fault = self.profile.fault_for(operation)
+        if fault is not None and fault.rate > 0 and rng.random() < fault.rate:
+            with self._lock:
+                self.faults_injected[operation] += 1
+            response = _error(fault.status, fault.message)
+        else:
+            response = fn(body or {}, query or {}, rng, **match.groupdict())
+        response.delay = self.profile.latency_for(operation).sample(rng)
+        return response
+
+    def _rng(self, operation: str, key: Any) -> random.Random:
+        """Seeded RNG per (operation, request content, repeat count).
+
+        Draws depend on what was asked, not on how concurrent requests
+        interleave, so runs are reproducible under load.
+        """
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            self._draws[(operation, digest)] += 1
+            n = self._draws[(operation, digest)]
+        seed = hashlib.sha256(f"{self.profile.seed}|{operation}|{digest}|{n}".encode()).digest()
+        return random.Random(int.from_bytes(seed[:8], "big"))
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            self._ids[prefix] += 1
+            return f"{prefix}-{self._ids[prefix]:06d}"
+
+    def stats(self) -> dict:
+        return {
+            "requests": dict(self.requests),
+            "faults_injected": dict(self.faults_injected),
+            "events_logged": self.events_logged,
+            "agents": len(self._agents),
+            "sessions": len(self._sessions),
+        }
+
+    # ── Agents and turns ──────────────────────────────────────────────────
+
+    def _health(self, body, query, rng):
+        return FakeResponse(body={"status": "OK"})
+
+    def _list_models(self, body, query, rng):
+        models = sorted({a["config"].get("model", "") for a in self._agents.values()} - {""})
+        return FakeResponse(body={"data": [
+            {"identifier": m, "provider_id": "fake", "model_type": "llm", "metadata": {}, "type": "model"}
+            for m in models
+        ]})
+
+    def _create_agent(self, body, query, rng):
+        agent_id = self._new_id("agent")
+        self._agents[agent_id] = {"config": body.get("agent_config", {})}
+        return FakeResponse(body={"agent_id": agent_id})
+
+    def _delete_agent(self, body, query, rng, agent_id):
+        self._agents.pop(agent_id, None)
+        return FakeResponse()
+
+    def _create_session(self, body, query, rng, agent_id):
+        if agent_id not in self._agents:
+            return _error(404, f"Agent {agent_id} not found")
+        session_id = self._new_id("session")
+        self._sessions[session_id] = {
+            "session_id": session_id,
+            "session_name": body.get("session_name", ""),
+            "started_at": _now(),
+            "turns": [],
+        }
+        return FakeResponse(body={"session_id": session_id})
+
+    def _get_session(self, body, query, rng, agent_id, session_id):
+        session = self._sessions.get(session_id)
+        return FakeResponse(body=session) if session else _error(404, f"Session {session_id} not found")
+
+    def _delete_session(self, body, query, rng, agent_id, session_id):
+        self._sessions.pop(session_id, None)
+        return FakeResponse()
+
+    def _create_turn(self, body, query, rng, agent_id, session_id):
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            return _error(404, f"Agent {agent_id} not found")
+        messages = body.get("messages") or []
+        message = _content_text(messages[-1].get("content")) if messages else ""
+        instructions = agent["config"].get("instructions", "")
+        text = self._turn_text(instructions, message, rng)
+
+        turn_id = self._new_id("turn")
+        started_at = _now()
+        output_message = {"role": "assistant", "content": text, "stop_reason": "end_of_turn", "tool_calls": []}
+        step = {
+            "step_type": "inference",
+            "step_id": f"{turn_id}-step",
+            "turn_id": turn_id,
+            "model_response": output_message,
+            "started_at": started_at,
+            "completed_at": _now(),
+        }
+        turn = {
+            "turn_id": turn_id,
+            "session_id": session_id,
+            "input_messages": messages,
+            "steps": [step],
+            "output_message": output_message,
+            "output_attachments": [],
+            "started_at": started_at,
+            "completed_at": _now(),
+        }
+        if not body.get("stream"):
+            return FakeResponse(body=turn)
+
+        chunks = [{"event": {"payload": {"event_type": "turn_start", "turn_id": turn_id}}}]
+        chunks.append(_step_event("step_start", step))
+        for piece in _chunk_words(text, self.profile.words_per_chunk):
+            chunks.append(_step_event("step_progress", step, delta={"type": "text", "text": piece}))
+        chunks.append(_step_event("step_complete", step, step_details=step))
+        chunks.append({"event": {"payload": {"event_type": "turn_complete", "turn": turn}}})
+        return FakeResponse(body=turn, chunks=chunks, chunk_delay=self.profile.token_interval_ms / 1000)
+
+    def _turn_text(self, instructions: str, message: str, rng: random.Random) -> str:
+        recorded = self.profile.recorded.get(recorded_turn_key(instructions, message))
+        if recorded is not None:
+            return recorded
+        haystack = f"{instructions}\n{message}".lower()
+        for canned in self.profile.turns:
+            if canned.match.lower() in haystack:
+                return canned.text
+        # The validator agent answers with a one-line verdict
+        if "pass - if the output is valid" in instructions.lower():
+            return "PASS"
+        words = " ".join(rng.choice(_FILLER) for _ in range(self.profile.turn_words))
+        return f"Fake analysis for load testing.\n\n{words.capitalize()}.\n\nScore: {rng.randint(4, 9)}/10"
+
+    # ── Safety ────────────────────────────────────────────────────────────
+
+    def _list_shields(self, body, query, rng):
+        return FakeResponse(body={"data": list(self._shields.values())})
+
+    def _register_shield(self, body, query, rng):
+        shield = {
+            "identifier": body["shield_id"],
+            "provider_id": body.get("provider_id", "fake"),
+            "provider_resource_id": body.get("provider_shield_id"),
+            "type": "shield",
+            "params": body.get("params") or {},
+        }
+        self._shields[shield["identifier"]] = shield
+        return FakeResponse(body=shield)
+
+    def _get_shield(self, body, query, rng, shield_id):
+        shield = self._shields.get(shield_id)
+        return FakeResponse(body=shield) if shield else _error(404, f"Shield {shield_id} not found")
+
+    def _run_shield(self, body, query, rng):
+        text = "\n".join(_content_text(m.get("content")) for m in body.get("messages") or []).lower()
+        for canned in self.profile.violations:
+            if canned.match.lower() in text:
+                return FakeResponse(body={"violation": {
+                    "violation_level": canned.violation_level,
+                    "user_message": canned.message,
+                    "metadata": {"shield_id": body.get("shield_id")},
+                }})
+        return FakeResponse(body={"violation": None})
+
+    # ── Scoring ───────────────────────────────────────────────────────────
+
+    def _list_scoring_fns(self, body, query, rng):
+        return FakeResponse(body={"data": list(self._scoring_fns.values())})
+
+    def _register_scoring_fn(self, body, query, rng):
+        fn_id = body["scoring_fn_id"]
+        self._scoring_fns[fn_id] = {
+            "identifier": fn_id,
+            "description": body.get("description", ""),
+            "provider_id": body.get("provider_id", "fake"),
+            "return_type": body.get("return_type", {"type": "number"}),
+            "params": body.get("params"),
+            "metadata": {},
+            "type": "scoring_function",
+        }
+        return FakeResponse()
+
+    def _get_scoring_fn(self, body, query, rng, fn_id):
+        fn = self._scoring_fns.get(fn_id)
+        return FakeResponse(body=fn) if fn else _error(404, f"Scoring function {fn_id} not found")
+
+    def _score(self, body, query, rng):
+        rows = body.get("input_rows") or []
+        results = {}
+        for fn_id in body.get("scoring_functions") or {}:
+            scores = [
+                self.profile.judge_score if self.profile.judge_score is not None else float(rng.randint(2, 5))
+                for _ in rows
+            ]
+            results[fn_id] = {
+                "score_rows": [{"score": s, "judge_feedback": f"Score: {s:g}"} for s in scores],
+                "aggregated_results": {"average": {"value": sum(scores) / len(scores) if scores else 0.0}},
+            }
+        return FakeResponse(body={"results": results})
+
+    # ── Telemetry ─────────────────────────────────────────────────────────
+
+    def _log_event(self, body, query, rng):
+        with self._lock:
+            self.events_logged += 1
+        return FakeResponse()
+
+    def _empty_data(self, body, query, rng, **_):
+        return FakeResponse(body={"data": {}})
+
+    def _empty_list(self, body, query, rng):
+        return FakeResponse(body={"data": []})
+
+    # ── Toolgroups and vector DBs ─────────────────────────────────────────
+
+    def _list_toolgroups(self, body, query, rng):
+        return FakeResponse(body={"data": list(self._toolgroups.values())})
+
+    def _register_toolgroup(self, body, query, rng):
+        toolgroup_id = body["toolgroup_id"]
+        self._toolgroups[toolgroup_id] = {
+            "identifier": toolgroup_id,
+            "provider_id": body.get("provider_id", "fake"),
+            "type": "tool_group",
+            "args": body.get("args"),
+            "mcp_endpoint": body.get("mcp_endpoint"),
+        }
+        return FakeResponse()
+
+    def _get_toolgroup(self, body, query, rng, toolgroup_id):
+        group = self._toolgroups.get(toolgroup_id)
+        return FakeResponse(body=group) if group else _error(404, f"Toolgroup {toolgroup_id} not found")
+
+    def _unregister_toolgroup(self, body, query, rng, toolgroup_id):
+        self._toolgroups.pop(toolgroup_id, None)
+        return FakeResponse()
+
+    def _list_tools(self, body, query, rng):
+        return FakeResponse(body={"data": []})
+
+    def _list_vector_dbs(self, body, query, rng):
+        return FakeResponse(body={"data": list(self._vector_dbs.values())})
+
+    def _register_vector_db(self, body, query, rng):
+        vector_db = {
+            "identifier": body["vector_db_id"],
+            "embedding_model": body.get("embedding_model", ""),
+            "embedding_dimension": body.get("embedding_dimension", 384),
+            "provider_id": body.get("provider_id", "fake"),
+            "type": "vector_db",
+        }
+        self._vector_dbs[vector_db["identifier"]] = vector_db
+        return FakeResponse(body=vector_db)
+
+    def _get_vector_db(self, body, query, rng, vector_db_id):
+        vector_db = self._vector_dbs.get(vector_db_id)
+        return FakeResponse(body=vector_db) if vector_db else _error(404, f"Vector DB {vector_db_id} not found")
+
+    def _unregister_vector_db(self, body, query, rng, vector_db_id):
+        self._vector_dbs.pop(vector_db_id, None)
+        return FakeResponse()
+
+    def _rag_insert(self, body, query, rng):
+        return FakeResponse()
+
+
+def _content_text(content: Any) -> str:
+    """Flatten message content (a string or a list of content items) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(item.get("text", "") for item in content if isinstance(item, dict))
+    return ""
+
+
+def _chunk_words(text: str, words_per_chunk: int) -> list[str]:
+    words = re.findall(r"\S+\s*|\s+", text)
+    return ["".join(words[i:i + words_per_chunk]) for i in range(0, len(words), words_per_chunk)]
+
+
+def _step_event(event_type: str, step: dict, **extra) -> dict:
+    payload = {"event_type": event_type, "step_type": "inference", "step_id": step["step_id"], **extra}
+    return {"event": {"payload": payload}}
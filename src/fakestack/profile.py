@@ -0,0 +1,146 @@
+"""Behaviour profile for the fake LlamaStack: latency, streaming, faults and canned responses.
+
+A profile is plain data, loaded from YAML or JSON (see
+config/fakestack-profile.yaml). Every random draw made with it is
+seeded, so the same profile and the same requests give the same
+latencies, faults and responses on every run.
+"""
+
+import hashlib
+import json
+import math
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+# Operations that latency and faults can be configured for
+OPERATIONS = ("agents", "turn", "shield", "scoring", "telemetry", "toolgroups", "vector_dbs", "other")
+
+
+@dataclass
+class Latency:
+    """Latency distribution in milliseconds, sampled per request.
+
+    ``distribution`` is one of fixed, uniform, normal or lognormal. For
+    uniform the range is [min_ms, max_ms]; for normal and lognormal
+    ``mean_ms``/``stddev_ms`` describe the resulting distribution. Samples
+    are clamped to [min_ms, max_ms].
+    """
+    distribution: str = "fixed"
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float | None = None
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency, in seconds."""
+        if self.distribution == "fixed":
+            ms = self.mean_ms
+        elif self.distribution == "uniform":
+            ms = rng.uniform(self.min_ms, self.max_ms if self.max_ms is not None else 2 * self.mean_ms)
+        elif self.distribution == "normal":
+            ms = rng.gauss(self.mean_ms, self.stddev_ms)
+        elif self.distribution == "lognormal":
+            if self.mean_ms <= 0:
+                ms = 0.0
+            else:
+                sigma2 = math.log(1 + (self.stddev_ms / self.mean_ms) ** 2)
+                ms = rng.lognormvariate(math.log(self.mean_ms) - sigma2 / 2, math.sqrt(sigma2))
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.distribution!r}")
+        ms = max(self.min_ms, ms)
+        if self.max_ms is not None:
+            ms = min(self.max_ms, ms)
+        return ms / 1000
+
+
+@dataclass
+class Fault:
+    """Fail a fraction of requests with an HTTP error."""
+    rate: float = 0.0
+    status: int = 500
+    message: str = "Injected fault"
+
+
+@dataclass
+class CannedTurn:
+    """Reply with ``text`` when ``match`` appears in the agent instructions or message."""
+    match: str
+    text: str
+
+
+@dataclass
+class CannedViolation:
+    """Report a shield violation when ``match`` appears in the checked text."""
+    match: str
+    violation_level: str = "error"
+    message: str = "Content flagged by fake shield"
+
+
+@dataclass
+class FakeProfile:
+    seed: int = 0
+    latency: dict[str, Latency] = field(default_factory=dict)
+    faults: dict[str, Fault] = field(default_factory=dict)
+    # Streaming: delay between streamed chunks, and words per chunk
+    token_interval_ms: float = 0.0
+    words_per_chunk: int = 1
+    # Length of generated (non-canned) turn replies, in words
+    turn_words: int = 120
+    turns: list[CannedTurn] = field(default_factory=list)
+    violations: list[CannedViolation] = field(default_factory=list)
+    # Fixed judge score for scoring.score; derived from the input when unset
+    judge_score: float | None = None
+    # Turn replies captured from a real backend, keyed by recorded_turn_key
+    recorded: dict[str, str] = field(default_factory=dict)
+
+    def latency_for(self, operation: str) -> Latency:
+        return self.latency.get(operation) or self.latency.get("default") or Latency()
+
+    def fault_for(self, operation: str) -> Fault | None:
+        return self.faults.get(operation) or self.faults.get("default")
+
+    @classmethod
+    def from_dict(cls, data: dict, base_dir: Path | None = None) -> "FakeProfile":
+        profile = cls(
+            seed=data.get("seed", 0),
+            latency={op: Latency(**spec) for op, spec in (data.get("latency") or {}).items()},
+            faults={op: Fault(**spec) for op, spec in (data.get("faults") or {}).items()},
+            token_interval_ms=data.get("token_interval_ms", 0.0),
+            words_per_chunk=max(1, data.get("words_per_chunk", 1)),
+            turn_words=data.get("turn_words", 120),
+            turns=[CannedTurn(**t) for t in data.get("turns") or []],
+            violations=[CannedViolation(**v) for v in data.get("violations") or []],
+            judge_score=data.get("judge_score"),
+        )
+        recorded = data.get("recorded_turns")
+        if recorded:
+            path = Path(recorded)
+            if base_dir is not None and not path.is_absolute():
+                path = base_dir / path
+            profile.recorded = load_recorded_turns(path)
+        return profile
+
+
+def recorded_turn_key(instructions: str, message: str) -> str:
+    return hashlib.sha256(f"{instructions}\0{message}".encode()).hexdigest()
+
+
+def load_recorded_turns(path: Path) -> dict[str, str]:
+    """Load captured turns from JSONL lines of {"instructions", "message", "text"}."""
+    turns = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                turns[recorded_turn_key(entry["instructions"], entry["message"])] = entry["text"]
+    return turns
+
+
+def load_profile(path: Path) -> FakeProfile:
+    """Load a profile from a YAML or JSON file."""
+    path = Path(path)
+    data = yaml.safe_load(path.read_text()) or {}
+    return FakeProfile.from_dict(data, base_dir=path.parent)
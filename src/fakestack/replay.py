@@ -0,0 +1,313 @@
+"""Record/replay transports for LlamaStack calls.
+
+``RecordingTransport`` wraps the real httpx transport and appends every
+exchange (request, status, JSON body or streamed events, and timings) to
+a gzipped JSONL file. ``ReplayTransport`` serves those responses back
+in-process, at memory speed or with the original timings, so the non-LLM
+code (sanitizer, governance, state, audit, gateway) can be profiled
+under realistic, repeatable traffic.
+
+Enable either for the shared clients with LLAMASTACK_RECORD or
+LLAMASTACK_REPLAY (see src/client.py), or build them directly.
+
+Requests are matched on method, path and body. Server-generated ids in
+paths (agents, sessions, turns) are masked, so a replayed agent id still
+finds the recorded turns. A request whose exact body was never seen
+(e.g. telemetry events with fresh trace ids) falls back to any recording
+for the same endpoint. Repeated matches cycle through the recordings.
+"""
+
+import asyncio
+import atexit
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+from src.fakestack.transport import AsyncSSEStream, SSEStream
+
+logger = logging.getLogger(__name__)
+
+# Path segments holding server-generated ids
+_ID_SEGMENT = re.compile(r"/(agents|session|turn|spans|traces|step)/[^/]+")
+_ID_MASK = r"/\1/{id}"
+
+TIMING_NONE = "none"
+TIMING_ORIGINAL = "original"
+
+
+def endpoint_of(method: str, path: str) -> str:
+    return f"{method} {_ID_SEGMENT.sub(_ID_MASK, path)}"
+
+
+def _body_hash(content: bytes) -> str:
+    if not content:
+        return ""
+    try:
+        canonical = json.dumps(json.loads(content), sort_keys=True).encode()
+    except ValueError:
+        canonical = content
+    return hashlib.sha256(canonical).hexdigest()[:16]
+
+
+def _parse_sse(buffer: bytes) -> tuple[list[dict], bytes]:
+    """Pull complete ``data:`` events off the front of ``buffer``."""
+    events = []
+    while b"\n\n" in buffer:
+        raw, buffer = buffer.split(b"\n\n", 1)
+        for line in raw.splitlines():
+            if line.startswith(b"data:"):
+                events.append(json.loads(line[5:].strip()))
+    return events, buffer
+
+
+class _RecordFile:
+    """Append-only gzipped JSONL, flushed after every record."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        # An unclosed gzip member is unreadable; make sure the trailer lands
+        atexit.register(self.close)
+
+    def write(self, record: dict):
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+_files: dict[Path, _RecordFile] = {}
+_files_lock = threading.Lock()
+
+
+def _record_file(path: Path) -> _RecordFile:
+    """One writer per path, so the sync and async clients can share a recording."""
+    key = Path(path).resolve()
+    with _files_lock:
+        file = _files.get(key)
+        if file is None or file.closed:
+            file = _files[key] = _RecordFile(key)
+        return file
+
+
+def _record(request: httpx.Request, response: httpx.Response, started: float, first_byte: float) -> dict:
+    return {
+        "endpoint": endpoint_of(request.method, request.url.path),
+        "body": _body_hash(request.content),
+        "status": response.status_code,
+        "ttfb": round(first_byte - started, 4),
+    }
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Forward to ``inner`` and record every exchange to ``path``.
+
+    ``inner`` is a sync or async httpx transport, matching the client it
+    is used with. Streamed responses are passed through as they arrive.
+    """
+
+    def __init__(self, inner: httpx.BaseTransport | httpx.AsyncBaseTransport, path: Path):
+        self.inner = inner
+        self.file = _record_file(path)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+        first_byte = time.perf_counter()
+        record = _record(request, response, started, first_byte)
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            return httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                stream=_RecordingStream(response, record, self.file, first_byte),
+                request=request,
+            )
+        content = response.read()
+        response.close()
+        record["json"] = json.loads(content) if content else None
+        self.file.write(record)
+        return httpx.Response(response.status_code, headers=response.headers, content=content, request=request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        first_byte = time.perf_counter()
+        record = _record(request, response, started, first_byte)
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            return httpx.Response(
+                response.status_code,
+                headers=response.headers,
+                stream=_AsyncRecordingStream(response, record, self.file, first_byte),
+                request=request,
+            )
+        content = await response.aread()
+        await response.aclose()
+        record["json"] = json.loads(content) if content else None
+        self.file.write(record)
+        return httpx.Response(response.status_code, headers=response.headers, content=content, request=request)
+
+    def close(self):
+        if isinstance(self.inner, httpx.BaseTransport):
+            self.inner.close()
+        self.file.close()
+
+    async def aclose(self):
+        if isinstance(self.inner, httpx.AsyncBaseTransport):
+            await self.inner.aclose()
+        self.file.close()
+
+
+class _StreamCapture:
+    """Collects SSE events and their arrival gaps while passing the bytes on."""
+
+    def __init__(self, record: dict, file: _RecordFile, first_byte: float):
+        self.record = record
+        self.file = file
+        self.last = first_byte
+        self.buffer = b""
+        self.events: list[dict] = []
+        self.gaps: list[float] = []
+
+    def feed(self, data: bytes):
+        events, self.buffer = _parse_sse(self.buffer + data)
+        now = time.perf_counter()
+        for i, event in enumerate(events):
+            self.events.append(event)
+            self.gaps.append(round(now - self.last, 4) if i == 0 else 0.0)
+        if events:
+            self.last = now
+
+    def finish(self):
+        self.record["events"] = self.events
+        self.record["gaps"] = self.gaps
+        self.file.write(self.record)
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, response: httpx.Response, record: dict, file: _RecordFile, first_byte: float):
+        self.response = response
+        self.capture = _StreamCapture(record, file, first_byte)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for data in self.response.iter_raw():
+            self.capture.feed(data)
+            yield data
+        self.capture.finish()
+
+    def close(self):
+        self.response.close()
+
+
+class _AsyncRecordingStream(httpx.AsyncByteStream):
+    def __init__(self, response: httpx.Response, record: dict, file: _RecordFile, first_byte: float):
+        self.response = response
+        self.capture = _StreamCapture(record, file, first_byte)
+
+    async def __aiter__(self):
+        async for data in self.response.aiter_raw():
+            self.capture.feed(data)
+            yield data
+        self.capture.finish()
+
+    async def aclose(self):
+        await self.response.aclose()
+
+
+def load_recording(path: Path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Serve recorded responses in-process.
+
+    ``timing="original"`` sleeps each response's recorded time to first
+    byte and the gaps between streamed events (scaled by ``speed``);
+    the default replays at memory speed.
+    """
+
+    def __init__(self, path: Path, timing: str = TIMING_NONE, speed: float = 1.0):
+        if timing not in (TIMING_NONE, TIMING_ORIGINAL):
+            raise ValueError(f"Unknown replay timing: {timing!r}")
+        self.scale = (1.0 / speed) if timing == TIMING_ORIGINAL else 0.0
+        self.records = load_recording(path)
+        exact: dict[tuple, list] = defaultdict(list)
+        by_endpoint: dict[str, list] = defaultdict(list)
+        for record in self.records:
+            exact[(record["endpoint"], record["body"])].append(record)
+            by_endpoint[record["endpoint"]].append(record)
+        self._exact = {key: itertools.cycle(records) for key, records in exact.items()}
+        self._by_endpoint = {key: itertools.cycle(records) for key, records in by_endpoint.items()}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+        self.misses = 0
+        logger.info("Replaying %d recorded LlamaStack calls from %s", len(self.records), path)
+
+    def _match(self, request: httpx.Request) -> dict | None:
+        endpoint = endpoint_of(request.method, request.url.path)
+        with self._lock:
+            records = self._exact.get((endpoint, _body_hash(request.content)))
+            if records is not None:
+                self.hits += 1
+                return next(records)
+            records = self._by_endpoint.get(endpoint)
+            if records is not None:
+                self.fallbacks += 1
+                return next(records)
+            self.misses += 1
+            return None
+
+    def _response(self, request: httpx.Request, record: dict | None, stream_cls) -> httpx.Response:
+        if record is None:
+            detail = f"No recorded response for {endpoint_of(request.method, request.url.path)}"
+            return httpx.Response(404, json={"detail": detail}, request=request)
+        if "events" in record:
+            gaps = [gap * self.scale for gap in record["gaps"]]
+            return httpx.Response(
+                record["status"],
+                headers={"content-type": "text/event-stream"},
+                stream=stream_cls(record["events"], gaps),
+                request=request,
+            )
+        if record.get("json") is None:
+            return httpx.Response(record["status"], request=request)
+        return httpx.Response(record["status"], json=record["json"], request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        record = self._match(request)
+        if record is not None and self.scale:
+            time.sleep(record["ttfb"] * self.scale)
+        return self._response(request, record, SSEStream)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        record = self._match(request)
+        if record is not None and self.scale:
+            await asyncio.sleep(record["ttfb"] * self.scale)
+        return self._response(request, record, AsyncSSEStream)
+
+    def stats(self) -> dict:
+        return {"recorded": len(self.records), "hits": self.hits, "fallbacks": self.fallbacks, "misses": self.misses}
@@ -0,0 +1,75 @@
+"""HTTP server for the fake LlamaStack, for load-testing the gateway and CLI.
+
+Point LLAMASTACK_URL at it and everything runs without Ollama or a GPU.
+Run with:
+    python -m src.fakestack.server
+or:
+    ./scripts/start_fakestack.sh
+
+FAKESTACK_PORT (default 8321, LlamaStack's own port) and
+FAKESTACK_PROFILE (a YAML/JSON profile; defaults to zero latency, no
+faults) configure it. GET /_fake/stats reports request and fault counts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from src.fakestack.backend import FakeLlamaStack, FakeResponse
+from src.fakestack.profile import load_profile
+from src.fakestack.transport import sse_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(stack: FakeLlamaStack) -> FastAPI:
+    app = FastAPI(title="Fake LlamaStack", docs_url=None, redoc_url=None)
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return stack.stats()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def dispatch(path: str, request: Request):
+        raw = await request.body()
+        response = stack.handle(
+            request.method,
+            "/" + path,
+            json.loads(raw) if raw else None,
+            dict(request.query_params),
+        )
+        if response.delay:
+            await asyncio.sleep(response.delay)
+        if response.chunks is not None:
+            return StreamingResponse(_stream(response), media_type="text/event-stream")
+        if response.body is None:
+            return Response(status_code=response.status)
+        return JSONResponse(response.body, status_code=response.status)
+
+    return app
+
+
+async def _stream(response: FakeResponse):
+    for i, chunk in enumerate(response.chunks or []):
+        if i and response.chunk_delay:
+            await asyncio.sleep(response.chunk_delay)
+        yield sse_bytes(chunk)
+
+
+def main():
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    profile_path = os.getenv("FAKESTACK_PROFILE")
+    profile = load_profile(profile_path) if profile_path else None
+    logger.info("Fake LlamaStack profile: %s", profile_path or "defaults")
+    app = create_app(FakeLlamaStack(profile))
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("FAKESTACK_PORT", "8321")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""In-process httpx transport serving a FakeLlamaStack, plus client helpers.
+
+Plugging the fake straight into the LlamaStack client skips sockets
+entirely, which is what tests and single-process benchmarks want:
+
+    client = fake_client(load_profile("config/fakestack-profile.yaml"))
+    run_pipeline(client, "An AI platform for indoor farming")
+
+Profile latencies are still slept (``realtime=False`` turns them off),
+so timings look like a real backend's.
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator
+
+import httpx
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
+
+from src.fakestack.backend import FakeLlamaStack, FakeResponse
+from src.fakestack.profile import FakeProfile
+
+FAKE_BASE_URL = "http://fakestack.local"
+
+
+def sse_bytes(chunk: dict) -> bytes:
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+class SSEStream(httpx.SyncByteStream):
+    """Server-sent events, sleeping ``gaps[i]`` seconds before chunk i."""
+
+    def __init__(self, chunks: list[dict], gaps: list[float]):
+        self.chunks = chunks
+        self.gaps = gaps
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk, gap in zip(self.chunks, self.gaps):
+            if gap > 0:
+                time.sleep(gap)
+            yield sse_bytes(chunk)
+
+
+class AsyncSSEStream(httpx.AsyncByteStream):
+    """Async variant of SSEStream."""
+
+    def __init__(self, chunks: list[dict], gaps: list[float]):
+        self.chunks = chunks
+        self.gaps = gaps
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk, gap in zip(self.chunks, self.gaps):
+            if gap > 0:
+                await asyncio.sleep(gap)
+            yield sse_bytes(chunk)
+
+
+def _gaps(response: FakeResponse, realtime: bool) -> list[float]:
+    delay = response.chunk_delay if realtime else 0.0
+    return [0.0] + [delay] * (len(response.chunks or []) - 1)
+
+
+class FakeTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """httpx transport (sync and async) that answers from a FakeLlamaStack."""
+
+    def __init__(self, stack: FakeLlamaStack, realtime: bool = True):
+        self.stack = stack
+        self.realtime = realtime
+
+    def _dispatch(self, request: httpx.Request) -> FakeResponse:
+        body = json.loads(request.content) if request.content else None
+        return self.stack.handle(request.method, request.url.path, body, dict(request.url.params))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        response = self._dispatch(request)
+        if self.realtime and response.delay:
+            time.sleep(response.delay)
+        if response.chunks is not None:
+            return httpx.Response(
+                response.status,
+                headers={"content-type": "text/event-stream"},
+                stream=SSEStream(response.chunks, _gaps(response, self.realtime)),
+                request=request,
+            )
+        return _json_response(response, request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        response = self._dispatch(request)
+        if self.realtime and response.delay:
+            await asyncio.sleep(response.delay)
+        if response.chunks is not None:
+            return httpx.Response(
+                response.status,
+                headers={"content-type": "text/event-stream"},
+                stream=AsyncSSEStream(response.chunks, _gaps(response, self.realtime)),
+                request=request,
+            )
+        return _json_response(response, request)
+
+
+def _json_response(response: FakeResponse, request: httpx.Request) -> httpx.Response:
+    if response.body is None:
+        return httpx.Response(response.status, request=request)
+    return httpx.Response(response.status, json=response.body, request=request)
+
+
+def fake_client(
+    profile: FakeProfile | None = None,
+    stack: FakeLlamaStack | None = None,
+    realtime: bool = True,
+) -> LlamaStackClient:
+    """Sync LlamaStack client wired to an in-process fake (no retries)."""
+    transport = FakeTransport(stack or FakeLlamaStack(profile), realtime)
+    return LlamaStackClient(
+        base_url=FAKE_BASE_URL, http_client=httpx.Client(transport=transport), max_retries=0
+    )
+
+
+def fake_async_client(
+    profile: FakeProfile | None = None,
+    stack: FakeLlamaStack | None = None,
+    realtime: bool = True,
+) -> AsyncLlamaStackClient:
+    """Async LlamaStack client wired to an in-process fake (no retries)."""
+    transport = FakeTransport(stack or FakeLlamaStack(profile), realtime)
+    return AsyncLlamaStackClient(
+        base_url=FAKE_BASE_URL, http_client=httpx.AsyncClient(transport=transport), max_retries=0
+    )
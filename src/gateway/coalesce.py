@@ -0,0 +1,71 @@
+"""Singleflight coalescing of identical in-flight evaluations.
+
+When several requests for the same idea arrive while one pipeline for it
+is already running, they all await that one execution instead of
+starting their own. Keys are built from the normalised idea text plus
+optional fingerprints (e.g. model ids) that would change the result.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# LLM calls made by one run_pipeline execution: brief + 4 specialists + synthesis
+PIPELINE_LLM_CALLS = 6
+
+
+def normalise_idea(idea: str) -> str:
+    """Case-fold and collapse whitespace so trivially different submissions match."""
+    return " ".join(idea.split()).casefold()
+
+
+def coalesce_key(idea: str, *fingerprints: str) -> str:
+    """Build a coalescing key from the idea and any result-affecting fingerprints."""
+    h = hashlib.sha256(normalise_idea(idea).encode())
+    for fp in fingerprints:
+        h.update(b"\0" + fp.encode())
+    return h.hexdigest()
+
+
+class SingleFlight:
+    """Runs at most one coroutine per key at a time; concurrent callers share its result.
+
+    The shared execution runs as its own task, so a waiter being cancelled
+    (e.g. a client disconnecting) does not cancel it for the others. If the
+    execution raises, every waiter receives the exception.
+    """
+
+    def __init__(self, calls_per_execution: int = PIPELINE_LLM_CALLS):
+        self.calls_per_execution = calls_per_execution
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+            logger.info("Coalesced duplicate evaluation %s", key[:12])
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "llm_calls_saved": self.coalesced * self.calls_per_execution,
+        }
@@ -0,0 +1,268 @@
+"""Durable SQLite job queue shared by the gateway and ``multia worker`` processes.
+
+With JOB_BACKEND=queue the gateway only writes jobs here; separate worker
+processes (src/gateway/worker.py), on this host or others sharing the
+database file, run them:
+
+1. ``lease`` atomically claims the oldest queued job for ``lease_seconds``
+2. the worker ``heartbeat``s to extend the lease while the pipeline runs
+3. ``complete`` or ``fail`` records the outcome, if the lease is still held
+
+A job whose lease expires (its worker crashed or hung) goes back to the
+queue on the next ``lease`` or ``requeue_expired``; after ``max_attempts``
+leases it is marked failed instead. Workers also register and heartbeat
+themselves so the gateway can report live capacity.
+
+All timestamps are Unix epoch seconds; every process must see the same
+database and (roughly) the same clock.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.config import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_QUEUE_DB_PATH, JOB_QUEUE_SIZE
+from src.gateway.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, Job, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    idea TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stages TEXT NOT NULL DEFAULT '{}',
+    evaluation_id TEXT,
+    error TEXT,
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    concurrency INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+_JOB_COLUMNS = "id, idea, status, stages, evaluation_id, error, created_at, started_at, finished_at"
+
+
+def _dt(ts: float | None) -> datetime | None:
+    return datetime.fromtimestamp(ts, timezone.utc) if ts is not None else None
+
+
+def _job(row) -> Job:
+    return Job(
+        id=row[0],
+        idea=row[1],
+        status=row[2],
+        stages=json.loads(row[3]),
+        evaluation_id=row[4],
+        error=row[5],
+        created_at=_dt(row[6]),
+        started_at=_dt(row[7]),
+        finished_at=_dt(row[8]),
+    )
+
+
+class SQLiteJobQueue:
+    """Job queue in a WAL-mode SQLite database, safe across processes.
+
+    Has the JobPool surface the gateway uses (submit, get, stats, start,
+    stop) plus the lease/heartbeat/complete calls workers use.
+    """
+
+    def __init__(
+        self,
+        path: Path = JOB_QUEUE_DB_PATH,
+        queue_size: int = JOB_QUEUE_SIZE,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.queue_size = queue_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Autocommit; writes that must be atomic use _transaction (BEGIN IMMEDIATE)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logger.info("Job queue: %s", self.path)
+
+    @contextmanager
+    def _transaction(self):
+        """Hold the database write lock, so other processes cannot interleave."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # ── Gateway side ─────────────────────────────────────────────────────
+
+    def start(self):
+        """Nothing to start: workers are separate processes."""
+
+    async def stop(self):
+        self.close()
+
+    def submit(self, idea: str) -> Job:
+        """Queue an evaluation and return its job. Raises QueueFullError when full."""
+        job = Job(id=str(uuid.uuid4()), idea=idea)
+        with self._transaction() as conn:
+            (depth,) = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()
+            if depth >= self.queue_size:
+                raise QueueFullError(f"Job queue is full ({self.queue_size} pending)")
+            conn.execute(
+                "INSERT INTO jobs (id, idea, status, created_at) VALUES (?, ?, ?, ?)",
+                (job.id, job.idea, QUEUED, job.created_at.timestamp()),
+            )
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def stats(self) -> dict:
+        """Queue depth plus the slots of workers seen within one lease period."""
+        now = time.time()
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            (slots,) = self._conn.execute(
+                "SELECT COALESCE(SUM(concurrency), 0) FROM workers WHERE last_seen >= ?",
+                (now - self.lease_seconds,),
+            ).fetchone()
+            (expired,) = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND lease_expires < ?", (RUNNING, now)
+            ).fetchone()
+        busy = counts.get(RUNNING, 0) - expired
+        return {
+            "queue_depth": counts.get(QUEUED, 0) + expired,
+            "queue_capacity": self.queue_size,
+            "workers": slots,
+            "busy_workers": busy,
+            "utilisation": busy / slots if slots else 0.0,
+            "average_utilisation": None,
+            "submitted": sum(counts.values()),
+            "succeeded": counts.get(SUCCEEDED, 0),
+            "failed": counts.get(FAILED, 0),
+        }
+
+    # ── Worker side ──────────────────────────────────────────────────────
+
+    def register_worker(self, worker_id: str, host: str, concurrency: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO workers (id, host, concurrency, started_at, last_seen) VALUES (?, ?, ?, ?, ?)",
+                (worker_id, host, concurrency, now, now),
+            )
+
+    def unregister_worker(self, worker_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        failed = conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires = NULL, finished_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, f"lease expired after {self.max_attempts} attempts", now, RUNNING, now, self.max_attempts),
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires = NULL, stages = '{}' "
+            "WHERE status = ? AND lease_expires < ?",
+            (QUEUED, RUNNING, now),
+        ).rowcount
+        if failed or requeued:
+            logger.warning("Expired leases: %d jobs requeued, %d failed", requeued, failed)
+        return requeued
+
+    def requeue_expired(self) -> int:
+        """Put jobs whose lease ran out back in the queue; returns how many."""
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, time.time())
+
+    def lease(self, worker_id: str) -> Job | None:
+        """Claim the oldest queued job for ``lease_seconds``, or None if the queue is empty."""
+        now = time.time()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            conn.execute("UPDATE workers SET last_seen = ? WHERE id = ?", (now, worker_id))
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, "
+                "started_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + self.lease_seconds, now, row[0]),
+            )
+            return _job(conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (row[0],)).fetchone())
+
+    def _update_leased(self, job_id: str, worker_id: str, assignments: str, params: tuple) -> bool:
+        """Apply an update only while ``worker_id`` still holds the job's lease."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker_id = ? AND status = ?",
+                (*params, job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease. False means it was lost (expired and requeued): stop working on the job."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE workers SET last_seen = ? WHERE id = ?", (now, worker_id))
+        return self._update_leased(job_id, worker_id, "lease_expires = ?", (now + self.lease_seconds,))
+
+    def mark_stage(self, job_id: str, worker_id: str, stage: str, status: str) -> bool:
+        return self._update_leased(
+            job_id, worker_id, "stages = json_set(stages, '$.' || ?, ?)", (json.dumps(stage), status)
+        )
+
+    def complete(self, job_id: str, worker_id: str, evaluation_id: str) -> bool:
+        return self._update_leased(
+            job_id, worker_id,
+            "status = ?, evaluation_id = ?, lease_expires = NULL, finished_at = ?",
+            (SUCCEEDED, evaluation_id, time.time()),
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        return self._update_leased(
+            job_id, worker_id,
+            "status = ?, error = ?, lease_expires = NULL, finished_at = ?",
+            (FAILED, error, time.time()),
+        )
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Hand a leased job back to the queue (e.g. on worker shutdown) without using up an attempt."""
+        return self._update_leased(
+            job_id, worker_id,
+            "status = ?, worker_id = NULL, lease_expires = NULL, attempts = attempts - 1, stages = '{}'",
+            (QUEUED,),
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,160 @@
+"""Background job queue for asynchronous evaluations.
+
+Jobs are queued in memory and executed by a fixed number of worker tasks
+on the gateway's event loop, so the number of pipelines in flight against
+the LlamaStack backend is bounded no matter how many requests arrive.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from src.config import JOB_HISTORY_LIMIT, JOB_QUEUE_SIZE, JOB_WORKERS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """A single queued evaluation and its progress."""
+    id: str
+    idea: str
+    status: str = QUEUED
+    stages: dict[str, str] = field(default_factory=dict)  # stage -> started/finished/failed
+    evaluation_id: str | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    def mark_stage(self, stage: str, status: str):
+        self.stages[stage] = status
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+
+# A runner executes one job's pipeline and returns the stored evaluation id.
+JobRunner = Callable[[Job], Awaitable[str]]
+
+
+class JobPool:
+    """Bounded queue plus a fixed set of worker tasks that drain it."""
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        workers: int = JOB_WORKERS,
+        queue_size: int = JOB_QUEUE_SIZE,
+        history_limit: int = JOB_HISTORY_LIMIT,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.queue_size = queue_size
+        self.history_limit = history_limit
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=queue_size)
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._busy = 0
+        self._busy_seconds = 0.0
+        self._started_at = 0.0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def start(self):
+        """Spawn the worker tasks. Must be called from a running event loop."""
+        if self._tasks:
+            return
+        self._started_at = time.monotonic()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info("Started %d job workers (queue size %d)", self.workers, self.queue_size)
+
+    async def stop(self):
+        """Cancel the worker tasks. Queued jobs are left unprocessed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, idea: str) -> Job:
+        """Queue an evaluation and return its job. Raises QueueFullError when full."""
+        job = Job(id=str(uuid.uuid4()), idea=idea)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.queue_size} pending)") from None
+        self._jobs[job.id] = job
+        self.submitted += 1
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Queue depth and worker utilisation, for sizing workers to the backend."""
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        capacity = uptime * self.workers
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self.queue_size,
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "utilisation": self._busy / self.workers if self.workers else 0.0,
+            "average_utilisation": self._busy_seconds / capacity if capacity else 0.0,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    def _prune(self):
+        """Drop the oldest finished jobs once history exceeds its limit."""
+        excess = len(self._jobs) - self.history_limit
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.done][:excess]:
+            del self._jobs[job_id]
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            self._busy += 1
+            started = time.monotonic()
+            job.status = RUNNING
+            job.started_at = datetime.now(timezone.utc)
+            try:
+                job.evaluation_id = await self.runner(job)
+                job.status = SUCCEEDED
+                self.succeeded += 1
+            except asyncio.CancelledError:
+                job.status = FAILED
+                job.error = "cancelled"
+                raise
+            except Exception as e:
+                logger.exception("Job %s failed", job.id)
+                job.status = FAILED
+                job.error = f"{type(e).__name__}: {e}"
+                self.failed += 1
+            finally:
+                job.finished_at = datetime.now(timezone.utc)
+                self._busy -= 1
+                self._busy_seconds += time.monotonic() - started
+                self._queue.task_done()
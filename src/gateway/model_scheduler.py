@@ -0,0 +1,159 @@
+"""Model-affinity admission for agent turns across concurrent pipelines.
+
+The coordinator (brief, synthesis) runs on COORDINATOR_MODEL and the
+specialists and validator on SPECIALIST_MODEL. With several pipelines in
+flight, their turns interleave and a memory-constrained Ollama host keeps
+unloading one model to load the other, each swap costing seconds.
+
+ModelScheduler admits turns for one model at a time: while the loaded
+model has turns waiting (from any pipeline) they go first, up to ``slots``
+at once; the other model's turns wait until the running ones drain, then
+the scheduler switches. Two limits keep any pipeline from starving:
+
+- ``max_batch``: after this many turns on one model, switch if the other
+  model has turns waiting
+- ``max_wait``: a turn that has waited this long forces a switch
+
+The gateway installs it for each pipeline it runs via ``turn_scheduler``
+(src/agents/base.py), so run_agent_turn_async goes through it.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from src.config import (
+    MODEL_SCHEDULER,
+    MODEL_SCHEDULER_MAX_BATCH,
+    MODEL_SCHEDULER_MAX_WAIT,
+    MODEL_SCHEDULER_SLOTS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Waiter:
+    model: str
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class ModelScheduler:
+    """Runs agent turns grouped by model, switching models as rarely as fairness allows."""
+
+    def __init__(
+        self,
+        slots: int = MODEL_SCHEDULER_SLOTS,
+        max_batch: int = MODEL_SCHEDULER_MAX_BATCH,
+        max_wait: float = MODEL_SCHEDULER_MAX_WAIT,
+    ):
+        self.slots = max(1, slots)
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.current: str | None = None  # model whose turns are being admitted
+        self._active = 0  # admitted turns still running, all on ``current``
+        self._batch = 0  # turns admitted on ``current`` since the last switch
+        self._waiting: dict[str, deque[_Waiter]] = {}
+        self.swaps = 0
+        self.forced_swaps = 0  # switches made for fairness while ``current`` still had work
+        self.turns: dict[str, int] = {}
+        self._wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def turn(self, model: str):
+        """Hold a slot for one turn on ``model`` for the duration of the block."""
+        await self._acquire(model)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, model: str):
+        waiter = _Waiter(model, asyncio.get_running_loop().create_future())
+        self._waiting.setdefault(model, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release()  # admitted just as the caller was cancelled
+            else:
+                queue = self._waiting[model]
+                if waiter in queue:
+                    queue.remove(waiter)
+                self._dispatch()
+            raise
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit as many waiting turns as the current model and fairness limits allow."""
+        for queue in self._waiting.values():
+            while queue and queue[0].future.done():
+                queue.popleft()  # cancelled; its task has not yet run to remove it
+        while self._active < self.slots:
+            target = self._next_model()
+            if target is None:
+                return
+            if target != self.current:
+                if self._active:
+                    return  # let the loaded model's running turns drain first
+                self._switch(target)
+            waiter = self._waiting[target].popleft()
+            if waiter.future.done():
+                continue
+            self._active += 1
+            self._batch += 1
+            self.turns[target] = self.turns.get(target, 0) + 1
+            self._wait_seconds += time.monotonic() - waiter.enqueued
+            waiter.future.set_result(None)
+
+    def _next_model(self) -> str | None:
+        """The model to admit from next, or None if nothing is waiting."""
+        others = [m for m, queue in self._waiting.items() if queue and m != self.current]
+        current_waiting = self.current is not None and bool(self._waiting.get(self.current))
+        if not others:
+            return self.current if current_waiting else None
+        oldest = min(others, key=lambda m: self._waiting[m][0].enqueued)
+        if not current_waiting:
+            return oldest
+        starved = time.monotonic() - self._waiting[oldest][0].enqueued >= self.max_wait
+        if starved or self._batch >= self.max_batch:
+            return oldest
+        return self.current
+
+    def _switch(self, model: str):
+        if self.current is not None:
+            self.swaps += 1
+            if self._waiting.get(self.current):
+                self.forced_swaps += 1
+            logger.debug("Model switch %s -> %s after %d turns", self.current, model, self._batch)
+        self.current = model
+        self._batch = 0
+
+    def stats(self) -> dict:
+        admitted = sum(self.turns.values())
+        return {
+            "current_model": self.current,
+            "active": self._active,
+            "waiting": {m: len(q) for m, q in self._waiting.items() if q},
+            "turns": dict(self.turns),
+            "swaps": self.swaps,
+            "forced_swaps": self.forced_swaps,
+            "average_wait": self._wait_seconds / admitted if admitted else 0.0,
+        }
+
+
+def create_model_scheduler(mode: str = MODEL_SCHEDULER) -> ModelScheduler | None:
+    """Build the gateway's scheduler, or None when MODEL_SCHEDULER is "off"."""
+    if mode == "off":
+        return None
+    if mode != "on":
+        raise ValueError(f"Unknown MODEL_SCHEDULER mode: {mode!r}")
+    return ModelScheduler()
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 
 from pydantic import BaseModel, field_validator
 
+from src.gateway.jobs import Job
 from src.state import EvaluationState
 
 
@@ -37,6 +38,8 @@ class EvaluationResponse(BaseModel):
     recommendation: str
     final_report: str
     created_at: datetime
+    errors: dict[str, str] = {}
+    skipped: list[str] = []
 
 
 class EvaluationSummary(BaseModel):
@@ -47,6 +50,42 @@ class EvaluationSummary(BaseModel):
     created_at: datetime
 
 
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    stages: dict[str, str]
+    evaluation_id: str | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class JobStats(BaseModel):
+    queue_depth: int
+    queue_capacity: int
+    workers: int
+    busy_workers: int
+    utilisation: float
+    average_utilisation: float | None = None  # not tracked with JOB_BACKEND=queue
+    submitted: int
+    succeeded: int
+    failed: int
+
+
+def job_response_from_job(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        status=job.status,
+        stages=dict(job.stages),
+        evaluation_id=job.evaluation_id,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
 def evaluation_response_from_state(state: EvaluationState) -> EvaluationResponse:
     return EvaluationResponse(
         id=str(uuid.uuid4()),
@@ -63,5 +102,7 @@ def evaluation_response_from_state(state: EvaluationState) -> EvaluationResponse
         average_score=state.average_score,
         recommendation=state.recommendation,
         final_report=state.final_report,
+        errors=dict(state.errors),
+        skipped=list(state.skipped),
         created_at=datetime.now(timezone.utc),
     )
@@ -1,28 +1,174 @@
 """FastAPI gateway wrapping the multi-agent evaluation pipeline."""
 
 import asyncio
+import json
 import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
 
-from fastapi import Depends, FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from llama_stack_client import AsyncLlamaStackClient
 
-from src.client import get_client
+from src.agents.base import turn_scheduler
+from src.agents.pool import get_async_agent_pool
+from src.agents.response_cache import get_response_cache
+from src.client import aclose_async_client, connection_stats, get_async_client
+from src.config import AGENT_POOL, COORDINATOR_MODEL, GATEWAY_EVENT_SINK, JOB_BACKEND, SPECIALIST_MODEL
+from src.event_sink import EventSink, create_event_sink
+from src.events import FinalReport
+from src.gateway.coalesce import SingleFlight, coalesce_key
+from src.gateway.job_queue import SQLiteJobQueue
+from src.gateway.jobs import Job, JobPool, QueueFullError
+from src.gateway.model_scheduler import create_model_scheduler
 from src.gateway.rate_limiter import RateLimiter
 from src.gateway.schemas import (
     EvaluateRequest,
     EvaluationResponse,
     EvaluationSummary,
+    JobResponse,
+    JobStats,
     evaluation_response_from_state,
+    job_response_from_job,
 )
-from src.pipeline import run_pipeline
+from src.gateway.store import MAX_PAGE_SIZE, EvaluationFilter, EvaluationStore, create_store
+from src.limiter import OverloadedError, limiter_stats
+from src.pipeline import PIPELINE_AGENTS, StageCallback, run_pipeline_async
+from src.pipeline_stream import stream_pipeline
+from src.security.shield_cache import get_shield_cache
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="MultiA Gateway", version="0.1.0")
-
 rate_limiter = RateLimiter()
 
-_evaluations: dict[str, EvaluationResponse] = {}
+# The store, client and job backend are built at startup (or on first use), so
+# importing this module opens no database and no connection pool
+store: EvaluationStore | None = None
+
+# The shared process-wide client, so its connection pool and the agent pool bound to it are reused
+client: AsyncLlamaStackClient | None = None
+
+job_pool: JobPool | SQLiteJobQueue | None = None
+
+# Identical ideas evaluated concurrently share one pipeline execution
+inflight = SingleFlight()
+
+# Pipeline progress events; delivered off the event loop so slow handlers never stall it
+event_sink = create_event_sink(GATEWAY_EVENT_SINK, background=True)
+
+# Groups agent turns by model across pipelines (MODEL_SCHEDULER=on); None when off
+model_scheduler = create_model_scheduler()
+
+
+@dataclass
+class GatewayContext:
+    """The client, store and event sink a request uses instead of the process-wide ones."""
+    client: AsyncLlamaStackClient
+    store: EvaluationStore
+    sink: EventSink
+
+
+# Set by in-process callers (the benchmark) for the requests they send through
+# httpx.ASGITransport, which runs the app in the caller's context. Queued jobs
+# run in the job backend's own tasks and always use the process-wide ones.
+gateway_context: ContextVar[GatewayContext | None] = ContextVar("gateway_context", default=None)
+
+
+def _store() -> EvaluationStore:
+    global store
+    if (context := gateway_context.get()) is not None:
+        return context.store
+    if store is None:
+        store = create_store()
+    return store
+
+
+def _client() -> AsyncLlamaStackClient:
+    global client
+    if (context := gateway_context.get()) is not None:
+        return context.client
+    if client is None:
+        client = get_async_client()
+    return client
+
+
+def _sink() -> EventSink:
+    context = gateway_context.get()
+    return event_sink if context is None else context.sink
+
+
+def _job_pool() -> JobPool | SQLiteJobQueue:
+    global job_pool
+    if job_pool is None:
+        job_pool = create_job_backend()
+    return job_pool
+
+
+async def _jobs(method: str, *args):
+    """Call ``method`` on the job backend without blocking the event loop.
+
+    SQLiteJobQueue calls can wait up to 30s for another process's write
+    lock, so they run in a thread; JobPool is an asyncio queue and stays
+    on the loop.
+    """
+    jobs = _job_pool()
+    if isinstance(jobs, SQLiteJobQueue):
+        return await asyncio.to_thread(getattr(jobs, method), *args)
+    return getattr(jobs, method)(*args)
+
+
+async def _evaluate_once(idea: str, on_stage: StageCallback | None = None) -> EvaluationResponse:
+    """Run and store one evaluation, coalescing with any identical one in flight.
+
+    Progress callbacks only reach the caller that started the execution.
+    """
+    async def execute() -> EvaluationResponse:
+        turn_scheduler.set(model_scheduler)  # runs as its own task, so scoped to this pipeline
+        state = await run_pipeline_async(_client(), idea, on_stage=on_stage, sink=_sink())
+        response = evaluation_response_from_state(state)
+        await asyncio.to_thread(_store().save, response)
+        return response
+
+    key = coalesce_key(idea, COORDINATOR_MODEL, SPECIALIST_MODEL)
+    return await inflight.do(key, execute)
+
+
+async def _run_job(job: Job) -> str:
+    response = await _evaluate_once(job.idea, on_stage=job.mark_stage)
+    return response.id
+
+
+def create_job_backend(kind: str = JOB_BACKEND) -> JobPool | SQLiteJobQueue:
+    """In-process worker pool ("local") or the durable queue drained by `multia worker` ("queue")."""
+    if kind == "local":
+        return JobPool(_run_job)
+    if kind == "queue":
+        return SQLiteJobQueue()
+    raise ValueError(f"Unknown job backend: {kind!r}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client, store, job_pool
+    _store()
+    if AGENT_POOL != "off":
+        try:
+            await get_async_agent_pool(_client()).warm(PIPELINE_AGENTS)
+        except Exception:
+            logger.warning("Agent pool warm-up failed; agents will be created on demand", exc_info=True)
+    _job_pool().start()
+    yield
+    await job_pool.stop()
+    await get_async_agent_pool(_client()).close()
+    await aclose_async_client()
+    event_sink.close()
+    store.close()
+    client = store = job_pool = None
+
+
+app = FastAPI(title="MultiA Gateway", version="0.1.0", lifespan=lifespan)
 
 
 @app.exception_handler(Exception)
@@ -34,6 +180,16 @@ async def generic_exception_handler(request: Request, exc: Exception):
     )
 
 
+@app.exception_handler(OverloadedError)
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    logger.warning("Shed request: %s", exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "LlamaStack backend overloaded, retry later"},
+        headers={"Retry-After": "5"},
+    )
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -43,29 +199,127 @@ async def health():
 async def evaluate(
     request: EvaluateRequest, _rate=Depends(rate_limiter)
 ):
-    client = get_client()
-    state = await asyncio.to_thread(run_pipeline, client, request.idea)
-    response = evaluation_response_from_state(state)
-    _evaluations[response.id] = response
-    return response
+    return await _evaluate_once(request.idea)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _event_stream(idea: str):
+    turn_scheduler.set(model_scheduler)
+    sink = _sink()
+    try:
+        async for event in stream_pipeline(_client(), idea):
+            sink.emit(event)
+            data = event.to_dict()
+            if isinstance(event, FinalReport):
+                response = evaluation_response_from_state(event.state)
+                await asyncio.to_thread(_store().save, response)
+                data["evaluation_id"] = response.id
+            yield _sse(event.type, data)
+    except Exception:
+        logger.exception("Pipeline error")
+        yield _sse("error", {"type": "error", "detail": "Internal evaluation error"})
+
+
+@app.post("/evaluate/stream")
+async def evaluate_stream(
+    request: EvaluateRequest, _rate=Depends(rate_limiter)
+):
+    """Run an evaluation, streaming its progress as Server-Sent Events.
+
+    Each event is named by its type (stage_started, token, stage_finished,
+    stage_failed, final_report, or error) with the event as JSON data.
+    The final_report event carries the stored evaluation's id. Streams
+    are not coalesced: every caller gets its own run and token stream.
+    """
+    return StreamingResponse(
+        _event_stream(request.idea),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: EvaluateRequest, _rate=Depends(rate_limiter)
+):
+    """Queue an evaluation and return immediately; poll GET /jobs/{id}."""
+    try:
+        job = await _jobs("submit", request.idea)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return job_response_from_job(job)
+
+
+@app.get("/jobs/stats", response_model=JobStats)
+async def job_stats():
+    return JobStats(**await _jobs("stats"))
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    job = await _jobs("get", job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"detail": "Not found"})
+    return job_response_from_job(job)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Operational counters for sizing and tuning the gateway."""
+    response_cache = get_response_cache()
+    shield_cache = get_shield_cache()
+    return {
+        "jobs": await _jobs("stats"),
+        "coalescing": inflight.stats(),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "shield_cache": shield_cache.stats() if shield_cache else None,
+        "agent_pool": get_async_agent_pool(_client()).snapshot(),
+        "connections": connection_stats(),
+        "model_scheduler": model_scheduler.stats() if model_scheduler else None,
+        "limits": limiter_stats(),
+    }
 
 
 @app.get("/evaluations", response_model=list[EvaluationSummary])
-async def list_evaluations():
-    return [
-        EvaluationSummary(
-            id=e.id,
-            startup_idea=e.startup_idea,
-            average_score=e.average_score,
-            recommendation=e.recommendation,
-            created_at=e.created_at,
+async def list_evaluations(
+    response: Response,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    recommendation: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    """List evaluation summaries, newest first.
+
+    When more results are available the next page's cursor is returned
+    in the ``X-Next-Cursor`` header; pass it back as ``?cursor=``.
+    """
+    filters = EvaluationFilter(
+        recommendation=recommendation,
+        min_score=min_score,
+        max_score=max_score,
+        since=since,
+        until=until,
+    )
+    try:
+        summaries, next_cursor = await asyncio.to_thread(
+            _store().list, limit=limit, cursor=cursor, filters=filters
         )
-        for e in _evaluations.values()
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return summaries
 
 
 @app.get("/evaluations/{evaluation_id}", response_model=EvaluationResponse)
 async def get_evaluation(evaluation_id: str):
-    if evaluation_id not in _evaluations:
+    evaluation = await asyncio.to_thread(_store().get, evaluation_id)
+    if evaluation is None:
         return JSONResponse(status_code=404, content={"detail": "Not found"})
-    return _evaluations[evaluation_id]
+    return evaluation
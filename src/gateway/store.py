@@ -0,0 +1,264 @@
+"""Evaluation stores for the gateway.
+
+Two interchangeable backends share the ``EvaluationStore`` interface:
+
+- ``MemoryEvaluationStore``: a dict, lost on restart (tests and demos)
+- ``SQLiteEvaluationStore``: durable, WAL-mode SQLite with indexed
+  summary columns so listing never loads the brief, analyses or report
+
+Listings are ordered newest first and paginated with an opaque cursor
+that encodes the (created_at, id) of the last row returned.
+"""
+
+import base64
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.config import EVALUATION_DB_PATH, EVALUATION_STORE
+from src.gateway.schemas import EvaluationResponse, EvaluationSummary
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class EvaluationFilter:
+    recommendation: str | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+def encode_cursor(created_at: datetime, evaluation_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{evaluation_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor from encode_cursor. Raises ValueError if malformed."""
+    try:
+        created_at, evaluation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return _utc(datetime.fromisoformat(created_at)), evaluation_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _summary(e: EvaluationResponse) -> EvaluationSummary:
+    return EvaluationSummary(
+        id=e.id,
+        startup_idea=e.startup_idea,
+        average_score=e.average_score,
+        recommendation=e.recommendation,
+        created_at=e.created_at,
+    )
+
+
+class EvaluationStore(ABC):
+    """Interface for gateway evaluation persistence."""
+
+    @abstractmethod
+    def save(self, evaluation: EvaluationResponse):
+        ...
+
+    @abstractmethod
+    def get(self, evaluation_id: str) -> EvaluationResponse | None:
+        ...
+
+    @abstractmethod
+    def list(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        filters: EvaluationFilter | None = None,
+    ) -> tuple[list[EvaluationSummary], str | None]:
+        """Return one page of summaries (newest first) and the next cursor, if any."""
+
+    def close(self):
+        pass
+
+
+class MemoryEvaluationStore(EvaluationStore):
+    """In-process store. Not durable; intended for tests and local demos."""
+
+    def __init__(self):
+        self._evaluations: dict[str, EvaluationResponse] = {}
+
+    def save(self, evaluation: EvaluationResponse):
+        self._evaluations[evaluation.id] = evaluation
+
+    def get(self, evaluation_id: str) -> EvaluationResponse | None:
+        return self._evaluations.get(evaluation_id)
+
+    def list(self, limit=50, cursor=None, filters=None):
+        filters = filters or EvaluationFilter()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows = sorted(
+            self._evaluations.values(),
+            key=lambda e: (e.created_at, e.id),
+            reverse=True,
+        )
+        if cursor:
+            after = decode_cursor(cursor)
+            rows = [e for e in rows if (_utc(e.created_at), e.id) < after]
+        rows = [e for e in rows if _matches(e, filters)]
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+        return [_summary(e) for e in page], next_cursor
+
+
+def _matches(e: EvaluationResponse, f: EvaluationFilter) -> bool:
+    if f.recommendation is not None and e.recommendation != f.recommendation:
+        return False
+    if f.min_score is not None and e.average_score < f.min_score:
+        return False
+    if f.max_score is not None and e.average_score > f.max_score:
+        return False
+    if f.since is not None and _utc(e.created_at) < _utc(f.since):
+        return False
+    if f.until is not None and _utc(e.created_at) >= _utc(f.until):
+        return False
+    return True
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id TEXT PRIMARY KEY,
+    startup_idea TEXT NOT NULL,
+    average_score REAL NOT NULL,
+    recommendation TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_created ON evaluations (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_evaluations_recommendation ON evaluations (recommendation, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_evaluations_score ON evaluations (average_score);
+"""
+
+
+class SQLiteEvaluationStore(EvaluationStore):
+    """Durable store backed by a SQLite database in WAL mode.
+
+    Summary fields live in their own indexed columns; the full response
+    is kept as JSON in ``payload`` and only read by ``get``. Timestamps
+    are stored as UTC ISO-8601 strings so they sort lexically.
+    """
+
+    def __init__(self, path: Path = EVALUATION_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logger.info("Evaluation store: %s", self.path)
+
+    def save(self, evaluation: EvaluationResponse):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluations "
+                "(id, startup_idea, average_score, recommendation, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    evaluation.id,
+                    evaluation.startup_idea,
+                    evaluation.average_score,
+                    evaluation.recommendation,
+                    _ts(evaluation.created_at),
+                    evaluation.model_dump_json(),
+                ),
+            )
+
+    def get(self, evaluation_id: str) -> EvaluationResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM evaluations WHERE id = ?", (evaluation_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return EvaluationResponse.model_validate_json(row[0])
+
+    def list(self, limit=50, cursor=None, filters=None):
+        filters = filters or EvaluationFilter()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses: list[str] = []
+        params: list = []
+
+        if cursor:
+            created_at, evaluation_id = decode_cursor(cursor)
+            clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params += [_ts(created_at), _ts(created_at), evaluation_id]
+        if filters.recommendation is not None:
+            clauses.append("recommendation = ?")
+            params.append(filters.recommendation)
+        if filters.min_score is not None:
+            clauses.append("average_score >= ?")
+            params.append(filters.min_score)
+        if filters.max_score is not None:
+            clauses.append("average_score <= ?")
+            params.append(filters.max_score)
+        if filters.since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_ts(filters.since))
+        if filters.until is not None:
+            clauses.append("created_at < ?")
+            params.append(_ts(filters.until))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            "SELECT id, startup_idea, average_score, recommendation, created_at "
+            f"FROM evaluations {where} ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, [*params, limit + 1]).fetchall()
+
+        summaries = [
+            EvaluationSummary(
+                id=r[0],
+                startup_idea=r[1],
+                average_score=r[2],
+                recommendation=r[3],
+                created_at=datetime.fromisoformat(r[4]),
+            )
+            for r in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = summaries[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return summaries, next_cursor
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _utc(dt: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _ts(dt: datetime) -> str:
+    """Normalise to a lexically sortable UTC ISO-8601 string."""
+    return _utc(dt).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def create_store(kind: str = EVALUATION_STORE) -> EvaluationStore:
+    """Build the configured evaluation store ("sqlite" or "memory")."""
+    if kind == "memory":
+        return MemoryEvaluationStore()
+    if kind == "sqlite":
+        return SQLiteEvaluationStore()
+    raise ValueError(f"Unknown evaluation store: {kind!r}")
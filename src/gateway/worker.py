@@ -0,0 +1,204 @@
+"""``multia worker``: run queued gateway jobs from the SQLite job queue.
+
+Start any number of these, on the gateway host or on others that share
+JOB_QUEUE_DB_PATH and EVALUATION_DB_PATH; set JOB_BACKEND=queue on the
+gateway so it enqueues instead of running pipelines itself.
+
+Each worker runs up to ``--concurrency`` jobs at once. While a job runs
+its lease is renewed every third of JOB_LEASE_SECONDS; if a renewal finds
+the lease gone (this worker stalled long enough for it to expire and be
+requeued), the job is abandoned here. On SIGINT/SIGTERM in-flight jobs
+are cancelled and handed back to the queue.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+import uuid
+
+from src.config import JOB_WORKERS, WORKER_POLL_INTERVAL
+from src.event_sink import create_event_sink
+from src.gateway.job_queue import SQLiteJobQueue
+from src.gateway.jobs import Job
+from src.gateway.schemas import evaluation_response_from_state
+from src.gateway.store import EvaluationStore, create_store
+from src.pipeline import PIPELINE_AGENTS, run_pipeline_async
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Leases jobs from ``queue``, runs their pipelines and stores the results."""
+
+    def __init__(
+        self,
+        queue: SQLiteJobQueue,
+        store: EvaluationStore,
+        client,
+        concurrency: int = JOB_WORKERS,
+        poll_interval: float = WORKER_POLL_INTERVAL,
+        worker_id: str | None = None,
+        sink=None,
+    ):
+        self.queue = queue
+        self.store = store
+        self.client = client
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.sink = sink
+        self.completed = 0
+        self.failed = 0
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop leasing; run() then cancels in-flight jobs and releases them."""
+        self._stopping.set()
+
+    async def run(self, max_jobs: int | None = None):
+        """Work until stop() (or until ``max_jobs`` have finished, for tests and drains)."""
+        await asyncio.to_thread(self.queue.register_worker, self.id, socket.gethostname(), self.concurrency)
+        logger.info("Worker %s started (concurrency %d)", self.id, self.concurrency)
+        slots = [asyncio.create_task(self._slot(max_jobs), name=f"{self.id}-{i}") for i in range(self.concurrency)]
+        try:
+            await asyncio.gather(*slots)
+        finally:
+            for task in slots:
+                task.cancel()
+            await asyncio.gather(*slots, return_exceptions=True)
+            await asyncio.to_thread(self.queue.unregister_worker, self.id)
+            logger.info("Worker %s stopped: %d completed, %d failed", self.id, self.completed, self.failed)
+
+    def _done(self, max_jobs: int | None) -> bool:
+        return self._stopping.is_set() or (max_jobs is not None and self.completed + self.failed >= max_jobs)
+
+    async def _slot(self, max_jobs: int | None):
+        while not self._done(max_jobs):
+            job = await asyncio.to_thread(self.queue.lease, self.id)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(job)
+
+    async def _process(self, job: Job):
+        pipeline = asyncio.create_task(self._execute(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, pipeline))
+        stopping = asyncio.create_task(self._stopping.wait())
+        try:
+            await asyncio.wait({pipeline, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            if not pipeline.done():
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+                await asyncio.to_thread(self.queue.release, job.id, self.id)
+                logger.info("Released job %s on shutdown", job.id)
+                return
+            try:
+                evaluation_id = pipeline.result()
+            except asyncio.CancelledError:
+                logger.warning("Abandoned job %s: lease lost", job.id)
+                return
+            except Exception as e:
+                logger.exception("Job %s failed", job.id)
+                self.failed += 1
+                await asyncio.to_thread(self.queue.fail, job.id, self.id, f"{type(e).__name__}: {e}")
+                return
+            if await asyncio.to_thread(self.queue.complete, job.id, self.id, evaluation_id):
+                self.completed += 1
+            else:
+                logger.warning("Job %s finished after its lease was lost; result %s kept", job.id, evaluation_id)
+        finally:
+            heartbeat.cancel()
+            stopping.cancel()
+
+    async def _execute(self, job: Job) -> str:
+        # Stage updates are written by their own task, off the event loop, so a
+        # locked jobs.db stalls neither this pipeline nor the other jobs' heartbeats
+        updates: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write_stages(job, updates))
+        flush = True
+        try:
+            state = await run_pipeline_async(
+                self.client, job.idea, on_stage=lambda stage, status: updates.put_nowait((stage, status)),
+                sink=self.sink,
+            )
+            response = evaluation_response_from_state(state)
+            await asyncio.to_thread(self.store.save, response)
+            return response.id
+        except asyncio.CancelledError:
+            flush = False
+            writer.cancel()
+            raise
+        finally:
+            if flush:
+                # Every update lands before complete() or fail()
+                updates.put_nowait(None)
+                await writer
+
+    async def _write_stages(self, job: Job, updates: asyncio.Queue):
+        while (update := await updates.get()) is not None:
+            stage, status = update
+            try:
+                await asyncio.to_thread(self.queue.mark_stage, job.id, self.id, stage, status)
+            except Exception:
+                logger.warning("Could not record stage %s of job %s", stage, job.id, exc_info=True)
+
+    async def _heartbeat(self, job: Job, pipeline: asyncio.Task):
+        interval = self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(self.queue.heartbeat, job.id, self.id):
+                pipeline.cancel()
+                return
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="multia worker", description="Run queued gateway evaluations")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKERS, help="jobs run at once")
+    parser.add_argument("--poll-interval", type=float, default=WORKER_POLL_INTERVAL,
+                        help="seconds between polls of an empty queue")
+    parser.add_argument("--max-jobs", type=int, help="exit after this many jobs")
+    return parser
+
+
+async def _serve(args: argparse.Namespace):
+    from src.agents.pool import get_async_agent_pool
+    from src.client import aclose_async_client, get_async_client
+    from src.config import AGENT_POOL, GATEWAY_EVENT_SINK
+
+    queue, store, client = SQLiteJobQueue(), create_store(), get_async_client()
+    sink = create_event_sink(GATEWAY_EVENT_SINK, background=True)
+    if AGENT_POOL != "off":
+        try:
+            await get_async_agent_pool(client).warm(PIPELINE_AGENTS)
+        except Exception:
+            logger.warning("Agent pool warm-up failed; agents will be created on demand", exc_info=True)
+    worker = Worker(queue, store, client, args.concurrency, args.poll_interval, sink=sink)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run(max_jobs=args.max_jobs)
+    finally:
+        await get_async_agent_pool(client).close()
+        await aclose_async_client()
+        sink.close()
+        store.close()
+        queue.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, force=True)
+    asyncio.run(_serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
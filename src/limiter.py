@@ -0,0 +1,299 @@
+"""Adaptive concurrency limits for LlamaStack calls.
+
+Agent turns, shield runs and scoring calls each go through their own
+AdaptiveLimiter (enable with ADAPTIVE_LIMIT=on). A limiter admits up to
+``limit`` calls at once and adjusts the limit AIMD-style from what it sees:
+
+- a call that finishes within ``tolerance`` x the baseline latency while
+  the limit was in use raises the limit by about one per limit's worth
+  of calls (additive increase)
+- a slower call, or one that fails, multiplies it by ``backoff``
+  (multiplicative decrease), at most once per baseline latency so a
+  burst of slow calls counts as one congestion signal
+
+The baseline tracks the fastest recent latency: it drops to any faster
+sample at once and creeps up slowly otherwise, so it follows a backend
+that has become slower for good. Calls beyond the limit wait in a FIFO
+queue shared by threads and event loops; when ``max_queue`` calls are
+already waiting, or a call waits longer than ``queue_timeout``, it is
+shed with OverloadedError instead.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from dataclasses import dataclass
+
+from llama_stack_client import APIConnectionError, APIStatusError
+
+from src.config import (
+    ADAPTIVE_LIMIT,
+    ADAPTIVE_LIMIT_BACKOFF,
+    ADAPTIVE_LIMIT_INITIAL,
+    ADAPTIVE_LIMIT_MAX,
+    ADAPTIVE_LIMIT_MIN,
+    ADAPTIVE_LIMIT_QUEUE,
+    ADAPTIVE_LIMIT_QUEUE_TIMEOUT,
+    ADAPTIVE_LIMIT_TOLERANCE,
+)
+
+logger = logging.getLogger(__name__)
+
+TURN = "turn"
+SHIELD = "shield"
+SCORE = "score"
+KINDS = (TURN, SHIELD, SCORE)
+
+# How fast the baseline drifts up towards slower samples
+BASELINE_DRIFT = 0.01
+
+
+class OverloadedError(Exception):
+    """A call was shed: the limiter's queue was full or it waited too long."""
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """A queued call: a thread blocked on ``event`` or a task awaiting ``future``."""
+    event: threading.Event | None = None
+    loop: asyncio.AbstractEventLoop | None = None
+    future: asyncio.Future | None = None
+    admitted: bool = False
+
+    def wake(self):
+        self.admitted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _congestion(exc: BaseException) -> bool | None:
+    """Whether a failed call signals an overloaded backend (None: it says nothing either way)."""
+    if isinstance(exc, APIConnectionError):  # includes timeouts
+        return True
+    if isinstance(exc, APIStatusError):
+        return exc.status_code >= 500 or exc.status_code == 429
+    return None
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded wait queue; usable from threads and event loops."""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = ADAPTIVE_LIMIT_INITIAL,
+        min_limit: int = ADAPTIVE_LIMIT_MIN,
+        max_limit: int = ADAPTIVE_LIMIT_MAX,
+        max_queue: int = ADAPTIVE_LIMIT_QUEUE,
+        queue_timeout: float = ADAPTIVE_LIMIT_QUEUE_TIMEOUT,
+        tolerance: float = ADAPTIVE_LIMIT_TOLERANCE,
+        backoff: float = ADAPTIVE_LIMIT_BACKOFF,
+    ):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(f"Need 1 <= min <= initial <= max limit, got {min_limit}, {initial}, {max_limit}")
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline: float | None = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.increases = 0
+        self.decreases = 0
+        self.last_latency: float | None = None
+        self._waited = 0
+        self._queue_time_total = 0.0
+        self._queue_time_max = 0.0
+        self._last_decrease = 0.0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    # ── Admission ────────────────────────────────────────────────────────
+
+    def _admit_locked(self):
+        self.in_flight += 1
+        self.admitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _enqueue(self, waiter: _Waiter) -> bool:
+        """Admit at once (False) or queue ``waiter`` (True); raises OverloadedError when full."""
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self._admit_locked()
+                return False
+            if len(self._waiters) >= self.max_queue:
+                self.shed += 1
+                raise OverloadedError(f"{self.name} limiter: {len(self._waiters)} calls already queued")
+            self._waiters.append(waiter)
+            self.queued += 1
+            return True
+
+    def _dequeued(self, waiter: _Waiter, waited: float):
+        """Settle a queued waiter that woke up or timed out."""
+        with self._lock:
+            if not waiter.admitted:
+                self._waiters.remove(waiter)
+                self.shed += 1
+                raise OverloadedError(f"{self.name} limiter: no capacity within {self.queue_timeout:.0f}s")
+            self._waited += 1
+            self._queue_time_total += waited
+            self._queue_time_max = max(self._queue_time_max, waited)
+
+    def _wake_locked(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            self._admit_locked()
+            self._waiters.popleft().wake()
+
+    def _release(self, latency: float, congested: bool | None):
+        with self._lock:
+            self.in_flight -= 1
+            if congested is not None:
+                self._adjust(latency, congested, in_use=self.in_flight + 1)
+            self._wake_locked()
+
+    def _adjust(self, latency: float, failed: bool, in_use: int):
+        self.last_latency = latency
+        if not failed:
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * BASELINE_DRIFT
+        congested = failed or latency > self.tolerance * self.baseline
+        now = time.monotonic()
+        if congested:
+            # One decrease per baseline latency: the calls in flight when it
+            # happened would otherwise each cut the limit again
+            if now - self._last_decrease >= (self.baseline or 0.0):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.decreases += 1
+                self._last_decrease = now
+                logger.debug("%s limit lowered to %.1f (latency %.3fs, baseline %s)",
+                             self.name, self.limit, latency, self.baseline)
+        elif in_use >= int(self.limit) / 2 and self.limit < self.max_limit:
+            # Only grow a limit that is actually being used
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.increases += 1
+
+    @contextmanager
+    def acquire(self):
+        """Hold a slot for the body's duration, waiting in the queue if needed."""
+        waiter = _Waiter(event=threading.Event())
+        if self._enqueue(waiter):
+            start = time.monotonic()
+            waiter.event.wait(self.queue_timeout)
+            self._dequeued(waiter, time.monotonic() - start)
+        start, congested = time.monotonic(), False
+        try:
+            yield
+        except BaseException as e:
+            congested = _congestion(e)
+            raise
+        finally:
+            self._release(time.monotonic() - start, congested)
+
+    @asynccontextmanager
+    async def acquire_async(self):
+        """Async variant of acquire; waits without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop=loop, future=loop.create_future())
+        if self._enqueue(waiter):
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+            self._dequeued(waiter, time.monotonic() - start)
+        start, congested = time.monotonic(), False
+        try:
+            yield
+        except BaseException as e:
+            congested = _congestion(e)  # None for a cancelled caller too
+            raise
+        finally:
+            self._release(time.monotonic() - start, congested)
+
+    def _abandon(self, waiter: _Waiter):
+        """A queued task was cancelled: leave the queue, or hand back the slot it was just given."""
+        with self._lock:
+            if not waiter.admitted:
+                self._waiters.remove(waiter)
+                return
+            self.in_flight -= 1
+            self._wake_locked()
+
+    # ── Metrics ──────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._lock:
+            waited = self._waited
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "queue_depth": len(self._waiters),
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "shed": self.shed,
+                "queue_time_avg_ms": round(self._queue_time_total / waited * 1000, 1) if waited else 0.0,
+                "queue_time_max_ms": round(self._queue_time_max * 1000, 1),
+                "baseline_ms": round(self.baseline * 1000, 1) if self.baseline is not None else None,
+                "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+                "increases": self.increases,
+                "decreases": self.decreases,
+            }
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+_lock = threading.Lock()
+
+
+def get_limiter(kind: str) -> AdaptiveLimiter | None:
+    """Return the process-wide limiter for ``kind`` (TURN, SHIELD or SCORE), or None if limiting is off."""
+    if ADAPTIVE_LIMIT == "off":
+        return None
+    if ADAPTIVE_LIMIT != "on":
+        raise ValueError(f"Unknown ADAPTIVE_LIMIT mode: {ADAPTIVE_LIMIT!r}")
+    with _lock:
+        if kind not in _limiters:
+            _limiters[kind] = AdaptiveLimiter(kind)
+        return _limiters[kind]
+
+
+def limited(kind: str):
+    """Context manager holding a ``kind`` slot around a sync call; a no-op when limiting is off."""
+    limiter = get_limiter(kind)
+    return limiter.acquire() if limiter is not None else nullcontext()
+
+
+def limited_async(kind: str):
+    """Async variant of limited."""
+    limiter = get_limiter(kind)
+    return limiter.acquire_async() if limiter is not None else nullcontext()
+
+
+def limiter_stats() -> dict | None:
+    """Per-kind limiter metrics, or None if limiting is off."""
+    if ADAPTIVE_LIMIT == "off":
+        return None
+    with _lock:
+        return {kind: limiter.stats() for kind, limiter in _limiters.items()}
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
 DEFAULT_TTL = 86400  # 24 hours
 
@@ -16,7 +16,105 @@ def _new_id() -> str:
     return str(uuid.uuid4())
 
 
-class PipelineTelemetry:
+class _TelemetryEvents:
+    """Builds the telemetry event payloads for one pipeline trace.
+
+    Shared by the sync and async telemetry helpers so both emit
+    identical events.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL):
+        self.ttl_seconds = ttl_seconds
+        self.trace_id = _new_id()
+        self.root_span_id = _new_id()
+        self._started = False
+
+    def _start_event(self, startup_idea: str) -> dict:
+        return {
+            "type": "structured_log",
+            "payload": {"type": "span_start", "name": "pipeline_run"},
+            "trace_id": self.trace_id,
+            "span_id": self.root_span_id,
+            "timestamp": _now_iso(),
+            "attributes": {"startup_idea": startup_idea},
+        }
+
+    def _span_start_event(self, span_id: str, name: str, attributes: dict | None) -> dict:
+        return {
+            "type": "structured_log",
+            "payload": {
+                "type": "span_start",
+                "name": name,
+                "parent_span_id": self.root_span_id,
+            },
+            "trace_id": self.trace_id,
+            "span_id": span_id,
+            "timestamp": _now_iso(),
+            "attributes": attributes or {},
+        }
+
+    def _span_end_event(self, span_id: str, status: str) -> dict:
+        return {
+            "type": "structured_log",
+            "payload": {"type": "span_end", "status": status},
+            "trace_id": self.trace_id,
+            "span_id": span_id,
+            "timestamp": _now_iso(),
+        }
+
+    def _log_event(self, message: str, severity: str, attributes: dict | None) -> dict:
+        return {
+            "type": "unstructured_log",
+            "message": message,
+            "severity": severity,
+            "trace_id": self.trace_id,
+            "span_id": self.root_span_id,
+            "timestamp": _now_iso(),
+            "attributes": attributes or {},
+        }
+
+    def _metric_event(self, name: str, value: float, unit: str, attributes: dict | None) -> dict:
+        return {
+            "type": "metric",
+            "metric": name,
+            "value": value,
+            "unit": unit,
+            "trace_id": self.trace_id,
+            "span_id": self.root_span_id,
+            "timestamp": _now_iso(),
+            "attributes": attributes or {},
+        }
+
+    @staticmethod
+    def _policy_log_args(agent_name: str, tool_name: str, allowed: bool, reason: str) -> tuple:
+        return (
+            f"Policy decision: agent={agent_name} tool={tool_name} allowed={allowed}",
+            "warn" if not allowed else "info",
+            {
+                "event_type": "policy_decision",
+                "agent_name": agent_name,
+                "tool_name": tool_name,
+                "allowed": allowed,
+                "reason": reason,
+            },
+        )
+
+    @staticmethod
+    def _shield_log_args(shield_id: str, agent_name: str, passed: bool, message: str) -> tuple:
+        return (
+            f"Shield result: shield={shield_id} agent={agent_name} passed={passed}",
+            "warn" if not passed else "info",
+            {
+                "event_type": "shield_result",
+                "shield_id": shield_id,
+                "agent_name": agent_name,
+                "passed": passed,
+                "message": message,
+            },
+        )
+
+
+class PipelineTelemetry(_TelemetryEvents):
     """Scoped telemetry helper for a single pipeline run.
 
     Creates a trace with a root span, and provides methods to log
@@ -24,131 +122,46 @@ class PipelineTelemetry:
     """
 
     def __init__(self, client: LlamaStackClient, ttl_seconds: int = DEFAULT_TTL):
+        super().__init__(ttl_seconds)
         self.client = client
-        self.ttl_seconds = ttl_seconds
-        self.trace_id = _new_id()
-        self.root_span_id = _new_id()
-        self._started = False
+
+    def _emit(self, event: dict):
+        self.client.telemetry.log_event(event=event, ttl_seconds=self.ttl_seconds)
 
     def start(self, startup_idea: str):
         """Start the pipeline trace with a root span."""
-        self.client.telemetry.log_event(
-            event={
-                "type": "structured_log",
-                "payload": {"type": "span_start", "name": "pipeline_run"},
-                "trace_id": self.trace_id,
-                "span_id": self.root_span_id,
-                "timestamp": _now_iso(),
-                "attributes": {"startup_idea": startup_idea},
-            },
-            ttl_seconds=self.ttl_seconds,
-        )
+        self._emit(self._start_event(startup_idea))
         self._started = True
 
     def end(self, status: str = "ok"):
         """End the pipeline root span."""
-        self.client.telemetry.log_event(
-            event={
-                "type": "structured_log",
-                "payload": {"type": "span_end", "status": status},
-                "trace_id": self.trace_id,
-                "span_id": self.root_span_id,
-                "timestamp": _now_iso(),
-            },
-            ttl_seconds=self.ttl_seconds,
-        )
+        self._emit(self._span_end_event(self.root_span_id, status))
 
     def start_span(self, name: str, attributes: dict | None = None) -> str:
         """Start a child span and return its span_id."""
         span_id = _new_id()
-        self.client.telemetry.log_event(
-            event={
-                "type": "structured_log",
-                "payload": {
-                    "type": "span_start",
-                    "name": name,
-                    "parent_span_id": self.root_span_id,
-                },
-                "trace_id": self.trace_id,
-                "span_id": span_id,
-                "timestamp": _now_iso(),
-                "attributes": attributes or {},
-            },
-            ttl_seconds=self.ttl_seconds,
-        )
+        self._emit(self._span_start_event(span_id, name, attributes))
         return span_id
 
     def end_span(self, span_id: str, status: str = "ok"):
         """End a child span."""
-        self.client.telemetry.log_event(
-            event={
-                "type": "structured_log",
-                "payload": {"type": "span_end", "status": status},
-                "trace_id": self.trace_id,
-                "span_id": span_id,
-                "timestamp": _now_iso(),
-            },
-            ttl_seconds=self.ttl_seconds,
-        )
+        self._emit(self._span_end_event(span_id, status))
 
     def log(self, message: str, severity: str = "info", attributes: dict | None = None):
         """Log an unstructured message within the pipeline trace."""
-        self.client.telemetry.log_event(
-            event={
-                "type": "unstructured_log",
-                "message": message,
-                "severity": severity,
-                "trace_id": self.trace_id,
-                "span_id": self.root_span_id,
-                "timestamp": _now_iso(),
-                "attributes": attributes or {},
-            },
-            ttl_seconds=self.ttl_seconds,
-        )
+        self._emit(self._log_event(message, severity, attributes))
 
     def metric(self, name: str, value: float, unit: str, attributes: dict | None = None):
         """Log a metric event within the pipeline trace."""
-        self.client.telemetry.log_event(
-            event={
-                "type": "metric",
-                "metric": name,
-                "value": value,
-                "unit": unit,
-                "trace_id": self.trace_id,
-                "span_id": self.root_span_id,
-                "timestamp": _now_iso(),
-                "attributes": attributes or {},
-            },
-            ttl_seconds=self.ttl_seconds,
-        )
+        self._emit(self._metric_event(name, value, unit, attributes))
 
     def log_policy_decision(self, agent_name: str, tool_name: str, allowed: bool, reason: str):
         """Log a policy decision from the governance engine."""
-        self.log(
-            f"Policy decision: agent={agent_name} tool={tool_name} allowed={allowed}",
-            severity="warn" if not allowed else "info",
-            attributes={
-                "event_type": "policy_decision",
-                "agent_name": agent_name,
-                "tool_name": tool_name,
-                "allowed": allowed,
-                "reason": reason,
-            },
-        )
+        self.log(*self._policy_log_args(agent_name, tool_name, allowed, reason))
 
     def log_shield_result(self, shield_id: str, agent_name: str, passed: bool, message: str = ""):
         """Log a shield gate result."""
-        self.log(
-            f"Shield result: shield={shield_id} agent={agent_name} passed={passed}",
-            severity="warn" if not passed else "info",
-            attributes={
-                "event_type": "shield_result",
-                "shield_id": shield_id,
-                "agent_name": agent_name,
-                "passed": passed,
-                "message": message,
-            },
-        )
+        self.log(*self._shield_log_args(shield_id, agent_name, passed, message))
 
     def get_trace(self) -> dict:
         """Query the span tree for this pipeline's trace."""
@@ -158,6 +171,59 @@ class PipelineTelemetry:
         )
 
 
+class AsyncPipelineTelemetry(_TelemetryEvents):
+    """Async variant of PipelineTelemetry for use with the async client."""
+
+    def __init__(self, client: AsyncLlamaStackClient, ttl_seconds: int = DEFAULT_TTL):
+        super().__init__(ttl_seconds)
+        self.client = client
+
+    async def _emit(self, event: dict):
+        await self.client.telemetry.log_event(event=event, ttl_seconds=self.ttl_seconds)
+
+    async def start(self, startup_idea: str):
+        """Start the pipeline trace with a root span."""
+        await self._emit(self._start_event(startup_idea))
+        self._started = True
+
+    async def end(self, status: str = "ok"):
+        """End the pipeline root span."""
+        await self._emit(self._span_end_event(self.root_span_id, status))
+
+    async def start_span(self, name: str, attributes: dict | None = None) -> str:
+        """Start a child span and return its span_id."""
+        span_id = _new_id()
+        await self._emit(self._span_start_event(span_id, name, attributes))
+        return span_id
+
+    async def end_span(self, span_id: str, status: str = "ok"):
+        """End a child span."""
+        await self._emit(self._span_end_event(span_id, status))
+
+    async def log(self, message: str, severity: str = "info", attributes: dict | None = None):
+        """Log an unstructured message within the pipeline trace."""
+        await self._emit(self._log_event(message, severity, attributes))
+
+    async def metric(self, name: str, value: float, unit: str, attributes: dict | None = None):
+        """Log a metric event within the pipeline trace."""
+        await self._emit(self._metric_event(name, value, unit, attributes))
+
+    async def log_policy_decision(self, agent_name: str, tool_name: str, allowed: bool, reason: str):
+        """Log a policy decision from the governance engine."""
+        await self.log(*self._policy_log_args(agent_name, tool_name, allowed, reason))
+
+    async def log_shield_result(self, shield_id: str, agent_name: str, passed: bool, message: str = ""):
+        """Log a shield gate result."""
+        await self.log(*self._shield_log_args(shield_id, agent_name, passed, message))
+
+    async def get_trace(self) -> dict:
+        """Query the span tree for this pipeline's trace."""
+        return await self.client.telemetry.get_span_tree(
+            self.root_span_id,
+            max_depth=10,
+        )
+
+
 def query_recent_traces(client: LlamaStackClient, limit: int = 10):
     """Query the most recent traces from telemetry."""
     return client.telemetry.query_traces(limit=limit)
@@ -1,65 +1,591 @@
 """Full multi-agent evaluation pipeline."""
 
-from llama_stack_client import LlamaStackClient
+import asyncio
+import copy
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, TypeVar
 
-from src.agents.coordinator import create_brief, synthesize_report
-from src.agents.finance_agent import run_finance_evaluation
-from src.agents.market_agent import run_market_evaluation
-from src.agents.risk_agent import run_risk_evaluation
-from src.agents.tech_agent import run_tech_evaluation
-from src.state import EvaluationState
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
+from src.agents.base import turn_deltas
+from src.agents.coordinator import (
+    BRIEF_AGENT,
+    GO_THRESHOLD,
+    SYNTHESIS_AGENT,
+    create_brief,
+    create_brief_async,
+    recommendation_for,
+    synthesize_report,
+    synthesize_report_async,
+)
+from src.agents.finance_agent import FINANCE_AGENT, run_finance_evaluation, run_finance_evaluation_async
+from src.agents.market_agent import MARKET_AGENT, run_market_evaluation, run_market_evaluation_async
+from src.agents.risk_agent import RISK_AGENT, run_risk_evaluation, run_risk_evaluation_async
+from src.agents.tech_agent import TECH_AGENT, run_tech_evaluation, run_tech_evaluation_async
+from src.agents.validator import VALIDATOR_AGENT
+from src.config import SPECIALIST_CONCURRENCY
+from src.event_sink import ConsoleSink, EventSink
+from src.events import FinalReport, StageFailed, StageFinished, StageSkipped, StageStarted, TokenDelta
+from src.state import AgentEvaluation, EvaluationState
 
-def run_pipeline(client: LlamaStackClient, startup_idea: str) -> EvaluationState:
+if TYPE_CHECKING:
+    # Checkpointing needs the optional 'cryptography' package; imported on use
+    from src.security.state_manager import Checkpointer
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+SpecialistFn = Callable[[LlamaStackClient, str], AgentEvaluation]
+AsyncSpecialistFn = Callable[[AsyncLlamaStackClient, str], Awaitable[AgentEvaluation]]
+# Progress callback: on_stage(stage, status) with status "started", "finished", "failed" or "skipped"
+StageCallback = Callable[[str, str], None]
+
+
+def _notify(on_stage: StageCallback | None, stage: str, status: str):
+    if on_stage is not None:
+        on_stage(stage, status)
+
+# Specialists in report order. Results are merged into the state in this
+# order no matter which specialist finishes first, so reports are reproducible.
+SPECIALISTS: list[tuple[str, SpecialistFn]] = [
+    ("Market", run_market_evaluation),
+    ("Tech", run_tech_evaluation),
+    ("Finance", run_finance_evaluation),
+    ("Risk", run_risk_evaluation),
+]
+
+# Every agent the pipelines use, for warming the agent pool at startup
+PIPELINE_AGENTS = [
+    BRIEF_AGENT,
+    MARKET_AGENT,
+    TECH_AGENT,
+    FINANCE_AGENT,
+    RISK_AGENT,
+    VALIDATOR_AGENT,
+    SYNTHESIS_AGENT,
+]
+
+ASYNC_SPECIALISTS: list[tuple[str, AsyncSpecialistFn]] = [
+    ("Market", run_market_evaluation_async),
+    ("Tech", run_tech_evaluation_async),
+    ("Finance", run_finance_evaluation_async),
+    ("Risk", run_risk_evaluation_async),
+]
+
+
+@dataclass
+class SpecialistOutcome:
+    """Result of one specialist run: an evaluation, the error that stopped it,
+    or ``skipped`` when early decision made running it pointless."""
+    name: str
+    evaluation: AgentEvaluation | None = None
+    error: str | None = None
+    skipped: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+        return self.evaluation is not None
+
+
+# Decides, from the outcomes finished so far, that the rest need not run
+StopCondition = Callable[[list[SpecialistOutcome]], bool]
+
+
+def decided_recommendation(scores: list[float], remaining: int) -> str | None:
+    """The recommendation if ``remaining`` unfinished specialists cannot change it, else None.
+
+    GO needs an average of at least GO_THRESHOLD over the specialists that
+    succeed. Each remaining one could still score anywhere from 0 to 10,
+    or fail and drop out of the average.
+    """
+    if not scores:
+        return None
+    total, count = sum(scores), len(scores)
+    best = max(total / count, (total + 10.0 * remaining) / (count + remaining))
+    worst = min(total / count, total / (count + remaining))
+    if best < GO_THRESHOLD:
+        return "NO-GO"
+    if worst >= GO_THRESHOLD:
+        return "GO"
+    return None
+
+
+def outcome_decided(total: int) -> StopCondition:
+    """Stop condition for early decision over ``total`` specialists."""
+    def decided(finished: list[SpecialistOutcome]) -> bool:
+        scores = [o.evaluation.score for o in finished if o.succeeded]
+        return decided_recommendation(scores, total - len(finished)) is not None
+    return decided
+
+
+def _run_specialist(
+    client: LlamaStackClient, name: str, run_fn: SpecialistFn, brief: str
+) -> SpecialistOutcome:
+    try:
+        return SpecialistOutcome(name=name, evaluation=run_fn(client, brief))
+    except Exception as e:
+        logger.exception("%s specialist failed", name)
+        return SpecialistOutcome(name=name, error=f"{type(e).__name__}: {e}")
+
+
+def run_specialists(
+    client: LlamaStackClient,
+    brief: str,
+    max_workers: int = SPECIALIST_CONCURRENCY,
+    specialists: list[tuple[str, SpecialistFn]] | None = None,
+    on_outcome: Callable[[SpecialistOutcome], None] | None = None,
+    stop_when: StopCondition | None = None,
+) -> list[SpecialistOutcome]:
+    """Run specialist evaluations concurrently on a bounded thread pool.
+
+    At most ``max_workers`` specialists are in flight at once. Outcomes are
+    returned in specialist order, not completion order, and a failing
+    specialist is captured in its outcome instead of raising.
+    ``on_outcome`` is called on the calling thread as each one finishes.
+
+    ``stop_when`` is checked as each specialist finishes; once it returns
+    True, queued specialists are cancelled and those still running are
+    abandoned (their turns finish in the background, unused). Both come
+    back as ``skipped`` outcomes.
+    """
+    if specialists is None:
+        specialists = SPECIALISTS
+    if not specialists:
+        return []
+    workers = max(1, min(max_workers, len(specialists)))
+    stopped = False
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="specialist")
+    try:
+        futures = [
+            pool.submit(_run_specialist, client, name, run_fn, brief)
+            for name, run_fn in specialists
+        ]
+        finished: dict[Future, SpecialistOutcome] = {}
+        for future in as_completed(futures):
+            outcome = finished[future] = future.result()
+            if on_outcome is not None:
+                on_outcome(outcome)
+            if stop_when is not None and len(finished) < len(futures) and stop_when(list(finished.values())):
+                stopped = True
+                break
+        return [
+            finished.get(future) or SpecialistOutcome(name=name, skipped=True)
+            for future, (name, _) in zip(futures, specialists)
+        ]
+    finally:
+        pool.shutdown(wait=not stopped, cancel_futures=stopped)
+
+
+async def _run_specialist_async(
+    client: AsyncLlamaStackClient,
+    name: str,
+    run_fn: AsyncSpecialistFn,
+    brief: str,
+    semaphore: asyncio.Semaphore,
+    on_stage: StageCallback | None = None,
+    on_outcome: Callable[[SpecialistOutcome], None] | None = None,
+) -> SpecialistOutcome:
+    stage = name.lower()
+    async with semaphore:
+        _notify(on_stage, stage, "started")
+        try:
+            outcome = SpecialistOutcome(name=name, evaluation=await run_fn(client, brief))
+        except Exception as e:
+            logger.exception("%s specialist failed", name)
+            _notify(on_stage, stage, "failed")
+            outcome = SpecialistOutcome(name=name, error=f"{type(e).__name__}: {e}")
+        else:
+            _notify(on_stage, stage, "finished")
+    if on_outcome is not None:
+        on_outcome(outcome)
+    return outcome
+
+
+async def run_specialists_async(
+    client: AsyncLlamaStackClient,
+    brief: str,
+    max_workers: int = SPECIALIST_CONCURRENCY,
+    specialists: list[tuple[str, AsyncSpecialistFn]] | None = None,
+    on_stage: StageCallback | None = None,
+    stop_when: StopCondition | None = None,
+    on_outcome: Callable[[SpecialistOutcome], None] | None = None,
+) -> list[SpecialistOutcome]:
+    """Async variant of run_specialists, running on the event loop.
+
+    Concurrency is capped by a semaphore rather than a thread pool; outcome
+    ordering and failure isolation match run_specialists, and
+    ``on_outcome`` is called as each one finishes. With ``stop_when``,
+    unfinished specialists are cancelled outright once it returns True
+    (reported to ``on_stage`` as "skipped").
+    """
+    specialists = specialists or ASYNC_SPECIALISTS
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    if stop_when is None:
+        return list(await asyncio.gather(*(
+            _run_specialist_async(client, name, run_fn, brief, semaphore, on_stage, on_outcome)
+            for name, run_fn in specialists
+        )))
+
+    tasks = [
+        asyncio.ensure_future(_run_specialist_async(client, name, run_fn, brief, semaphore, on_stage, on_outcome))
+        for name, run_fn in specialists
+    ]
+    finished: list[SpecialistOutcome] = []
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished.extend(task.result() for task in done)
+            if pending and stop_when(finished):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    outcomes = []
+    for task, (name, _) in zip(tasks, specialists):
+        if task.cancelled():
+            _notify(on_stage, name.lower(), "skipped")
+            outcomes.append(SpecialistOutcome(name=name, skipped=True))
+        else:
+            outcomes.append(task.result())
+    return outcomes
+
+
+def merge_outcomes(state: EvaluationState, outcomes: list[SpecialistOutcome]):
+    """Merge specialist outcomes into the state in the order given."""
+    for outcome in outcomes:
+        if outcome.succeeded:
+            state.add_evaluation(outcome.evaluation)
+        elif outcome.skipped:
+            state.add_skipped(outcome.name.lower())
+        else:
+            state.add_error(outcome.name.lower(), outcome.error or "unknown error")
+
+
+def require_evaluations(state: EvaluationState):
+    """Raise if no specialist produced an evaluation; a report needs at least one."""
+    if not state.evaluations:
+        raise RuntimeError(f"All specialist evaluations failed: {state.errors}")
+
+
+def pending_specialists(state: EvaluationState, specialists: list[tuple]) -> list[tuple]:
+    """Specialists with no evaluation in ``state`` yet, clearing any earlier failure.
+
+    Specialists skipped by an early decision stay skipped.
+    """
+    done = set(state.evaluations) | set(state.skipped)
+    pending = [(name, fn) for name, fn in specialists if name.lower() not in done]
+    for name, _ in pending:
+        state.errors.pop(name.lower(), None)
+    if pending:
+        # Any report on file was written without these, so it has to be redone
+        state.final_report = ""
+        state.recommendation = ""
+    return pending
+
+
+def order_evaluations(state: EvaluationState, specialists: list[tuple]):
+    """Put evaluations back in report order after a resumed run merged new ones."""
+    order = [name.lower() for name, _ in specialists]
+    state.evaluations = {
+        name: state.evaluations[name]
+        for name in sorted(state.evaluations, key=lambda n: order.index(n) if n in order else len(order))
+    }
+
+
+def _checkpoint(checkpointer: "Checkpointer | None", state: EvaluationState):
+    if checkpointer is not None:
+        checkpointer.save(state)
+
+
+def _report_and_checkpoint(
+    sink: EventSink, checkpointer: "Checkpointer | None", state: EvaluationState
+) -> Callable[[SpecialistOutcome], None]:
+    """Build an on_outcome callback that reports and checkpoints each specialist as it finishes."""
+    report = _report_outcome(sink)
+    if checkpointer is None:
+        return report
+    progress = copy.deepcopy(state)
+
+    def on_outcome(outcome: SpecialistOutcome):
+        report(outcome)
+        if outcome.succeeded:
+            progress.add_evaluation(outcome.evaluation)
+            checkpointer.save(progress)
+
+    return on_outcome
+
+
+def _emit_evaluation(sink: EventSink, evaluation: AgentEvaluation):
+    sink.emit(StageFinished(evaluation.agent_name, evaluation.analysis, evaluation.score))
+
+
+def _outcome_fixed(state: EvaluationState, remaining: int) -> bool:
+    scores = [e.score for e in state.evaluations.values()]
+    return decided_recommendation(scores, remaining) is not None
+
+
+def _early_stop(state: EvaluationState, pending: list[tuple]) -> StopCondition:
+    """outcome_decided, counting evaluations already in ``state`` (e.g. on resume)."""
+    done = [SpecialistOutcome(name=name, evaluation=e) for name, e in state.evaluations.items()]
+    decided = outcome_decided(len(done) + len(pending))
+    return lambda finished: decided(done + finished)
+
+
+def _skip_reason(state: EvaluationState) -> str:
+    return f"outcome already decided ({recommendation_for(state.average_score)})"
+
+
+def _report_outcome(sink: EventSink) -> Callable[[SpecialistOutcome], None]:
+    """on_outcome callback reporting each specialist to ``sink`` as it finishes."""
+    def report(outcome: SpecialistOutcome):
+        if outcome.succeeded:
+            _emit_evaluation(sink, outcome.evaluation)
+        else:
+            sink.emit(StageFailed(outcome.name.lower(), outcome.error or "unknown error"))
+    return report
+
+
+def _merge_reported(sink: EventSink, state: EvaluationState, outcomes: list[SpecialistOutcome]):
+    """Merge outcomes already reported by _report_outcome, reporting the skipped ones."""
+    merge_outcomes(state, outcomes)
+    for outcome in outcomes:
+        if outcome.skipped:
+            sink.emit(StageSkipped(outcome.name.lower(), _skip_reason(state)))
+    require_evaluations(state)
+
+
+@contextmanager
+def _token_stream(sink: EventSink, stage: str, enabled: bool):
+    """Stream the agent turns run inside the block, emitting their text as TokenDelta events."""
+    if not enabled:
+        yield
+        return
+    token = turn_deltas.set(lambda text: sink.emit(TokenDelta(stage, text)))
+    try:
+        yield
+    finally:
+        turn_deltas.reset(token)
+
+
+async def run_stage(sink: EventSink, stage: str, work: Awaitable[T], stream_tokens: bool = False) -> T:
+    """Await one stage's work, reporting a failure as StageFailed before it propagates.
+
+    With ``stream_tokens``, the stage's agent turns are streamed and their
+    text emitted as TokenDelta events.
+    """
+    with _token_stream(sink, stage, stream_tokens):
+        try:
+            return await work
+        except Exception as e:
+            sink.emit(StageFailed(stage, f"{type(e).__name__}: {e}"))
+            raise
+
+
+def _streaming(
+    sink: EventSink, specialists: list[tuple[str, AsyncSpecialistFn]], stream_tokens: bool
+) -> list[tuple[str, AsyncSpecialistFn]]:
+    """``specialists``, with their turns' text emitted as TokenDelta events when ``stream_tokens``."""
+    if not stream_tokens:
+        return specialists
+
+    def streamed(name: str, run_fn: AsyncSpecialistFn) -> AsyncSpecialistFn:
+        async def run(client: AsyncLlamaStackClient, brief: str) -> AgentEvaluation:
+            with _token_stream(sink, name.lower(), True):
+                return await run_fn(client, brief)
+        return run
+
+    return [(name, streamed(name, run_fn)) for name, run_fn in specialists]
+
+
+def run_pipeline(
+    client: LlamaStackClient,
+    startup_idea: str,
+    concurrent: bool = False,
+    max_workers: int = SPECIALIST_CONCURRENCY,
+    evaluation_id: str | None = None,
+    sink: EventSink | None = None,
+    early_decision: bool = False,
+) -> EvaluationState:
     """Run the full multi-agent evaluation pipeline.
 
     Flow:
     1. Coordinator creates structured brief
-    2. Four specialists evaluate in sequence (market, tech, finance, risk)
+    2. Four specialists evaluate (market, tech, finance, risk), in sequence
+       or, with ``concurrent=True``, fanned out across ``max_workers`` threads
     3. Coordinator synthesizes final report
+
+    In concurrent mode a failing specialist is recorded in ``state.errors``
+    and the report is synthesized from the remaining evaluations. The
+    pipeline only fails if every specialist fails.
+
+    With an ``evaluation_id``, the state is checkpointed after every stage
+    so an interrupted run can be picked up with ``resume(evaluation_id)``.
+
+    Progress goes to ``sink`` (default: ConsoleSink, the CLI output) as it
+    happens; in concurrent mode each specialist is reported as it finishes.
+
+    ``early_decision=True`` is for high-volume screening: as soon as the
+    specialists finished so far fix the recommendation (GO is out of reach
+    even if the rest score 10, or assured even if they score 0), the rest
+    are cancelled, listed in ``state.skipped``, and the synthesis is a
+    short screening summary.
+    """
+    state = EvaluationState(startup_idea=startup_idea)
+    return _run_stages(
+        client, state, concurrent, max_workers, evaluation_id, sink or ConsoleSink(), early_decision
+    )
+
+
+def _run_stages(
+    client: LlamaStackClient,
+    state: EvaluationState,
+    concurrent: bool,
+    max_workers: int,
+    evaluation_id: str | None,
+    sink: EventSink,
+    early_decision: bool = False,
+) -> EvaluationState:
+    """Run every stage whose result is not already in ``state``."""
+    checkpointer = None
+    if evaluation_id:
+        from src.security.state_manager import Checkpointer
+        checkpointer = Checkpointer(evaluation_id)
+    try:
+        # Step 1: Create brief
+        if not state.brief:
+            sink.emit(StageStarted("brief"))
+            create_brief(client, state)
+            sink.emit(StageFinished("brief", state.brief))
+            _checkpoint(checkpointer, state)
+
+        # Step 2: Run specialist evaluations
+        specialists = pending_specialists(state, SPECIALISTS)
+        if concurrent:
+            for name, _ in specialists:
+                sink.emit(StageStarted(name.lower()))
+            outcomes = run_specialists(
+                client, state.brief, max_workers=max_workers, specialists=specialists,
+                on_outcome=_report_and_checkpoint(sink, checkpointer, state),
+                stop_when=_early_stop(state, specialists) if early_decision else None,
+            )
+            _merge_reported(sink, state, outcomes)
+        else:
+            for i, (name, run_fn) in enumerate(specialists):
+                if early_decision and _outcome_fixed(state, len(specialists) - i):
+                    state.add_skipped(name.lower())
+                    sink.emit(StageStarted(name.lower()))
+                    sink.emit(StageSkipped(name.lower(), _skip_reason(state)))
+                    continue
+                sink.emit(StageStarted(name.lower()))
+                evaluation = run_fn(client, state.brief)
+                state.add_evaluation(evaluation)
+                _checkpoint(checkpointer, state)
+                _emit_evaluation(sink, evaluation)
+        order_evaluations(state, SPECIALISTS)
+        _checkpoint(checkpointer, state)
+
+        # Step 3: Synthesize final report
+        if not state.final_report:
+            sink.emit(StageStarted("synthesis"))
+            synthesize_report(client, state)
+            sink.emit(StageFinished("synthesis", state.final_report))
+            _checkpoint(checkpointer, state)
+        sink.emit(FinalReport(state))
+    finally:
+        if checkpointer is not None:
+            checkpointer.close()
+
+    return state
+
+
+def resume(
+    client: LlamaStackClient,
+    evaluation_id: str,
+    secure: bool = False,
+    concurrent: bool = False,
+    max_workers: int = SPECIALIST_CONCURRENCY,
+    use_llm_validator: bool = True,
+    sink: EventSink | None = None,
+    early_decision: bool = False,
+) -> EvaluationState:
+    """Resume a checkpointed run, skipping stages whose results were saved.
+
+    ``secure=True`` resumes a run_secure_pipeline checkpoint instead; its
+    checkpoints are keyed separately, so the two cannot be mixed up.
+    Raises FileNotFoundError if there is no checkpoint for the id.
+    """
+    if secure:
+        from src.pipeline_secure import resume_secure_pipeline
+        return resume_secure_pipeline(client, evaluation_id, use_llm_validator=use_llm_validator, sink=sink)
+
+    from src.security.state_manager import load_state
+
+    state = load_state(evaluation_id)
+    logger.info(
+        "Resuming %s: brief=%s, evaluations=%s, report=%s",
+        evaluation_id, bool(state.brief), list(state.evaluations), bool(state.final_report),
+    )
+    return _run_stages(
+        client, state, concurrent, max_workers, evaluation_id, sink or ConsoleSink(), early_decision
+    )
+
+
+async def run_pipeline_async(
+    client: AsyncLlamaStackClient,
+    startup_idea: str,
+    max_workers: int = SPECIALIST_CONCURRENCY,
+    on_stage: StageCallback | None = None,
+    sink: EventSink | None = None,
+    early_decision: bool = False,
+    stream_tokens: bool = False,
+) -> EvaluationState:
+    """Async-native variant of run_pipeline.
+
+    Every LlamaStack call is awaited on the event loop, so a single process
+    can hold many evaluations in flight without tying up a thread each.
+    Specialists always fan out concurrently, with the same ordering and
+    failure semantics as ``run_pipeline(concurrent=True)``.
+
+    ``on_stage`` is called as each stage (brief, each specialist,
+    synthesis) starts and finishes, for progress reporting; events go to
+    ``sink`` (default: ConsoleSink) as they happen, so the specialists'
+    events interleave. ``early_decision`` cancels specialists as in
+    run_pipeline. ``stream_tokens=True`` streams every agent turn and
+    emits its text as TokenDelta events while the stage runs.
     """
+    sink = sink or ConsoleSink()
     state = EvaluationState(startup_idea=startup_idea)
 
     # Step 1: Create brief
-    print("=" * 60)
-    print("[Coordinator] Creating evaluation brief...")
-    print("=" * 60)
-    create_brief(client, state)
-    print(state.brief)
-
-    # Step 2: Run specialist evaluations
-    specialists = [
-        ("Market", run_market_evaluation),
-        ("Tech", run_tech_evaluation),
-        ("Finance", run_finance_evaluation),
-        ("Risk", run_risk_evaluation),
-    ]
+    sink.emit(StageStarted("brief"))
+    _notify(on_stage, "brief", "started")
+    await run_stage(sink, "brief", create_brief_async(client, state), stream_tokens)
+    _notify(on_stage, "brief", "finished")
+    sink.emit(StageFinished("brief", state.brief))
 
-    for name, run_fn in specialists:
-        print(f"\n{'=' * 60}")
-        print(f"[{name} Agent] Evaluating...")
-        print("=" * 60)
-        evaluation = run_fn(client, state.brief)
-        state.add_evaluation(evaluation)
-        print(f"Score: {evaluation.score}/10")
-        print(evaluation.analysis[:500])
-        if len(evaluation.analysis) > 500:
-            print("...")
+    # Step 2: Run specialist evaluations, reported as each one finishes
+    for name, _ in ASYNC_SPECIALISTS:
+        sink.emit(StageStarted(name.lower()))
+    outcomes = await run_specialists_async(
+        client, state.brief, max_workers=max_workers,
+        specialists=_streaming(sink, ASYNC_SPECIALISTS, stream_tokens), on_stage=on_stage,
+        stop_when=outcome_decided(len(ASYNC_SPECIALISTS)) if early_decision else None,
+        on_outcome=_report_outcome(sink),
+    )
+    _merge_reported(sink, state, outcomes)
 
     # Step 3: Synthesize final report
-    print(f"\n{'=' * 60}")
-    print("[Coordinator] Synthesizing final report...")
-    print("=" * 60)
-    synthesize_report(client, state)
-    print(state.final_report)
-
-    # Summary
-    print(f"\n{'=' * 60}")
-    print("SUMMARY")
-    print("=" * 60)
-    for name, evaluation in state.evaluations.items():
-        print(f"  {name:>10}: {evaluation.score}/10")
-    print(f"  {'Average':>10}: {state.average_score:.1f}/10")
-    print(f"  Recommendation: {state.recommendation}")
+    sink.emit(StageStarted("synthesis"))
+    _notify(on_stage, "synthesis", "started")
+    await run_stage(sink, "synthesis", synthesize_report_async(client, state), stream_tokens)
+    _notify(on_stage, "synthesis", "finished")
+    sink.emit(StageFinished("synthesis", state.final_report))
+    sink.emit(FinalReport(state))
 
     return state
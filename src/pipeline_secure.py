@@ -1,18 +1,37 @@
 """Secure multi-agent evaluation pipeline with shield gates and validation."""
 
-from llama_stack_client import LlamaStackClient
-
-from src.agents.coordinator import create_brief, synthesize_report
-from src.agents.finance_agent import run_finance_evaluation
-from src.agents.market_agent import run_market_evaluation
-from src.agents.risk_agent import run_risk_evaluation
-from src.agents.tech_agent import run_tech_evaluation
-from src.agents.validator import validate_output, validate_score_consistency
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
+
+from src.agents.coordinator import (
+    create_brief,
+    create_brief_async,
+    synthesize_report,
+    synthesize_report_async,
+)
+from src.agents.validator import (
+    validate_output,
+    validate_output_async,
+    validate_score_consistency,
+)
+from src.event_sink import ConsoleSink, EventSink
+from src.events import FinalReport, GateResult, StageFinished, StageStarted
+from src.pipeline import ASYNC_SPECIALISTS, SPECIALISTS, order_evaluations, pending_specialists, run_stage
 from src.security.shield_gate import (
+    ShieldResult,
     ensure_shield_registered,
+    ensure_shield_registered_async,
     gate_agent_output,
+    gate_agent_output_async,
 )
-from src.state import EvaluationState
+from src.state import AgentEvaluation, EvaluationState
+
+# Key name for secure-pipeline checkpoints. A plain run_pipeline checkpoint
+# cannot be resumed here (and so skip the gates) because it is keyed differently.
+CHECKPOINT_AGENT = "secure-pipeline"
 
 
 class SecurityViolationError(Exception):
@@ -28,6 +47,8 @@ def run_secure_pipeline(
     client: LlamaStackClient,
     startup_idea: str,
     use_llm_validator: bool = True,
+    evaluation_id: str | None = None,
+    sink: EventSink | None = None,
 ) -> EvaluationState:
     """Run the evaluation pipeline with shield gates between agent handoffs.
 
@@ -36,80 +57,325 @@ def run_secure_pipeline(
     2. Heuristic score consistency check (fast, no LLM call)
     3. LLM-based semantic validation (optional, adds latency)
 
-    If any check fails, the pipeline raises SecurityViolationError.
+    The heuristic runs first (an output it fails gets no validator call).
+    The shield and validator calls on one output run concurrently, and
+    while they run the next specialist is already working; its progress
+    is reported after theirs. If any check fails, the pipeline raises
+    SecurityViolationError for that specialist, after cancelling its other
+    checks and the next specialist; an output is only added to the state
+    once it has passed every check.
+
+    With an ``evaluation_id``, the state is checkpointed after every stage
+    (only specialists that passed their gates are saved) so an interrupted
+    run can be picked up with ``resume_secure_pipeline``.
+
+    Progress, including each gate's result, goes to ``sink`` (default:
+    ConsoleSink, the CLI output).
+    """
+    state = EvaluationState(startup_idea=startup_idea)
+    return _run_secure_stages(client, state, use_llm_validator, evaluation_id, sink or ConsoleSink())
+
+
+def resume_secure_pipeline(
+    client: LlamaStackClient,
+    evaluation_id: str,
+    use_llm_validator: bool = True,
+    sink: EventSink | None = None,
+) -> EvaluationState:
+    """Resume a checkpointed run_secure_pipeline, skipping stages already saved.
+
+    The input is shield-checked again; it is cheap and the shield may have
+    been updated since the checkpoint was written.
+    """
+    from src.security.state_manager import load_state
+
+    state = load_state(evaluation_id, agent_name=CHECKPOINT_AGENT)
+    return _run_secure_stages(client, state, use_llm_validator, evaluation_id, sink or ConsoleSink())
+
+
+def _check_input(sink: EventSink, result: ShieldResult):
+    sink.emit(GateResult("user-input", "shield", result.passed, result.message))
+    if not result.passed:
+        raise SecurityViolationError("user-input", result.message or "Shield violation")
+
+
+# Verdict of one gate: (passed, message for the GateResult event, violation reason)
+Verdict = tuple[bool, str | None, str]
+
+
+def _shield_verdict(result: ShieldResult) -> Verdict:
+    return result.passed, result.message, result.message or "Shield violation"
+
+
+def _heuristic_verdict(evaluation: AgentEvaluation) -> Verdict:
+    ok, reason = validate_score_consistency(evaluation.analysis)
+    return ok, None if ok else reason, reason
+
+
+def _validator_verdict(verdict: tuple[bool, str]) -> Verdict:
+    valid, reason = verdict
+    return valid, None if valid else reason, reason
+
+
+class _Gates:
+    """One specialist's gate verdicts, arriving in any order.
+
+    Passed gates are emitted in the order shield, heuristic, validator (as
+    far as their verdicts are in), so the event stream does not depend on
+    which call finished first. The first failed verdict is emitted at once
+    and raises SecurityViolationError.
+    """
+
+    def __init__(self, sink: EventSink, name: str, evaluation: AgentEvaluation, gates: list[str]):
+        self.sink = sink
+        self.name = name
+        self.evaluation = evaluation
+        self.gates = gates
+        # Pure CPU, so known before any LLM gate is called
+        self.heuristic = _heuristic_verdict(evaluation)
+        self._verdicts: dict[str, Verdict] = {}
+        self._emitted = 0
+
+    def record(self, gate: str, verdict: Verdict):
+        passed, message, reason = verdict
+        self._verdicts[gate] = verdict
+        if not passed:
+            self.sink.emit(GateResult(self.name.lower(), gate, False, message))
+            raise SecurityViolationError(self.name, reason)
+        while self._emitted < len(self.gates) and self.gates[self._emitted] in self._verdicts:
+            done = self.gates[self._emitted]
+            self.sink.emit(GateResult(self.name.lower(), done, True, self._verdicts[done][1]))
+            self._emitted += 1
+
+
+def _gate_names(use_llm_validator: bool) -> list[str]:
+    return ["shield", "heuristic", "validator"] if use_llm_validator else ["shield", "heuristic"]
+
+
+def _validating(gates: _Gates, use_llm_validator: bool) -> bool:
+    # No validator call for an output the heuristic already failed
+    return use_llm_validator and gates.heuristic[0]
+
+
+def _start_gates(
+    pool: ThreadPoolExecutor,
+    client: LlamaStackClient,
+    gates: _Gates,
+    use_llm_validator: bool,
+) -> dict[Future, str]:
+    """Submit the shield and (optionally) LLM validator calls for one output."""
+    text = gates.evaluation.analysis
+    futures = {pool.submit(gate_agent_output, client, gates.name, text): "shield"}
+    if _validating(gates, use_llm_validator):
+        futures[pool.submit(validate_output, client, gates.name, text)] = "validator"
+    return futures
+
+
+def _settle_gates(gates: _Gates, futures: dict[Future, str], cancel: list[Future]):
+    """Wait for one output's gates; on the first violation cancel them and ``cancel``, then raise.
+
+    The heuristic verdict is recorded last, so when the shield also flags
+    the output, the shield violation is the one reported.
+    """
+    try:
+        for future in as_completed(futures):
+            gate = futures[future]
+            result = future.result()
+            gates.record(gate, _shield_verdict(result) if gate == "shield" else _validator_verdict(result))
+        gates.record("heuristic", gates.heuristic)
+    except BaseException:
+        for future in (*futures, *cancel):
+            future.cancel()
+        raise
+
+
+def _run_secure_stages(
+    client: LlamaStackClient,
+    state: EvaluationState,
+    use_llm_validator: bool,
+    evaluation_id: str | None,
+    sink: EventSink,
+) -> EvaluationState:
+    checkpointer = None
+    if evaluation_id:
+        from src.security.state_manager import Checkpointer
+        checkpointer = Checkpointer(evaluation_id, agent_name=CHECKPOINT_AGENT)
+    try:
+        # Register the prompt-guard shield
+        ensure_shield_registered(client)
+
+        # Step 1: Shield-check the input
+        _check_input(sink, gate_agent_output(client, "user-input", state.startup_idea))
+
+        # Step 2: Create brief
+        if not state.brief:
+            sink.emit(StageStarted("brief"))
+            create_brief(client, state)
+            sink.emit(StageFinished("brief", state.brief))
+            if checkpointer is not None:
+                checkpointer.save(state)
+
+        # Step 3: Run specialist evaluations with security gates
+        def passed(gates: _Gates):
+            state.add_evaluation(gates.evaluation)
+            sink.emit(StageFinished(gates.name.lower(), gates.evaluation.analysis, gates.evaluation.score))
+            if checkpointer is not None:
+                checkpointer.save(state)
+
+        _run_gated_specialists(client, state, use_llm_validator, sink, passed)
+        order_evaluations(state, SPECIALISTS)
+
+        # Step 4: Synthesize final report
+        if not state.final_report:
+            sink.emit(StageStarted("synthesis"))
+            synthesize_report(client, state)
+            sink.emit(StageFinished("synthesis", state.final_report))
+            if checkpointer is not None:
+                checkpointer.save(state)
+    finally:
+        if checkpointer is not None:
+            checkpointer.close()
+
+    sink.emit(FinalReport(state))
+    return state
+
+
+def _run_gated_specialists(
+    client: LlamaStackClient,
+    state: EvaluationState,
+    use_llm_validator: bool,
+    sink: EventSink,
+    on_passed: Callable[[_Gates], None],
+):
+    """Run the pending specialists one at a time, gating each output while the next one runs.
+
+    The heuristic check runs first; the gates of one output (shield and
+    LLM validator calls) then run concurrently with each other and with
+    the next specialist.
+    A specialist's evaluation reaches ``on_passed`` only once all its gates
+    passed, in report order. On the first violation the pending gates and
+    the next specialist are cancelled; a call already in flight cannot be
+    interrupted, so it finishes in the background and is discarded.
+    """
+    gate_names = _gate_names(use_llm_validator)
+    pool = ThreadPoolExecutor(max_workers=1 + len(gate_names), thread_name_prefix="secure")
+    awaiting: tuple[_Gates, dict[Future, str]] | None = None
+    try:
+        for name, run_fn in pending_specialists(state, SPECIALISTS):
+            sink.emit(StageStarted(name.lower()))
+            execution = pool.submit(run_fn, client, state.brief)
+            if awaiting is not None:
+                _settle_gates(*awaiting, cancel=[execution])
+                on_passed(awaiting[0])
+            gates = _Gates(sink, name, execution.result(), gate_names)
+            awaiting = gates, _start_gates(pool, client, gates, use_llm_validator)
+            if not gates.heuristic[0]:
+                # Fails whatever the shield says: raise before starting the next specialist
+                _settle_gates(*awaiting, cancel=[])
+        if awaiting is not None:
+            _settle_gates(*awaiting, cancel=[])
+            on_passed(awaiting[0])
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _settle_gates_async(gates: _Gates, tasks: dict[asyncio.Task, str], cancel: list[asyncio.Task]):
+    """Async variant of _settle_gates; cancelled tasks are awaited before raising."""
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                gate = tasks[task]
+                result = task.result()
+                gates.record(gate, _shield_verdict(result) if gate == "shield" else _validator_verdict(result))
+        gates.record("heuristic", gates.heuristic)
+    except BaseException:
+        for task in (*pending, *cancel):
+            task.cancel()
+        await asyncio.gather(*pending, *cancel, return_exceptions=True)
+        raise
+
+
+async def _run_gated_specialists_async(
+    client: AsyncLlamaStackClient,
+    state: EvaluationState,
+    use_llm_validator: bool,
+    sink: EventSink,
+    stream_tokens: bool = False,
+):
+    """Async variant of _run_gated_specialists; a violation cancels the calls in flight too."""
+    gate_names = _gate_names(use_llm_validator)
+    awaiting: tuple[_Gates, dict[asyncio.Task, str]] | None = None
+
+    def passed(gates: _Gates):
+        state.add_evaluation(gates.evaluation)
+        sink.emit(StageFinished(gates.name.lower(), gates.evaluation.analysis, gates.evaluation.score))
+
+    def start(gates: _Gates) -> dict[asyncio.Task, str]:
+        text = gates.evaluation.analysis
+        tasks = {asyncio.create_task(gate_agent_output_async(client, gates.name, text)): "shield"}
+        if _validating(gates, use_llm_validator):
+            tasks[asyncio.create_task(validate_output_async(client, gates.name, text))] = "validator"
+        return tasks
+
+    for name, run_fn in ASYNC_SPECIALISTS:
+        sink.emit(StageStarted(name.lower()))
+        execution = asyncio.create_task(
+            run_stage(sink, name.lower(), run_fn(client, state.brief), stream_tokens)
+        )
+        try:
+            if awaiting is not None:
+                await _settle_gates_async(*awaiting, cancel=[execution])
+                passed(awaiting[0])
+            evaluation = await execution
+        except asyncio.CancelledError:
+            execution.cancel()
+            raise
+        gates = _Gates(sink, name, evaluation, gate_names)
+        awaiting = gates, start(gates)
+        if not gates.heuristic[0]:
+            await _settle_gates_async(*awaiting, cancel=[])
+    if awaiting is not None:
+        await _settle_gates_async(*awaiting, cancel=[])
+        passed(awaiting[0])
+
+
+async def run_secure_pipeline_async(
+    client: AsyncLlamaStackClient,
+    startup_idea: str,
+    use_llm_validator: bool = True,
+    sink: EventSink | None = None,
+    stream_tokens: bool = False,
+) -> EvaluationState:
+    """Async-native variant of run_secure_pipeline.
+
+    Runs the same gates with the same overlap, as tasks on the event loop,
+    so a violation cancels the calls still in flight. Raises
+    SecurityViolationError on the first failure. ``stream_tokens`` is as
+    in run_pipeline_async; the gates' own turns are never streamed.
     """
+    sink = sink or ConsoleSink()
     state = EvaluationState(startup_idea=startup_idea)
 
     # Register the prompt-guard shield
-    ensure_shield_registered(client)
+    await ensure_shield_registered_async(client)
 
     # Step 1: Shield-check the input
-    print("=" * 60)
-    print("[Security] Checking input through shield gate...")
-    print("=" * 60)
-    input_result = gate_agent_output(client, "user-input", startup_idea)
-    if not input_result.passed:
-        raise SecurityViolationError("user-input", input_result.message or "Shield violation")
-    print("Input passed shield check")
+    _check_input(sink, await gate_agent_output_async(client, "user-input", startup_idea))
 
     # Step 2: Create brief
-    print(f"\n{'=' * 60}")
-    print("[Coordinator] Creating evaluation brief...")
-    print("=" * 60)
-    create_brief(client, state)
-    print(state.brief)
+    sink.emit(StageStarted("brief"))
+    await run_stage(sink, "brief", create_brief_async(client, state), stream_tokens)
+    sink.emit(StageFinished("brief", state.brief))
 
     # Step 3: Run specialist evaluations with security gates
-    specialists = [
-        ("Market", run_market_evaluation),
-        ("Tech", run_tech_evaluation),
-        ("Finance", run_finance_evaluation),
-        ("Risk", run_risk_evaluation),
-    ]
-
-    for name, run_fn in specialists:
-        print(f"\n{'=' * 60}")
-        print(f"[{name} Agent] Evaluating...")
-        print("=" * 60)
-        evaluation = run_fn(client, state.brief)
-
-        # Gate 1: Shield check
-        print(f"[Security] Shield gate on {name} output...")
-        shield_result = gate_agent_output(client, name, evaluation.analysis)
-        if not shield_result.passed:
-            raise SecurityViolationError(name, shield_result.message or "Shield violation")
-
-        # Gate 2: Heuristic score check
-        heuristic_ok, heuristic_reason = validate_score_consistency(evaluation.analysis)
-        if not heuristic_ok:
-            print(f"[Security] Heuristic warning: {heuristic_reason}")
-            raise SecurityViolationError(name, heuristic_reason)
-
-        # Gate 3: LLM validator (optional)
-        if use_llm_validator:
-            print(f"[Security] LLM validation of {name} output...")
-            valid, reason = validate_output(client, name, evaluation.analysis)
-            if not valid:
-                raise SecurityViolationError(name, reason)
-
-        print(f"[Security] {name} output passed all checks")
-        print(f"Score: {evaluation.score}/10")
-        state.add_evaluation(evaluation)
+    await _run_gated_specialists_async(client, state, use_llm_validator, sink, stream_tokens)
 
     # Step 4: Synthesize final report
-    print(f"\n{'=' * 60}")
-    print("[Coordinator] Synthesizing final report...")
-    print("=" * 60)
-    synthesize_report(client, state)
-    print(state.final_report)
-
-    # Summary
-    print(f"\n{'=' * 60}")
-    print("SUMMARY")
-    print("=" * 60)
-    for name, evaluation in state.evaluations.items():
-        print(f"  {name:>10}: {evaluation.score}/10")
-    print(f"  {'Average':>10}: {state.average_score:.1f}/10")
-    print(f"  Recommendation: {state.recommendation}")
+    sink.emit(StageStarted("synthesis"))
+    await run_stage(sink, "synthesis", synthesize_report_async(client, state), stream_tokens)
+    sink.emit(StageFinished("synthesis", state.final_report))
+    sink.emit(FinalReport(state))
 
     return state
@@ -0,0 +1,92 @@
+"""Streaming variant of the evaluation pipelines.
+
+``stream_pipeline`` runs run_pipeline_async (or, with ``secure=True``,
+run_secure_pipeline_async) with a sink that hands their events to an
+async iterator, so callers can show the brief and each specialist as
+soon as they are available instead of waiting for the final report:
+
+    async for event in stream_pipeline(client, idea):
+        if isinstance(event, TokenDelta):
+            print(event.text, end="")
+
+Agent turns are streamed, so ``TokenDelta`` events arrive while a stage
+is still generating. The last event is always ``FinalReport``; failures
+raise out of the iterator as they would from the non-streaming pipelines.
+"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable
+
+from llama_stack_client import AsyncLlamaStackClient
+
+from src.config import SPECIALIST_CONCURRENCY
+from src.event_sink import EventSink
+from src.events import PipelineEvent
+from src.pipeline import run_pipeline_async
+from src.pipeline_secure import run_secure_pipeline_async
+
+# Queue sentinel: the pipeline has finished (or raised)
+_DONE = object()
+
+
+class _QueueSink(EventSink):
+    """Puts events on the iterator's queue; the pipeline emits on the same event loop."""
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    def emit(self, event: PipelineEvent):
+        self.queue.put_nowait(event)
+
+
+async def _produce(run: Awaitable, queue: asyncio.Queue):
+    try:
+        await run
+    finally:
+        queue.put_nowait(_DONE)
+
+
+async def stream_pipeline(
+    client: AsyncLlamaStackClient,
+    startup_idea: str,
+    secure: bool = False,
+    use_llm_validator: bool = True,
+    max_workers: int = SPECIALIST_CONCURRENCY,
+    early_decision: bool = False,
+) -> AsyncIterator[PipelineEvent]:
+    """Run an evaluation, yielding progress events as they happen.
+
+    Specialists fan out concurrently (up to ``max_workers``), so their
+    events interleave; every event names its stage. ``early_decision``
+    cancels specialists as in run_pipeline_async. With ``secure=True``
+    the stages run behind the shield, heuristic and (unless
+    ``use_llm_validator`` is False) LLM validator gates of
+    run_secure_pipeline_async, a GateResult is yielded per gate, and
+    SecurityViolationError is raised on the first failure. Closing the
+    iterator early cancels the run.
+    """
+    if secure and early_decision:
+        raise ValueError("early_decision is not supported with secure=True")
+    queue: asyncio.Queue = asyncio.Queue()
+    sink = _QueueSink(queue)
+    if secure:
+        run = run_secure_pipeline_async(
+            client, startup_idea, use_llm_validator=use_llm_validator, sink=sink, stream_tokens=True
+        )
+    else:
+        run = run_pipeline_async(
+            client, startup_idea, max_workers=max_workers, sink=sink,
+            early_decision=early_decision, stream_tokens=True,
+        )
+    task = asyncio.create_task(_produce(run, queue))
+    try:
+        while (event := await queue.get()) is not _DONE:
+            yield event
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
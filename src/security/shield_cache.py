@@ -0,0 +1,115 @@
+"""Opt-in cache of shield verdicts.
+
+A verdict is keyed on (shield id, shield version, SHA-256 of the text),
+so identical briefs, repeated ideas and cached agent outputs are screened
+once. Bump SHIELD_VERSION whenever the shield's model or configuration
+changes: entries are tagged with the version they were made under, and on
+startup entries from any other version are dropped.
+
+Only passing verdicts are cached unless SHIELD_CACHE_VIOLATIONS is set, so
+a text that was blocked is always re-checked by default (a flaky or since
+fixed false positive does not stick).
+
+Enable with SHIELD_CACHE=memory (LRU only) or SHIELD_CACHE=disk (LRU + SQLite).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+from src.cache import LRUCache, SQLiteCache, TieredCache
+from src.config import (
+    SHIELD_CACHE,
+    SHIELD_CACHE_MAX_BYTES,
+    SHIELD_CACHE_MAX_ENTRIES,
+    SHIELD_CACHE_PATH,
+    SHIELD_CACHE_TTL,
+    SHIELD_CACHE_VIOLATIONS,
+    SHIELD_VERSION,
+)
+from src.security.shield_gate import ShieldResult
+
+logger = logging.getLogger(__name__)
+
+
+def verdict_cache_key(shield_id: str, version: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    return f"{shield_id}:{version}:{digest}"
+
+
+class ShieldVerdictCache:
+    """Tiered cache of ShieldResults, keyed by verdict_cache_key."""
+
+    def __init__(self, cache: TieredCache, version: str = SHIELD_VERSION, cache_violations: bool = False):
+        self.cache = cache
+        self.version = version
+        self.cache_violations = cache_violations
+        self.hits = 0
+        self.misses = 0
+        self.uncached_violations = 0
+        self._lock = threading.Lock()
+        dropped = cache.invalidate_tags({version})
+        if dropped:
+            logger.info("Dropped %d cached shield verdicts from other shield versions", dropped)
+
+    def get(self, shield_id: str, text: str) -> ShieldResult | None:
+        value = self.cache.get(verdict_cache_key(shield_id, self.version, text))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ShieldResult(**json.loads(value))
+
+    def put(self, shield_id: str, text: str, result: ShieldResult):
+        if not result.passed and not self.cache_violations:
+            with self._lock:
+                self.uncached_violations += 1
+            return
+        value = json.dumps({
+            "passed": result.passed,
+            "violation_level": result.violation_level,
+            "message": result.message,
+        })
+        self.cache.put(verdict_cache_key(shield_id, self.version, text), value, tag=self.version)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "uncached_violations": self.uncached_violations,
+            }
+        return {**stats, **self.cache.stats()}
+
+
+_shield_cache: ShieldVerdictCache | None = None
+_lock = threading.Lock()
+
+
+def build_shield_cache(mode: str = SHIELD_CACHE) -> ShieldVerdictCache | None:
+    """Build a ShieldVerdictCache for mode "memory" or "disk"; None when "off"."""
+    if mode == "off":
+        return None
+    memory = LRUCache(max_entries=SHIELD_CACHE_MAX_ENTRIES, max_bytes=SHIELD_CACHE_MAX_BYTES, ttl_seconds=SHIELD_CACHE_TTL)
+    if mode == "memory":
+        disk = None
+    elif mode == "disk":
+        disk = SQLiteCache(SHIELD_CACHE_PATH, max_bytes=SHIELD_CACHE_MAX_BYTES, ttl_seconds=SHIELD_CACHE_TTL)
+    else:
+        raise ValueError(f"Unknown SHIELD_CACHE mode: {mode!r}")
+    return ShieldVerdictCache(TieredCache(memory, disk), cache_violations=SHIELD_CACHE_VIOLATIONS)
+
+
+def get_shield_cache() -> ShieldVerdictCache | None:
+    """Return the process-wide shield verdict cache, or None if caching is off."""
+    global _shield_cache
+    if SHIELD_CACHE == "off":
+        return None
+    with _lock:
+        if _shield_cache is None:
+            _shield_cache = build_shield_cache()
+        return _shield_cache
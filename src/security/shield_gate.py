@@ -1,9 +1,18 @@
 """Shield gate — runs LlamaStack safety shields between agent handoffs."""
 
+import asyncio
 import logging
-from dataclasses import dataclass
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient, NotFoundError
+
+from src.config import SHIELD_CHUNK_CHARS, SHIELD_CHUNK_CONCURRENCY, SHIELD_CHUNK_OVERLAP
+from src.limiter import SHIELD, limited, limited_async
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +24,46 @@ class ShieldResult:
     passed: bool
     violation_level: str | None = None
     message: str | None = None
+    # For a chunked check, the [start, end) characters of the window that failed
+    span: tuple[int, int] | None = None
+
+
+# Shields each client has registered (or found registered) in this process,
+# so ensure_shield_registered costs a round trip once per shield, not per call
+_registered: "weakref.WeakKeyDictionary[object, set[str]]" = weakref.WeakKeyDictionary()
+_registered_lock = threading.Lock()
+
+
+def _is_registered(client, shield_id: str) -> bool:
+    with _registered_lock:
+        return shield_id in _registered.get(client, ())
+
+
+def _mark_registered(client, shield_id: str):
+    with _registered_lock:
+        _registered.setdefault(client, set()).add(shield_id)
+
+
+def invalidate_shield_registration(shield_id: str | None = None, client=None):
+    """Forget memoised registrations, so the next ensure_shield_registered checks the server again.
+
+    Call after a LlamaStack restart or a shield being unregistered; with no
+    arguments everything is forgotten. run_shield does this itself when the
+    server reports the shield unknown.
+    """
+    with _registered_lock:
+        clients = [client] if client is not None else list(_registered)
+        for c in clients:
+            if shield_id is None:
+                _registered.pop(c, None)
+            else:
+                _registered.get(c, set()).discard(shield_id)
 
 
 def ensure_shield_registered(client: LlamaStackClient, shield_id: str = PROMPT_GUARD_SHIELD_ID):
-    """Register the prompt-guard shield if not already registered."""
+    """Register the prompt-guard shield if not already registered (checked once per process)."""
+    if _is_registered(client, shield_id):
+        return
     try:
         client.shields.retrieve(shield_id)
         logger.info("Shield '%s' already registered", shield_id)
@@ -29,23 +74,29 @@ def ensure_shield_registered(client: LlamaStackClient, shield_id: str = PROMPT_G
             provider_id="llama-guard",
             provider_shield_id=shield_id,
         )
+    _mark_registered(client, shield_id)
 
 
-def run_shield(
-    client: LlamaStackClient,
-    text: str,
-    shield_id: str = PROMPT_GUARD_SHIELD_ID,
-) -> ShieldResult:
-    """Run a safety shield on text content.
+async def ensure_shield_registered_async(
+    client: AsyncLlamaStackClient, shield_id: str = PROMPT_GUARD_SHIELD_ID
+):
+    """Async variant of ensure_shield_registered."""
+    if _is_registered(client, shield_id):
+        return
+    try:
+        await client.shields.retrieve(shield_id)
+        logger.info("Shield '%s' already registered", shield_id)
+    except Exception:
+        logger.info("Registering shield '%s'", shield_id)
+        await client.shields.register(
+            shield_id=shield_id,
+            provider_id="llama-guard",
+            provider_shield_id=shield_id,
+        )
+    _mark_registered(client, shield_id)
 
-    Returns a ShieldResult indicating whether the content passed.
-    """
-    response = client.safety.run_shield(
-        shield_id=shield_id,
-        messages=[{"role": "user", "content": text}],
-        params={},
-    )
 
+def _shield_result(response, shield_id: str) -> ShieldResult:
     if response.violation is None:
         return ShieldResult(passed=True)
 
@@ -62,18 +113,240 @@ def run_shield(
     )
 
 
+@contextmanager
+def _forget_if_unknown(client, shield_id: str):
+    try:
+        yield
+    except NotFoundError:
+        invalidate_shield_registration(shield_id, client)
+        raise
+
+
+def _verdict_cache():
+    # Imported here: shield_cache builds on ShieldResult from this module
+    from src.security.shield_cache import get_shield_cache
+
+    return get_shield_cache()
+
+
+def run_shield(
+    client: LlamaStackClient,
+    text: str,
+    shield_id: str = PROMPT_GUARD_SHIELD_ID,
+) -> ShieldResult:
+    """Run a safety shield on text content.
+
+    Returns a ShieldResult indicating whether the content passed. When the
+    verdict cache is enabled (SHIELD_CACHE), text this shield has already
+    passed is answered from the cache without a server call.
+    """
+    cache = _verdict_cache()
+    if cache is not None:
+        cached = cache.get(shield_id, text)
+        if cached is not None:
+            return cached
+
+    with limited(SHIELD), _forget_if_unknown(client, shield_id):
+        response = client.safety.run_shield(
+            shield_id=shield_id,
+            messages=[{"role": "user", "content": text}],
+            params={},
+        )
+    result = _shield_result(response, shield_id)
+    if cache is not None:
+        cache.put(shield_id, text, result)
+    return result
+
+
+async def run_shield_async(
+    client: AsyncLlamaStackClient,
+    text: str,
+    shield_id: str = PROMPT_GUARD_SHIELD_ID,
+) -> ShieldResult:
+    """Async variant of run_shield; the verdict cache is read and written in a thread."""
+    cache = _verdict_cache()
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, shield_id, text)
+        if cached is not None:
+            return cached
+
+    async with limited_async(SHIELD):
+        with _forget_if_unknown(client, shield_id):
+            response = await client.safety.run_shield(
+                shield_id=shield_id,
+                messages=[{"role": "user", "content": text}],
+                params={},
+            )
+    result = _shield_result(response, shield_id)
+    if cache is not None:
+        await asyncio.to_thread(cache.put, shield_id, text, result)
+    return result
+
+
+def chunk_spans(length: int, size: int, overlap: int) -> list[tuple[int, int]]:
+    """[start, end) windows of at most ``size`` characters covering ``length``, each overlapping the next.
+
+    Any run of up to ``overlap + 1`` characters lies wholly inside some
+    window, so a phrase no longer than that is never split by a boundary.
+    """
+    if size <= overlap:
+        raise ValueError(f"Chunk size ({size}) must exceed the overlap ({overlap})")
+    if length <= size:
+        return [(0, length)]
+    stride = size - overlap
+    spans = [(start, start + size) for start in range(0, length - size, stride)]
+    spans.append((length - size, length))
+    return spans
+
+
+def _in_window(result: ShieldResult, span: tuple[int, int]) -> ShieldResult:
+    return result if result.passed else replace(result, span=span)
+
+
+# Threads for the windows of every synchronous chunked check in the process;
+# each check keeps at most its ``concurrency`` windows in flight on them
+_CHUNK_WORKERS = 16
+_chunk_pool: ThreadPoolExecutor | None = None
+_chunk_pool_lock = threading.Lock()
+
+
+def _get_chunk_pool() -> ThreadPoolExecutor:
+    global _chunk_pool
+    with _chunk_pool_lock:
+        if _chunk_pool is None:
+            _chunk_pool = ThreadPoolExecutor(max_workers=_CHUNK_WORKERS, thread_name_prefix="shield-chunk")
+        return _chunk_pool
+
+
+def run_shield_chunked(
+    client: LlamaStackClient,
+    text: str,
+    shield_id: str = PROMPT_GUARD_SHIELD_ID,
+    size: int = SHIELD_CHUNK_CHARS,
+    overlap: int = SHIELD_CHUNK_OVERLAP,
+    concurrency: int = SHIELD_CHUNK_CONCURRENCY,
+) -> ShieldResult:
+    """Run a shield over overlapping windows of ``text``, ``concurrency`` at a time.
+
+    Text that fits in one window is checked as a whole. Otherwise the
+    earliest window that fails is reported, with its position in ``text``
+    as the ``span``: once a window fails, only the windows before it are
+    still waited for, and the ones after it are never sent.
+    """
+    spans = chunk_spans(len(text), size, overlap)
+    if len(spans) == 1:
+        return run_shield(client, text, shield_id)
+
+    pool = _get_chunk_pool()
+    queued = deque(spans)
+    pending: dict = {}
+    violation: tuple[tuple[int, int], ShieldResult] | None = None  # earliest failing window so far
+    try:
+        while True:
+            while queued and violation is None and len(pending) < max(1, concurrency):
+                start, end = span = queued.popleft()
+                pending[pool.submit(run_shield, client, text[start:end], shield_id)] = span
+            earlier = [f for f, span in pending.items() if violation is None or span < violation[0]]
+            if not earlier:
+                break
+            done, _ = wait(earlier, return_when=FIRST_COMPLETED)
+            for future in done:
+                span = pending.pop(future)
+                result = future.result()
+                if not result.passed and (violation is None or span < violation[0]):
+                    violation = span, result
+    finally:
+        for future in pending:
+            future.cancel()
+    return _in_window(violation[1], violation[0]) if violation else ShieldResult(passed=True)
+
+
+async def run_shield_chunked_async(
+    client: AsyncLlamaStackClient,
+    text: str,
+    shield_id: str = PROMPT_GUARD_SHIELD_ID,
+    size: int = SHIELD_CHUNK_CHARS,
+    overlap: int = SHIELD_CHUNK_OVERLAP,
+    concurrency: int = SHIELD_CHUNK_CONCURRENCY,
+) -> ShieldResult:
+    """Async variant of run_shield_chunked; windows after a failing one are cancelled even in flight."""
+    spans = chunk_spans(len(text), size, overlap)
+    if len(spans) == 1:
+        return await run_shield_async(client, text, shield_id)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def check(start: int, end: int) -> ShieldResult:
+        async with semaphore:
+            return await run_shield_async(client, text[start:end], shield_id)
+
+    pending = {asyncio.create_task(check(*span)): span for span in spans}
+    violation: tuple[tuple[int, int], ShieldResult] | None = None
+    try:
+        while earlier := [t for t, span in pending.items() if violation is None or span < violation[0]]:
+            done, _ = await asyncio.wait(earlier, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                span = pending.pop(task)
+                result = task.result()
+                if not result.passed and (violation is None or span < violation[0]):
+                    violation = span, result
+            for task, span in pending.items():
+                if violation is not None and span > violation[0]:
+                    task.cancel()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return _in_window(violation[1], violation[0]) if violation else ShieldResult(passed=True)
+
+
+def _log_blocked(agent_name: str, shield_id: str, result: ShieldResult):
+    where = f" (characters {result.span[0]}-{result.span[1]})" if result.span else ""
+    logger.warning(
+        "GATE BLOCKED: %s output failed shield '%s'%s: %s",
+        agent_name, shield_id, where, result.message,
+    )
+
+
 def gate_agent_output(
     client: LlamaStackClient,
     agent_name: str,
     output: str,
     shield_id: str = PROMPT_GUARD_SHIELD_ID,
+    chunk_chars: int = SHIELD_CHUNK_CHARS,
 ) -> ShieldResult:
-    """Gate an agent's output through the shield before passing to the next agent."""
+    """Gate an agent's output through the shield before passing to the next agent.
+
+    With ``chunk_chars`` (SHIELD_CHUNK_CHARS), output longer than that is
+    checked in overlapping windows by run_shield_chunked.
+    """
     logger.info("Running shield gate on %s output", agent_name)
-    result = run_shield(client, output, shield_id)
+    if chunk_chars:
+        result = run_shield_chunked(
+            client, output, shield_id, size=chunk_chars, overlap=min(SHIELD_CHUNK_OVERLAP, chunk_chars // 2)
+        )
+    else:
+        result = run_shield(client, output, shield_id)
     if not result.passed:
-        logger.warning(
-            "GATE BLOCKED: %s output failed shield '%s': %s",
-            agent_name, shield_id, result.message,
+        _log_blocked(agent_name, shield_id, result)
+    return result
+
+
+async def gate_agent_output_async(
+    client: AsyncLlamaStackClient,
+    agent_name: str,
+    output: str,
+    shield_id: str = PROMPT_GUARD_SHIELD_ID,
+    chunk_chars: int = SHIELD_CHUNK_CHARS,
+) -> ShieldResult:
+    """Async variant of gate_agent_output."""
+    logger.info("Running shield gate on %s output", agent_name)
+    if chunk_chars:
+        result = await run_shield_chunked_async(
+            client, output, shield_id, size=chunk_chars, overlap=min(SHIELD_CHUNK_OVERLAP, chunk_chars // 2)
         )
+    else:
+        result = await run_shield_async(client, output, shield_id)
+    if not result.passed:
+        _log_blocked(agent_name, shield_id, result)
     return result
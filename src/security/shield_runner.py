@@ -1,11 +1,19 @@
 """Multi-shield runner — runs multiple LlamaStack shields and aggregates results."""
 
+import asyncio
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 
-from llama_stack_client import LlamaStackClient
+from llama_stack_client import AsyncLlamaStackClient, LlamaStackClient
 
-from src.security.shield_gate import ShieldResult, ensure_shield_registered, run_shield
+from src.security.shield_gate import (
+    ShieldResult,
+    ensure_shield_registered,
+    ensure_shield_registered_async,
+    run_shield,
+    run_shield_async,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,25 +28,19 @@ class MultiShieldResult:
         return {k: v for k, v in self.results.items() if not v.passed}
 
 
-def run_shields(
-    client: LlamaStackClient,
-    text: str,
-    shield_ids: list[str],
-) -> MultiShieldResult:
-    """Run multiple shields on the same text and aggregate results.
+def _check(client: LlamaStackClient, text: str, shield_id: str) -> ShieldResult:
+    ensure_shield_registered(client, shield_id)
+    return run_shield(client, text, shield_id)
+
+
+async def _check_async(client: AsyncLlamaStackClient, text: str, shield_id: str) -> ShieldResult:
+    await ensure_shield_registered_async(client, shield_id)
+    return await run_shield_async(client, text, shield_id)
 
-    All shields are run regardless of individual failures, so the caller
-    gets the full picture of all violations.
-    """
-    results = {}
-    all_passed = True
 
-    for shield_id in shield_ids:
-        ensure_shield_registered(client, shield_id)
-        result = run_shield(client, text, shield_id)
-        results[shield_id] = result
-        if not result.passed:
-            all_passed = False
+def _aggregate(shield_ids: list[str], finished: dict[str, ShieldResult]) -> MultiShieldResult:
+    results = {shield_id: finished[shield_id] for shield_id in shield_ids if shield_id in finished}
+    all_passed = all(r.passed for r in results.values())
 
     if not all_passed:
         violations = {k: v for k, v in results.items() if not v.passed}
@@ -50,16 +52,73 @@ def run_shields(
     return MultiShieldResult(passed=all_passed, results=results)
 
 
+def run_shields(
+    client: LlamaStackClient,
+    text: str,
+    shield_ids: list[str],
+    fail_fast: bool = False,
+) -> MultiShieldResult:
+    """Run multiple shields on the same text and aggregate results.
+
+    The shields run concurrently. By default all of them are run
+    regardless of individual failures, so the caller gets the full picture
+    of all violations. With ``fail_fast``, the first violation cancels the
+    shields still pending and ``results`` holds only those that finished.
+    """
+    shield_ids = list(dict.fromkeys(shield_ids))
+    if len(shield_ids) <= 1:
+        return _aggregate(shield_ids, {s: _check(client, text, s) for s in shield_ids})
+
+    finished: dict[str, ShieldResult] = {}
+    pool = ThreadPoolExecutor(max_workers=len(shield_ids), thread_name_prefix="shield")
+    try:
+        pending = {pool.submit(_check, client, text, shield_id): shield_id for shield_id in shield_ids}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+            if fail_fast and any(not r.passed for r in finished.values()):
+                break
+    finally:
+        # A shield call already in flight cannot be interrupted; its result is dropped
+        pool.shutdown(wait=False, cancel_futures=True)
+    return _aggregate(shield_ids, finished)
+
+
+async def run_shields_async(
+    client: AsyncLlamaStackClient,
+    text: str,
+    shield_ids: list[str],
+    fail_fast: bool = False,
+) -> MultiShieldResult:
+    """Async variant of run_shields; with ``fail_fast`` the pending calls are cancelled outright."""
+    shield_ids = list(dict.fromkeys(shield_ids))
+    finished: dict[str, ShieldResult] = {}
+    pending = {asyncio.create_task(_check_async(client, text, shield_id)): shield_id for shield_id in shield_ids}
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finished[pending.pop(task)] = task.result()
+            if fail_fast and any(not r.passed for r in finished.values()):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return _aggregate(shield_ids, finished)
+
+
 # Predefined shield sets for common use cases
 INPUT_SHIELDS = ["prompt-guard"]
 OUTPUT_SHIELDS = ["prompt-guard"]
 
 
-def run_input_shields(client: LlamaStackClient, text: str) -> MultiShieldResult:
+def run_input_shields(client: LlamaStackClient, text: str, fail_fast: bool = False) -> MultiShieldResult:
     """Run all input-boundary shields."""
-    return run_shields(client, text, INPUT_SHIELDS)
+    return run_shields(client, text, INPUT_SHIELDS, fail_fast)
 
 
-def run_output_shields(client: LlamaStackClient, text: str) -> MultiShieldResult:
+def run_output_shields(client: LlamaStackClient, text: str, fail_fast: bool = False) -> MultiShieldResult:
     """Run all output-boundary shields."""
-    return run_shields(client, text, OUTPUT_SHIELDS)
+    return run_shields(client, text, OUTPUT_SHIELDS, fail_fast)
@@ -1,7 +1,10 @@
 """Encrypted state persistence with per-agent isolation."""
 
+import copy
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from pathlib import Path
 
@@ -27,6 +30,8 @@ def _state_to_dict(state: EvaluationState) -> dict:
         },
         "final_report": state.final_report,
         "recommendation": state.recommendation,
+        "errors": dict(state.errors),
+        "skipped": list(state.skipped),
     }
 
 
@@ -38,6 +43,10 @@ def _dict_to_state(data: dict) -> EvaluationState:
     state.recommendation = data.get("recommendation", "")
     for name, ev_data in data.get("evaluations", {}).items():
         state.add_evaluation(AgentEvaluation(**ev_data))
+    for name, reason in data.get("errors", {}).items():
+        state.add_error(name, reason)
+    for name in data.get("skipped", []):
+        state.add_skipped(name)
     return state
 
 
@@ -98,3 +107,45 @@ def list_saved_evaluations() -> list[str]:
     if not STATE_DIR.exists():
         return []
     return [p.stem for p in STATE_DIR.glob("*.enc")]
+
+
+class Checkpointer:
+    """Write-behind checkpoints of a running evaluation through save_state.
+
+    ``save`` snapshots the state and returns immediately; a single
+    background thread encrypts and writes it. If several checkpoints are
+    queued before the writer gets to them, only the latest is written.
+    Write failures are logged, never raised: a lost checkpoint only costs
+    a re-run of that stage on resume.
+    """
+
+    def __init__(self, evaluation_id: str, agent_name: str = "pipeline"):
+        self.evaluation_id = evaluation_id
+        self.agent_name = agent_name
+        self.writes = 0
+        self._pending: EvaluationState | None = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+
+    def save(self, state: EvaluationState):
+        snapshot = copy.deepcopy(state)
+        with self._lock:
+            scheduled = self._pending is not None
+            self._pending = snapshot
+        if not scheduled:
+            self._executor.submit(self._write)
+
+    def _write(self):
+        with self._lock:
+            state, self._pending = self._pending, None
+        if state is None:
+            return
+        try:
+            save_state(state, self.evaluation_id, self.agent_name)
+            self.writes += 1
+        except Exception:
+            logger.warning("Checkpoint write failed for %s", self.evaluation_id, exc_info=True)
+
+    def close(self):
+        """Wait for queued checkpoints to be written."""
+        self._executor.shutdown(wait=True)
@@ -20,10 +20,19 @@ class EvaluationState:
     evaluations: dict[str, AgentEvaluation] = field(default_factory=dict)
     final_report: str = ""
     recommendation: str = ""  # GO or NO-GO
+    errors: dict[str, str] = field(default_factory=dict)  # agent_name -> failure reason
+    skipped: list[str] = field(default_factory=list)  # agents not run: outcome already decided
 
     def add_evaluation(self, eval: AgentEvaluation):
         self.evaluations[eval.agent_name] = eval
 
+    def add_error(self, agent_name: str, reason: str):
+        self.errors[agent_name] = reason
+
+    def add_skipped(self, agent_name: str):
+        if agent_name not in self.skipped:
+            self.skipped.append(agent_name)
+
     @property
     def average_score(self) -> float:
         if not self.evaluations:
@@ -0,0 +1,179 @@
+"""Tests for agent infrastructure: agent/session pooling."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from src.agents.pool import AgentPool, AgentSpec, AsyncAgentPool
+
+
+class _FakeAgent:
+    def __init__(self):
+        self.agent_id = "agent-1"
+        self.sessions = []  # as on llama_stack_client's Agent
+        self.created = 0
+
+    def create_session(self, name):
+        self.created += 1
+        self.sessions.append(f"{name}-{self.created}")
+        return self.sessions[-1]
+
+
+def _session_client(deleted: list):
+    """A client whose only endpoint records session deletes."""
+    def delete(session_id, agent_id):
+        deleted.append(session_id)
+    return SimpleNamespace(agents=SimpleNamespace(session=SimpleNamespace(delete=delete)))
+
+
+def _async_session_client(deleted: list):
+    async def delete(session_id, agent_id):
+        deleted.append(session_id)
+    return SimpleNamespace(agents=SimpleNamespace(session=SimpleNamespace(delete=delete)))
+
+
+class _FakeAsyncAgent(_FakeAgent):
+    async def initialize(self):
+        pass
+
+    async def create_session(self, name):
+        return _FakeAgent.create_session(self, name)
+
+
+def _counting_factory(agent_cls):
+    created = []
+
+    def factory(client, model, instructions, tools):
+        agent = agent_cls()
+        created.append(agent)
+        return agent
+    return factory, created
+
+
+SPEC = AgentSpec(model="m", instructions="be brief", session_name="eval")
+
+
+class TestAgentPool:
+    def test_agent_reused_per_spec(self):
+        factory, created = _counting_factory(_FakeAgent)
+        pool = AgentPool(None, agent_factory=factory, prewarm=0)
+        with pool.lease(SPEC) as (agent_a, _):
+            pass
+        with pool.lease(SPEC) as (agent_b, _):
+            pass
+        with pool.lease(AgentSpec(model="m", instructions="other")):
+            pass
+        assert agent_a is agent_b
+        assert len(created) == 2
+        pool.close()
+
+    def test_sessions_single_use_by_default(self):
+        factory, _ = _counting_factory(_FakeAgent)
+        pool = AgentPool(None, agent_factory=factory, prewarm=0, session_max_uses=1)
+        with pool.lease(SPEC) as (_, first):
+            pass
+        with pool.lease(SPEC) as (_, second):
+            pass
+        assert first != second
+        pool.close()
+
+    def test_background_prewarm(self):
+        factory, _ = _counting_factory(_FakeAgent)
+        pool = AgentPool(None, agent_factory=factory, prewarm=1)
+        pool.warm([SPEC])
+        deadline = time.monotonic() + 1
+        while pool.snapshot()["idle_sessions"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with pool.lease(SPEC):
+            pass
+        assert pool.stats.session_hits == 1
+        pool.close()
+
+    def test_expired_sessions_discarded(self):
+        factory, _ = _counting_factory(_FakeAgent)
+        pool = AgentPool(None, agent_factory=factory, prewarm=0,
+                         session_max_uses=10, session_max_age=0.0)
+        with pool.lease(SPEC):
+            pass
+        with pool.lease(SPEC):
+            pass
+        assert pool.stats.session_hits == 0
+        pool.close()
+
+
+    def test_retired_sessions_are_forgotten_and_deleted(self):
+        factory, created = _counting_factory(_FakeAgent)
+        deleted = []
+        pool = AgentPool(_session_client(deleted), agent_factory=factory, prewarm=0)
+        for _ in range(20):
+            with pool.lease(SPEC):
+                pass
+        pool._executor.shutdown(wait=True)
+        assert created[0].sessions == [] and len(deleted) == 20
+        assert pool.snapshot()["sessions_retired"] == 20
+
+    def test_unwarmed_pool_creates_sessions_on_demand_only(self):
+        factory, created = _counting_factory(_FakeAgent)
+        pool = AgentPool(None, agent_factory=factory, prewarm=2)
+        with pool.lease(SPEC):
+            pass
+        pool.close()
+        assert created[0].created == 1
+        assert pool.snapshot()["idle_sessions"] == 0
+
+    def test_agent_creation_does_not_block_other_specs(self):
+        entered, release = threading.Event(), threading.Event()
+        created = []
+
+        def factory(client, model, instructions, tools):
+            if instructions == "slow":
+                entered.set()
+                release.wait(5)
+            created.append(instructions)
+            return _FakeAgent()
+
+        pool = AgentPool(None, agent_factory=factory, prewarm=0)
+        slow = threading.Thread(target=lambda: pool.lease(AgentSpec(model="m", instructions="slow")).__enter__())
+        slow.start()
+        assert entered.wait(5)
+        with pool.lease(SPEC):
+            assert created == ["be brief"]
+        release.set()
+        slow.join()
+        assert created == ["be brief", "slow"]
+        pool.close()
+
+
+class TestAsyncAgentPool:
+    def test_reuse_and_prewarm(self):
+        factory, created = _counting_factory(_FakeAsyncAgent)
+
+        async def scenario():
+            pool = AsyncAgentPool(None, agent_factory=factory, prewarm=1)
+            await pool.warm([SPEC])
+            await asyncio.sleep(0)
+            async with pool.lease(SPEC) as (agent, session):
+                pass
+            await pool.close()
+            return pool
+
+        pool = asyncio.run(scenario())
+        assert len(created) == 1
+        assert pool.stats.session_hits == 1
+
+    def test_retired_sessions_are_forgotten_and_deleted(self):
+        factory, created = _counting_factory(_FakeAsyncAgent)
+        deleted = []
+
+        async def scenario():
+            pool = AsyncAgentPool(_async_session_client(deleted), agent_factory=factory, prewarm=0,
+                                  session_max_uses=10, session_max_age=0.0)
+            for _ in range(20):
+                async with pool.lease(SPEC):
+                    pass
+            await asyncio.sleep(0)
+            await pool.close()
+
+        asyncio.run(scenario())
+        assert created[0].sessions == [] and len(deleted) == 20
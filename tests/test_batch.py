@@ -0,0 +1,168 @@
+"""Tests for batch evaluation: input parsing, resume, error isolation, bounded concurrency, CLI."""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from src.batch import cli
+from src.batch.runner import (
+    FAILED,
+    SUCCEEDED,
+    BatchProgress,
+    ProgressDisplay,
+    completed_ids,
+    idea_id,
+    read_ideas,
+    run_batch,
+)
+from src.fakestack.transport import fake_client
+from src.state import AgentEvaluation, EvaluationState
+
+
+def _evaluate(client, idea):
+    if "explode" in idea:
+        raise ConnectionError("backend died")
+    state = EvaluationState(startup_idea=idea, final_report="report", recommendation="GO")
+    state.add_evaluation(AgentEvaluation(agent_name="market", score=7.0))
+    return state
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return path
+
+
+def _results(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestReadIdeas:
+    def test_jsonl_objects_and_strings(self, tmp_path):
+        path = tmp_path / "ideas.jsonl"
+        path.write_text('{"idea": "Vertical farms", "id": "a1"}\n\n"Drone delivery"\n{oops\n{"id": "x"}\n')
+        items = list(read_ideas(path))
+        assert [(i.id, i.line) for i in items[:2]] == [("a1", 1), (idea_id("Drone delivery"), 3)]
+        assert items[2].error.startswith("invalid JSON") and items[2].id == "line-4"
+        assert items[3].error == "missing idea" and items[3].id == "x"
+
+    def test_csv_with_and_without_ids(self, tmp_path):
+        path = tmp_path / "ideas.csv"
+        path.write_text('idea,id\n"Vertical farms, in cities",v1\nDrone delivery,\n')
+        items = list(read_ideas(path))
+        assert [(i.idea, i.id, i.line) for i in items] == [
+            ("Vertical farms, in cities", "v1", 2),
+            ("Drone delivery", idea_id("Drone delivery"), 3),
+        ]
+
+    def test_csv_needs_idea_column(self, tmp_path):
+        path = tmp_path / "ideas.csv"
+        path.write_text("name\nfoo\n")
+        with pytest.raises(ValueError, match="idea"):
+            list(read_ideas(path))
+
+    def test_id_ignores_case_and_spacing(self):
+        assert idea_id("Drone  Delivery ") == idea_id("drone delivery")
+
+
+class TestRunBatch:
+    def test_failures_are_isolated(self, tmp_path):
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [
+            {"idea": "Vertical farms"}, {"idea": "please explode"}, {"idea": "Drone delivery"},
+        ])
+        out = tmp_path / "out" / "results.jsonl"
+        progress = run_batch(None, ideas, out, concurrency=2, evaluate=_evaluate)
+        assert (progress.succeeded, progress.failed) == (2, 1)
+        records = {r["idea"]: r for r in _results(out)}
+        assert records["please explode"]["status"] == FAILED
+        assert "ConnectionError" in records["please explode"]["error"]
+        assert records["Vertical farms"]["scores"] == {"market": 7.0}
+
+    def test_resume_skips_succeeded_and_retries_failed(self, tmp_path):
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [{"idea": "Vertical farms"}, {"idea": "please explode"}])
+        out = tmp_path / "results.jsonl"
+        run_batch(None, ideas, out, evaluate=_evaluate)
+
+        calls = []
+
+        def recovered(client, idea):
+            calls.append(idea)
+            return _evaluate(client, idea.replace("explode", "work"))
+
+        progress = run_batch(None, ideas, out, evaluate=recovered)
+        assert calls == ["please explode"]
+        assert (progress.skipped, progress.succeeded) == (1, 1)
+        assert len(completed_ids(out)) == 2
+
+    def test_duplicates_and_truncated_output(self, tmp_path):
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [{"idea": "Vertical farms"}, {"idea": "vertical  FARMS"}])
+        out = tmp_path / "results.jsonl"
+        out.write_text('{"id": "zz", "status": "succ')  # an interrupted run's last write
+        progress = run_batch(None, ideas, out, evaluate=_evaluate)
+        assert (progress.succeeded, progress.skipped) == (1, 1)
+        lines = out.read_text().splitlines()
+        assert len(lines) == 2 and json.loads(lines[1])["status"] == SUCCEEDED
+
+    def test_in_flight_is_bounded(self, tmp_path):
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [{"idea": f"idea {i}"} for i in range(12)])
+        in_flight = peak = 0
+        lock = threading.Lock()
+
+        def tracked(client, idea):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return _evaluate(client, idea)
+
+        progress = run_batch(None, ideas, tmp_path / "results.jsonl", concurrency=3, evaluate=tracked)
+        assert progress.succeeded == 12
+        assert peak <= 3
+
+    def test_real_pipeline_on_fake_backend(self, tmp_path):
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [{"idea": "An AI platform for indoor farming"}])
+        out = tmp_path / "results.jsonl"
+        run_batch(fake_client(), ideas, out, concurrency=1)
+        [record] = _results(out)
+        assert record["status"] == SUCCEEDED
+        assert record["recommendation"] in ("GO", "NO-GO")
+        assert set(record["scores"]) == {"market", "tech", "finance", "risk"}
+
+
+class TestProgress:
+    def test_eta_from_throughput(self):
+        progress = BatchProgress(total=10, succeeded=2, skipped=4, started=time.monotonic() - 60)
+        assert progress.throughput() == pytest.approx(2.0, rel=0.01)
+        assert progress.eta_seconds() == pytest.approx(120.0, rel=0.01)
+        assert progress.line().startswith("6/10 done (2 ok, 0 failed, 4 skipped)")
+
+    def test_non_tty_display_is_throttled(self):
+        stream = io.StringIO()
+        display = ProgressDisplay(stream, interval=60)
+        progress = BatchProgress(total=2)
+        display.update(progress)
+        display.update(progress)
+        display.update(progress, final=True)
+        assert len(stream.getvalue().splitlines()) == 2
+
+
+class TestCli:
+    def test_runs_and_resumes(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr("src.client.get_client", lambda: None)
+        monkeypatch.setattr(cli, "_evaluator", lambda args: _evaluate)
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [{"idea": "Vertical farms"}])
+        out = tmp_path / "results.jsonl"
+        assert cli.main([str(ideas), "--out", str(out), "--concurrency", "2"]) == 0
+        assert cli.main([str(ideas), "--out", str(out)]) == 0
+        assert len(_results(out)) == 1
+        assert "1/1 done (0 ok, 0 failed, 1 skipped)" in capsys.readouterr().err
+
+    def test_rejects_secure_with_early_decision(self, tmp_path):
+        ideas = _write_jsonl(tmp_path / "ideas.jsonl", [])
+        with pytest.raises(SystemExit):
+            cli.main([str(ideas), "--out", str(tmp_path / "r.jsonl"), "--secure", "--early-decision"])
@@ -0,0 +1,71 @@
+"""Tests for the benchmark suite: percentiles, regression checks, stage timing, runs."""
+
+import time
+
+import pytest
+
+from src.bench.report import compare, percentile, summarise
+from src.bench.runner import fake_backend, run_benchmarks
+from src.bench.timing import StageTimings, TimingSink
+from src.events import GateResult, StageFailed, StageFinished, StageSkipped, StageStarted
+from src.gateway import server
+
+
+def _results(throughput: float, p95_ms: float) -> dict:
+    return {"scenarios": {"pipeline": {"4": {
+        "throughput_per_s": throughput,
+        "stages": {"brief": {"p95_ms": p95_ms}},
+    }}}}
+
+
+class TestReport:
+    def test_percentile_interpolates(self):
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == pytest.approx(2.5)
+        assert percentile([5.0], 99) == 5.0
+        assert percentile([], 50) == 0.0
+
+    def test_summarise_in_ms(self):
+        summary = summarise([0.1, 0.2, 0.3])
+        assert summary["count"] == 3
+        assert summary["p50_ms"] == pytest.approx(200.0)
+
+    def test_compare_flags_regressions(self):
+        regressions = compare(_results(5.0, 130.0), _results(10.0, 100.0), threshold=0.1)
+        assert {r.metric for r in regressions} == {"throughput_per_s", "brief p95_ms"}
+
+    def test_compare_within_threshold(self):
+        assert compare(_results(9.5, 105.0), _results(10.0, 100.0), threshold=0.1) == []
+
+
+class TestTimingSink:
+    def test_times_stages_from_their_events(self):
+        timings = StageTimings()
+        sink = TimingSink(timings)
+        sink.emit(GateResult("user-input", "shield", True))
+        for stage in ("market", "tech", "risk"):
+            sink.emit(StageStarted(stage))
+        time.sleep(0.02)
+        sink.emit(StageFinished("tech", "fine", 6.0))
+        sink.emit(StageFailed("market", "TimeoutError"))
+        sink.emit(StageSkipped("risk", "outcome already decided (NO-GO)"))
+        samples = timings.samples()
+        assert set(samples) == {"shield:user-input", "market", "tech"}
+        assert samples["tech"][0] >= 0.02
+
+
+class TestRunBenchmarks:
+    @pytest.mark.parametrize("scenario", ["pipeline-concurrent", "secure", "gateway"])
+    def test_scenario_reports_stages(self, scenario):
+        results = run_benchmarks(fake_backend(), [scenario], levels=[2], iterations=2, scoring=False)
+        level = results["scenarios"][scenario]["2"]
+        assert level["completed"] == 2 and level["failed"] == 0
+        assert {"total", "brief", "market", "synthesis"} <= set(level["stages"])
+        assert all(stage["count"] == 2 for stage in level["stages"].values())
+        if scenario == "secure":
+            assert "shield:user-input" in level["stages"]
+
+    def test_gateway_leaves_the_server_alone(self):
+        before = server.client, server.store, server.event_sink
+        run_benchmarks(fake_backend(), ["gateway"], levels=[1], iterations=1, scoring=False)
+        assert (server.client, server.store, server.event_sink) == before
+        assert server.gateway_context.get() is None
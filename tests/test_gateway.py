@@ -1,12 +1,38 @@
-"""Tests for Phase 7: Gateway — rate limiter, schemas, state, extract_score."""
+"""Tests for Phase 7: Gateway — rate limiter, schemas, job pool, job queue + workers, store, coalescing, model scheduling, shared client, load balancing, adaptive limits, state, extract_score, streaming, server wiring."""
 
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
 import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 import pytest
 from pydantic import ValidationError
 
+import httpx
+from llama_stack_client import APIConnectionError, AsyncLlamaStackClient, LlamaStackClient
+
+from src import client as client_module
+from src.agents.base import create_agent
+from src.balancer import AsyncBalancingTransport, Balancer, BalancingTransport
+from src.event_sink import NullSink
+from src.fakestack.backend import FakeLlamaStack
+from src.fakestack.transport import FakeTransport
+from src.pipeline import run_pipeline, run_pipeline_async
+from src.security.shield_gate import ensure_shield_registered
+from src.gateway.coalesce import SingleFlight, coalesce_key
+from src.gateway.job_queue import SQLiteJobQueue
+from src.gateway.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobPool, QueueFullError
+from src.gateway.model_scheduler import ModelScheduler
 from src.gateway.rate_limiter import TokenBucket
-from src.gateway.schemas import EvaluateRequest, evaluation_response_from_state
+from src.gateway.schemas import EvaluateRequest, EvaluationResponse, JobStats, evaluation_response_from_state
+from src.gateway.worker import Worker
+from src.limiter import AdaptiveLimiter, OverloadedError
+from src.gateway.store import EvaluationFilter, EvaluationStore, MemoryEvaluationStore, SQLiteEvaluationStore
 from src.state import AgentEvaluation, EvaluationState
 from src.agents.base import extract_score
 
@@ -82,6 +108,853 @@ class TestEvaluationResponse:
         assert len(resp.id) == 36  # UUID format
 
 
+# ── JobPool ──────────────────────────────────────────────────────────────
+
+class TestJobPool:
+    def test_job_runs_to_completion(self):
+        async def runner(job):
+            job.mark_stage("brief", "finished")
+            return "eval-1"
+
+        async def scenario():
+            pool = JobPool(runner, workers=1, queue_size=5)
+            pool.start()
+            job = pool.submit("An AI platform for indoor farming")
+            while not job.done:
+                await asyncio.sleep(0.01)
+            await pool.stop()
+            return pool, job
+
+        pool, job = asyncio.run(scenario())
+        assert job.status == SUCCEEDED
+        assert job.evaluation_id == "eval-1"
+        assert job.stages == {"brief": "finished"}
+        assert pool.stats()["succeeded"] == 1
+
+    def test_failure_recorded(self):
+        async def runner(job):
+            raise RuntimeError("backend down")
+
+        async def scenario():
+            pool = JobPool(runner, workers=1, queue_size=5)
+            pool.start()
+            job = pool.submit("An AI platform for indoor farming")
+            while not job.done:
+                await asyncio.sleep(0.01)
+            await pool.stop()
+            return job
+
+        job = asyncio.run(scenario())
+        assert job.status == FAILED
+        assert "backend down" in job.error
+
+    def test_queue_full(self):
+        async def runner(job):
+            return "x"
+
+        async def scenario():
+            # Workers never started, so the queue fills up
+            pool = JobPool(runner, workers=1, queue_size=2)
+            pool.submit("idea one is long enough")
+            pool.submit("idea two is long enough")
+            with pytest.raises(QueueFullError):
+                pool.submit("idea three is long enough")
+            return pool.stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["queue_depth"] == 2
+
+    def test_bounded_workers(self):
+        peak = 0
+        running = 0
+
+        async def runner(job):
+            nonlocal peak, running
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return job.id
+
+        async def scenario():
+            pool = JobPool(runner, workers=2, queue_size=10)
+            pool.start()
+            jobs = [pool.submit(f"idea number {i} here") for i in range(6)]
+            while not all(j.done for j in jobs):
+                await asyncio.sleep(0.01)
+            await pool.stop()
+
+        asyncio.run(scenario())
+        assert peak == 2
+
+
+# ── Durable job queue + workers ──────────────────────────────────────────
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "jobs.db", queue_size=10, lease_seconds=30, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+class TestJobQueue:
+    def test_lease_heartbeat_complete(self, job_queue):
+        job = job_queue.submit("An AI platform for indoor farming")
+        assert job_queue.get(job.id).status == QUEUED
+        leased = job_queue.lease("w1")
+        assert leased.id == job.id and leased.status == RUNNING
+        assert job_queue.lease("w2") is None
+        assert job_queue.heartbeat(job.id, "w1")
+        assert job_queue.mark_stage(job.id, "w1", "market", "finished")
+        assert job_queue.complete(job.id, "w1", "eval-1")
+        done = job_queue.get(job.id)
+        assert (done.status, done.evaluation_id, done.stages) == (SUCCEEDED, "eval-1", {"market": "finished"})
+        assert done.finished_at >= done.started_at >= done.created_at
+
+    def test_queue_full(self, job_queue):
+        job_queue.queue_size = 1
+        job_queue.submit("idea one is long enough")
+        with pytest.raises(QueueFullError):
+            job_queue.submit("idea two is long enough")
+
+    def test_expired_lease_is_requeued(self, job_queue):
+        job = job_queue.submit("An AI platform for indoor farming")
+        job_queue.lease("crashed")
+        job_queue._conn.execute("UPDATE jobs SET lease_expires = 0")
+        assert job_queue.lease("w2").id == job.id
+        # The first worker's late writes are rejected
+        assert not job_queue.heartbeat(job.id, "crashed")
+        assert not job_queue.complete(job.id, "crashed", "eval-x")
+        assert job_queue.complete(job.id, "w2", "eval-2")
+
+    def test_gives_up_after_max_attempts(self, job_queue):
+        job = job_queue.submit("An AI platform for indoor farming")
+        for worker in ("w1", "w2"):
+            job_queue.lease(worker)
+            job_queue._conn.execute("UPDATE jobs SET lease_expires = 0")
+        assert job_queue.requeue_expired() == 0
+        failed = job_queue.get(job.id)
+        assert failed.status == FAILED and "2 attempts" in failed.error
+
+    def test_release_does_not_use_an_attempt(self, job_queue):
+        job = job_queue.submit("An AI platform for indoor farming")
+        for _ in range(3):
+            job_queue.lease("w1")
+            assert job_queue.release(job.id, "w1")
+        assert job_queue.get(job.id).status == QUEUED
+
+    def test_processes_never_double_lease(self, job_queue, tmp_path):
+        job_queue.queue_size = 20
+        for i in range(20):
+            job_queue.submit(f"idea number {i} here")
+        other = SQLiteJobQueue(tmp_path / "jobs.db")  # as a second process would open it
+        leased = []
+
+        def drain(queue, worker_id):
+            while (job := queue.lease(worker_id)) is not None:
+                leased.append(job.id)
+
+        threads = [threading.Thread(target=drain, args=(q, w)) for q, w in ((job_queue, "a"), (other, "b"))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        other.close()
+        assert len(leased) == len(set(leased)) == 20
+
+    def test_stats_report_live_worker_slots(self, job_queue):
+        job_queue.register_worker("w1", "host", concurrency=4)
+        job_queue.submit("idea one is long enough")
+        job_queue.submit("idea two is long enough")
+        job_queue.lease("w1")
+        stats = JobStats(**job_queue.stats())
+        assert (stats.queue_depth, stats.workers, stats.busy_workers) == (1, 4, 1)
+        assert stats.utilisation == 0.25
+
+
+class TestWorker:
+    def test_runs_jobs_into_the_store(self, job_queue):
+        from src.event_sink import NullSink
+        from src.fakestack.transport import fake_async_client
+
+        jobs = [job_queue.submit(f"An AI platform for indoor farming, variant {i}") for i in range(3)]
+        store = MemoryEvaluationStore()
+
+        async def scenario():
+            worker = Worker(job_queue, store, fake_async_client(), concurrency=2, poll_interval=0.01, sink=NullSink())
+            await worker.run(max_jobs=3)
+            return worker
+
+        worker = asyncio.run(scenario())
+        assert worker.completed == 3
+        for job in jobs:
+            done = job_queue.get(job.id)
+            assert done.status == SUCCEEDED
+            assert done.stages["synthesis"] == "finished"
+            assert store.get(done.evaluation_id).startup_idea == job.idea
+        assert job_queue.stats()["workers"] == 0  # unregistered on exit
+
+    def test_stage_updates_never_block_the_event_loop(self, job_queue):
+        from src.event_sink import NullSink
+        from src.fakestack.transport import fake_async_client
+
+        job = job_queue.submit("An AI platform for indoor farming")
+        mark_stage = job_queue.mark_stage
+        calls = []
+
+        def slow_mark_stage(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                time.sleep(0.3)  # as if another process held the jobs.db write lock
+            return mark_stage(*args)
+
+        job_queue.mark_stage = slow_mark_stage
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        async def scenario():
+            tick = asyncio.create_task(ticker())
+            worker = Worker(job_queue, MemoryEvaluationStore(), fake_async_client(), concurrency=1,
+                            poll_interval=0.01, sink=NullSink())
+            await worker.run(max_jobs=1)
+            tick.cancel()
+
+        asyncio.run(scenario())
+        assert max(gaps) < 0.2
+        done = job_queue.get(job.id)
+        assert done.status == SUCCEEDED and done.stages["synthesis"] == "finished"
+
+    def test_stop_releases_in_flight_jobs(self, job_queue):
+        job = job_queue.submit("An AI platform for indoor farming")
+        started = asyncio.Event()
+
+        class Stuck(Worker):
+            async def _execute(self, job):
+                started.set()
+                await asyncio.sleep(60)
+
+        async def scenario():
+            worker = Stuck(job_queue, MemoryEvaluationStore(), None, concurrency=1, poll_interval=0.01)
+            run = asyncio.create_task(worker.run())
+            await started.wait()
+            worker.stop()
+            await asyncio.wait_for(run, 5)
+
+        asyncio.run(scenario())
+        assert job_queue.get(job.id).status == QUEUED
+
+    def test_lost_lease_abandons_the_job(self, job_queue):
+        job = job_queue.submit("An AI platform for indoor farming")
+        job_queue.lease_seconds = 0.03
+        cancelled = asyncio.Event()
+
+        class Slow(Worker):
+            async def _execute(self, job):
+                # Another worker takes over once the lease is stolen below
+                job_queue._conn.execute("UPDATE jobs SET worker_id = 'other'")
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+        async def scenario():
+            worker = Slow(job_queue, MemoryEvaluationStore(), None, concurrency=1, poll_interval=0.01)
+            run = asyncio.create_task(worker.run())
+            await asyncio.wait_for(cancelled.wait(), 5)
+            worker.stop()
+            await run
+            return worker
+
+        worker = asyncio.run(scenario())
+        assert (worker.completed, worker.failed) == (0, 0)
+        assert job_queue.get(job.id).status == RUNNING  # still the other worker's
+
+
+# ── Evaluation stores ────────────────────────────────────────────────────
+
+def _evaluation(i: int, score: float, recommendation: str) -> EvaluationResponse:
+    return EvaluationResponse(
+        id=f"eval-{i:03d}",
+        startup_idea=f"idea {i}",
+        brief="brief",
+        evaluations=[],
+        average_score=score,
+        recommendation=recommendation,
+        final_report="report",
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i),
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        s = MemoryEvaluationStore()
+    else:
+        s = SQLiteEvaluationStore(tmp_path / "evaluations.db")
+    for i in range(5):
+        s.save(_evaluation(i, score=float(i * 2), recommendation="GO" if i >= 3 else "NO-GO"))
+    yield s
+    s.close()
+
+
+class TestEvaluationStore:
+    def test_incomplete_store_fails_when_created(self):
+        class NoList(EvaluationStore):
+            def save(self, evaluation):
+                pass
+
+            def get(self, evaluation_id):
+                return None
+
+        with pytest.raises(TypeError):
+            NoList()
+
+    def test_get_roundtrip(self, store):
+        got = store.get("eval-002")
+        assert got.startup_idea == "idea 2"
+        assert got.final_report == "report"
+
+    def test_get_missing(self, store):
+        assert store.get("nope") is None
+
+    def test_newest_first(self, store):
+        page, _ = store.list()
+        assert [e.id for e in page] == [f"eval-{i:03d}" for i in (4, 3, 2, 1, 0)]
+
+    def test_cursor_pagination(self, store):
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = store.list(limit=2, cursor=cursor)
+            seen += [e.id for e in page]
+            if cursor is None:
+                break
+        assert seen == [f"eval-{i:03d}" for i in (4, 3, 2, 1, 0)]
+
+    def test_filters(self, store):
+        page, _ = store.list(filters=EvaluationFilter(recommendation="GO"))
+        assert {e.id for e in page} == {"eval-003", "eval-004"}
+        page, _ = store.list(filters=EvaluationFilter(min_score=2.0, max_score=6.0))
+        assert {e.id for e in page} == {"eval-001", "eval-002", "eval-003"}
+        since = datetime(2026, 1, 1, 0, 3, tzinfo=timezone.utc)
+        page, _ = store.list(filters=EvaluationFilter(since=since))
+        assert {e.id for e in page} == {"eval-003", "eval-004"}
+
+    def test_invalid_cursor(self, store):
+        with pytest.raises(ValueError):
+            store.list(cursor="not-a-cursor")
+
+    def test_sqlite_durable(self, tmp_path):
+        path = tmp_path / "durable.db"
+        first = SQLiteEvaluationStore(path)
+        first.save(_evaluation(1, 7.0, "GO"))
+        first.close()
+        reopened = SQLiteEvaluationStore(path)
+        assert reopened.get("eval-001").average_score == 7.0
+        reopened.close()
+
+
+# ── Singleflight coalescing ──────────────────────────────────────────────
+
+class TestCoalescing:
+    def test_key_normalises_idea(self):
+        assert coalesce_key("AI  farming\nplatform") == coalesce_key("ai farming platform")
+
+    def test_key_includes_fingerprints(self):
+        assert coalesce_key("idea", "model-a") != coalesce_key("idea", "model-b")
+
+    def test_concurrent_duplicates_share_execution(self):
+        calls = 0
+
+        async def execute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return object()
+
+        async def scenario():
+            flight = SingleFlight(calls_per_execution=6)
+            results = await asyncio.gather(*(flight.do("k", execute) for _ in range(3)))
+            return flight, results
+
+        flight, results = asyncio.run(scenario())
+        assert calls == 1
+        assert results[0] is results[1] is results[2]
+        assert flight.stats() == {
+            "in_flight": 0, "executions": 1, "coalesced": 2, "llm_calls_saved": 12,
+        }
+
+    def test_errors_reach_all_waiters(self):
+        async def execute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("pipeline failed")
+
+        async def scenario():
+            flight = SingleFlight()
+            return await asyncio.gather(
+                flight.do("k", execute), flight.do("k", execute), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_sequential_calls_not_coalesced(self):
+        async def execute():
+            return 1
+
+        async def scenario():
+            flight = SingleFlight()
+            await flight.do("k", execute)
+            await flight.do("k", execute)
+            return flight.stats()
+
+        assert asyncio.run(scenario())["executions"] == 2
+
+
+# ── Model-affinity scheduling ────────────────────────────────────────────
+
+async def _turns(scheduler, models, order, duration=0.01):
+    """Run one turn per model in ``models`` concurrently, recording admission order."""
+    async def turn(model):
+        async with scheduler.turn(model):
+            order.append(model)
+            await asyncio.sleep(duration)
+
+    await asyncio.gather(*(turn(m) for m in models))
+
+
+class TestModelScheduler:
+    def test_groups_turns_by_model(self):
+        scheduler = ModelScheduler(slots=2)
+        order = []
+        asyncio.run(_turns(scheduler, ["3b", "8b", "3b", "8b", "3b", "8b"], order))
+        assert order == ["3b", "3b", "3b", "8b", "8b", "8b"]
+        stats = scheduler.stats()
+        assert stats["swaps"] == 1
+        assert stats["turns"] == {"3b": 3, "8b": 3}
+        assert stats["active"] == 0 and stats["waiting"] == {}
+
+    def test_max_batch_bounds_a_run_on_one_model(self):
+        scheduler = ModelScheduler(slots=1, max_batch=2)
+        order = []
+        asyncio.run(_turns(scheduler, ["3b", "3b", "3b", "8b", "3b"], order))
+        assert order == ["3b", "3b", "8b", "3b", "3b"]
+        assert scheduler.stats()["forced_swaps"] == 1
+
+    def test_max_wait_forces_a_switch(self):
+        scheduler = ModelScheduler(slots=1, max_batch=100, max_wait=0.02)
+
+        async def scenario(order):
+            async def stream_of_3b():
+                for _ in range(10):
+                    await _turns(scheduler, ["3b"], order)
+
+            async def one_8b():
+                await asyncio.sleep(0.005)
+                await _turns(scheduler, ["8b"], order)
+
+            await asyncio.gather(stream_of_3b(), one_8b())
+
+        order = []
+        asyncio.run(scenario(order))
+        assert order.index("8b") < 9
+
+    def test_cancelled_waiter_frees_nothing_and_blocks_nothing(self):
+        scheduler = ModelScheduler(slots=1)
+
+        async def scenario():
+            order = []
+            running = asyncio.create_task(_turns(scheduler, ["3b"], order, duration=0.05))
+            await asyncio.sleep(0)
+            waiting = asyncio.create_task(_turns(scheduler, ["8b"], order))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.gather(running, waiting, return_exceptions=True)
+            await _turns(scheduler, ["3b"], order)
+            return order
+
+        assert asyncio.run(scenario()) == ["3b", "3b"]
+        assert scheduler.stats()["active"] == 0
+        assert scheduler.stats()["swaps"] == 0
+
+    def test_pipelines_run_through_scheduler(self, monkeypatch):
+        from src.agents.base import turn_scheduler
+        from src.fakestack.transport import fake_async_client
+        from src.pipeline import run_pipeline_async
+        from src.event_sink import NullSink
+
+        monkeypatch.setattr("src.agents.base.AGENT_POOL", "off")
+        scheduler = ModelScheduler(slots=4)
+
+        async def scenario():
+            client = fake_async_client()
+            turn_scheduler.set(scheduler)
+            ideas = [f"An AI platform for indoor farming, variant {i}" for i in range(3)]
+            return await asyncio.gather(*(run_pipeline_async(client, idea, sink=NullSink()) for idea in ideas))
+
+        states = asyncio.run(scenario())
+        assert all(state.final_report for state in states)
+        stats = scheduler.stats()
+        # brief + synthesis on the coordinator model, four specialists on the other
+        assert sorted(stats["turns"].values()) == [6, 12]
+        assert stats["active"] == 0 and stats["waiting"] == {}
+
+
+# ── Shared client ───────────────────────────────────────────────────────
+
+class TestSharedClient:
+    def test_client_is_shared(self):
+        try:
+            assert client_module.get_client() is client_module.get_client()
+        finally:
+            client_module.close_client()
+
+    def test_close_builds_fresh_client(self):
+        first = client_module.get_client()
+        client_module.close_client()
+        try:
+            assert client_module.get_client() is not first
+        finally:
+            client_module.close_client()
+
+    def test_connection_stats_reuse_ratio(self):
+        stats = client_module.ConnectionStats()
+        for _ in range(4):
+            stats.record_request()
+        stats.record_connection()
+        snapshot = stats.as_dict()
+        assert snapshot["reused"] == 3
+        assert snapshot["reuse_ratio"] == pytest.approx(0.75)
+
+    def test_connection_stats_empty(self):
+        assert client_module.ConnectionStats().as_dict()["reuse_ratio"] == 0.0
+
+
+# ── Load balancing ───────────────────────────────────────────────────────
+
+class _Hosts(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Routes by host to one in-process fake LlamaStack each; ``down`` hosts refuse connections."""
+
+    def __init__(self, *hosts: str):
+        self.stacks = {host: FakeLlamaStack() for host in hosts}
+        self.down: set[str] = set()
+
+    def _transport(self, request):
+        if request.url.host in self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        return FakeTransport(self.stacks[request.url.host], realtime=False)
+
+    def handle_request(self, request):
+        return self._transport(request).handle_request(request)
+
+    async def handle_async_request(self, request):
+        return await self._transport(request).handle_async_request(request)
+
+
+def _balanced(policy="least-outstanding"):
+    hosts = _Hosts("a", "b")
+    balancer = Balancer(["http://a:8321", "http://b:8321"], policy=policy, eject_after=2, eject_seconds=60)
+    http = httpx.Client(transport=BalancingTransport(balancer, hosts))
+    return hosts, balancer, LlamaStackClient(base_url="http://a:8321", http_client=http, max_retries=0)
+
+
+class TestLoadBalancing:
+    def test_sessions_stay_on_their_backend(self):
+        hosts, balancer, client = _balanced()
+        for _ in range(3):  # pooled agents and sessions are reused across runs
+            state = run_pipeline(client, "An AI platform for indoor farming", concurrent=True, sink=NullSink())
+            # A turn routed to the wrong backend would 404 on its unknown session
+            assert len(state.evaluations) == 4 and not state.errors
+        turns = [hosts.stacks[h].requests["turn"] for h in "ab"]
+        assert min(turns) >= sum(turns) // 3
+        assert all(b["outstanding"] == 0 for b in balancer.stats()["backends"])
+
+    def test_async_sessions_stay_on_their_backend(self):
+        hosts = _Hosts("a", "b")
+        balancer = Balancer(["http://a:8321", "http://b:8321"])
+        http = httpx.AsyncClient(transport=AsyncBalancingTransport(balancer, hosts))
+        client = AsyncLlamaStackClient(base_url="http://a:8321", http_client=http, max_retries=0)
+
+        async def runs():
+            for _ in range(3):
+                state = await run_pipeline_async(client, "An AI platform for indoor farming", sink=NullSink())
+                assert len(state.evaluations) == 4 and not state.errors
+
+        asyncio.run(runs())
+        turns = [hosts.stacks[h].requests["turn"] for h in "ab"]
+        assert min(turns) >= sum(turns) // 3
+
+    def test_sessions_move_off_an_ejected_backend(self):
+        hosts, balancer, client = _balanced()
+        run_pipeline(client, "An AI platform for indoor farming", sink=NullSink())
+        hosts.down.add("b")
+        balancer.check_health(httpx.Client(transport=hosts))
+        turns_on_b = hosts.stacks["b"].requests["turn"]
+        state = run_pipeline(client, "An AI platform for indoor farming", sink=NullSink())
+        assert len(state.evaluations) == 4 and not state.errors
+        assert hosts.stacks["b"].requests["turn"] == turns_on_b
+
+    def test_agents_are_created_on_a_readmitted_backend(self):
+        hosts, balancer, client = _balanced()
+        hosts.down.add("b")
+        balancer.check_health(httpx.Client(transport=hosts))
+        agent = create_agent(client, "ollama/llama3.2:3b", "You are terse.")
+        hosts.down.clear()
+        balancer.check_health(httpx.Client(transport=hosts))
+        for _ in range(4):
+            session_id = agent.create_session("s")
+            agent.create_turn(messages=[{"role": "user", "content": "hi"}], session_id=session_id, stream=False)
+        assert all(hosts.stacks[h].requests["turn"] == 2 for h in "ab")
+
+    def test_registrations_reach_every_backend(self):
+        hosts, _, client = _balanced()
+        ensure_shield_registered(client)
+        assert all(hosts.stacks[h].requests["shield"] >= 2 for h in "ab")
+        assert all(len(client.shields.list()) == 1 for _ in range(2))
+
+    def test_broadcast_skips_an_unreachable_backend(self):
+        hosts, balancer, client = _balanced()
+        hosts.down.add("b")  # not ejected yet, so still broadcast to
+        ensure_shield_registered(client)
+        assert hosts.stacks["a"].requests["shield"] >= 2
+        assert all(b["outstanding"] == 0 for b in balancer.stats()["backends"])
+        hosts.down.add("a")
+        with pytest.raises(APIConnectionError):
+            client.shields.list()
+
+    def test_least_outstanding(self):
+        balancer = Balancer(["http://a:1", "http://b:1"])
+        busy = balancer.backends[0]
+        balancer.started(busy)
+        request = httpx.Request("POST", "http://x/v1/safety/run-shield")
+        assert {balancer.targets(request)[0].url.host for _ in range(4)} == {"b"}
+        balancer.finished(busy)
+        assert {balancer.targets(request)[0].url.host for _ in range(4)} == {"a", "b"}
+
+    def test_ewma_prefers_the_faster_backend(self):
+        balancer = Balancer(["http://a:1", "http://b:1"], policy="ewma")
+        slow, fast = balancer.backends
+        balancer.responded(slow, 1.0, ok=True)
+        balancer.responded(fast, 0.1, ok=True)
+        request = httpx.Request("POST", "http://x/v1/scoring/score")
+        assert balancer.targets(request) == [fast]
+        for _ in range(10):
+            balancer.started(fast)  # 0.1 x 11 in flight now costs more than 1.0 x 1
+        assert balancer.targets(request) == [slow]
+
+    def test_failing_backend_is_ejected_and_readmitted(self):
+        hosts, balancer, client = _balanced()
+        hosts.down.add("b")
+        for _ in range(6):
+            try:
+                client.models.list()
+            except APIConnectionError:
+                pass
+        backends = {b["url"]: b for b in balancer.stats()["backends"]}
+        assert backends["http://b:8321"]["healthy"] is False
+        assert backends["http://b:8321"]["ejections"] == 1
+        client.models.list()  # only a is eligible now
+        hosts.down.clear()
+        balancer.check_health(httpx.Client(transport=hosts))
+        assert all(b["healthy"] for b in balancer.stats()["backends"])
+
+    def test_close_stops_health_checks(self):
+        balancer = Balancer(["http://a:1", "http://b:1"])
+        balancer.start_health_checks(interval=60)
+        thread = balancer._health_thread
+        balancer.close()
+        assert not thread.is_alive()
+
+    def test_closing_the_shared_clients_stops_the_balancer(self, monkeypatch):
+        monkeypatch.setattr(client_module, "LLAMASTACK_URLS", ["http://a:8321", "http://b:8321"])
+        client_module.get_client()
+        thread = client_module._balancer._health_thread
+        client_module.close_client()
+        assert client_module._balancer is None and not thread.is_alive()
+
+        client_module.get_async_client()
+        thread = client_module._balancer._health_thread
+        asyncio.run(client_module.aclose_async_client())
+        assert client_module._balancer is None and not thread.is_alive()
+
+    def test_streams_count_as_outstanding_until_closed(self):
+        _, balancer, client = _balanced()
+        agent = create_agent(client, "ollama/llama3.2:3b", "You are terse.")
+        session_id = agent.create_session("s")
+        pinned = balancer.session(session_id).backend
+        stream = agent.create_turn(messages=[{"role": "user", "content": "hi"}], session_id=session_id, stream=True)
+        next(iter(stream))
+        assert pinned.outstanding == 1
+        for _ in stream:
+            pass
+        assert pinned.outstanding == 0
+
+
+# ── Adaptive concurrency limits ──────────────────────────────────────────
+
+def _connection_error() -> APIConnectionError:
+    return APIConnectionError(request=httpx.Request("POST", "http://stack/v1/safety/run-shield"))
+
+
+class TestAdaptiveLimiter:
+    def test_limit_grows_while_fast_and_in_use(self):
+        limiter = AdaptiveLimiter("t", initial=2, max_limit=8)
+        for _ in range(20):
+            with limiter.acquire(), limiter.acquire():
+                pass
+        assert 2 < limiter.limit <= 8
+        assert limiter.stats()["increases"] > 0
+
+    def test_idle_limit_does_not_grow(self):
+        limiter = AdaptiveLimiter("t", initial=4)
+        for _ in range(20):
+            with limiter.acquire():
+                pass
+        assert limiter.stats()["increases"] == 0
+
+    def test_slow_or_failing_calls_back_off(self):
+        limiter = AdaptiveLimiter("t", initial=10, backoff=0.5)
+        with limiter.acquire():
+            pass  # sets a near-zero baseline
+        with limiter.acquire():
+            time.sleep(0.02)
+        assert limiter.limit == 5
+        limiter._last_decrease = 0.0
+        with pytest.raises(APIConnectionError), limiter.acquire():
+            raise _connection_error()
+        assert limiter.limit == 2.5 and limiter.stats()["decreases"] == 2
+        with pytest.raises(ValueError), limiter.acquire():
+            raise ValueError("not the backend's fault")
+        assert limiter.limit == 2.5 and limiter.in_flight == 0
+
+    def test_one_decrease_per_baseline_for_a_burst(self):
+        limiter = AdaptiveLimiter("t", initial=10, backoff=0.5)
+        limiter.baseline = 60.0
+        for _ in range(3):
+            with pytest.raises(APIConnectionError), limiter.acquire():
+                raise _connection_error()
+        assert limiter.limit == 5
+
+    def test_never_below_min(self):
+        limiter = AdaptiveLimiter("t", initial=2, min_limit=2, backoff=0.1)
+        with pytest.raises(APIConnectionError), limiter.acquire():
+            raise _connection_error()
+        assert limiter.limit == 2
+
+    def test_threads_stay_within_limit(self):
+        limiter = AdaptiveLimiter("t", initial=2, max_limit=2)
+        in_flight = peak = 0
+        lock = threading.Lock()
+
+        def call():
+            nonlocal in_flight, peak
+            with limiter.acquire():
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                time.sleep(0.01)
+                with lock:
+                    in_flight -= 1
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = limiter.stats()
+        assert peak == 2 and stats["admitted"] == 8 and stats["queued"] >= 6
+        assert stats["queue_time_max_ms"] > 0
+
+    def test_queues_in_order_then_sheds(self):
+        limiter = AdaptiveLimiter("t", initial=1, max_limit=1, max_queue=2, queue_timeout=5)
+        order = []
+
+        async def call(name: str, hold: float = 0.0):
+            async with limiter.acquire_async():
+                order.append(name)
+                await asyncio.sleep(hold)
+
+        async def scenario():
+            first = asyncio.create_task(call("a", hold=0.05))
+            await asyncio.sleep(0)
+            queued = [asyncio.create_task(call(n)) for n in "bc"]
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError, match="already queued"):
+                await call("d")
+            await asyncio.gather(first, *queued)
+
+        asyncio.run(scenario())
+        assert order == ["a", "b", "c"]
+        assert limiter.stats()["shed"] == 1 and limiter.stats()["queue_depth"] == 0
+
+    def test_queue_timeout_sheds(self):
+        limiter = AdaptiveLimiter("t", initial=1, max_limit=1, queue_timeout=0.02)
+
+        async def scenario():
+            async with limiter.acquire_async():
+                with pytest.raises(OverloadedError, match="no capacity"):
+                    async with limiter.acquire_async():
+                        pass
+
+        asyncio.run(scenario())
+        assert limiter.stats()["shed"] == 1 and limiter.in_flight == 0
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = AdaptiveLimiter("t", initial=1, max_limit=1)
+
+        async def scenario():
+            async with limiter.acquire_async():
+                waiter = asyncio.create_task(limiter.acquire_async().__aenter__())
+                await asyncio.sleep(0)
+                waiter.cancel()
+                await asyncio.gather(waiter, return_exceptions=True)
+                assert limiter.stats()["queue_depth"] == 0
+            async with limiter.acquire_async():
+                pass
+
+        asyncio.run(scenario())
+        assert limiter.in_flight == 0
+
+    def test_wraps_pipeline_calls_when_enabled(self, monkeypatch):
+        from src.fakestack.transport import fake_client
+        from src.limiter import limiter_stats
+
+        monkeypatch.setattr("src.limiter.ADAPTIVE_LIMIT", "on")
+        monkeypatch.setattr("src.limiter._limiters", {})
+        run_pipeline(fake_client(), "An AI platform for indoor farming", concurrent=True, sink=NullSink())
+        stats = limiter_stats()
+        assert stats["turn"]["admitted"] >= 5 and stats["turn"]["in_flight"] == 0
+        assert stats["turn"]["baseline_ms"] is not None
+
+    def test_shed_request_gets_503(self, monkeypatch):
+        from src.gateway import server
+
+        async def overloaded(idea):
+            raise OverloadedError("turn limiter: 256 calls already queued")
+
+        monkeypatch.setattr(server, "_evaluate_once", overloaded)
+        server.app.dependency_overrides[server.rate_limiter] = lambda: None
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=server.app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as http:
+                return await http.post("/evaluate", json={"idea": "An AI platform for indoor farming"})
+
+        try:
+            response = asyncio.run(scenario())
+        finally:
+            server.app.dependency_overrides.pop(server.rate_limiter, None)
+        assert response.status_code == 503 and response.headers["retry-after"] == "5"
+
+
 # ── EvaluationState ──────────────────────────────────────────────────────
 
 class TestEvaluationState:
@@ -118,3 +991,96 @@ class TestExtractScore:
 
     def test_bare_fraction(self):
         assert extract_score("I give it 8/10 overall") == 8.0
+
+
+# ── Streaming endpoint ──────────────────────────────────────────────────
+
+class TestEvaluateStream:
+    def test_streams_events_and_stores_result(self, monkeypatch):
+        import httpx
+
+        from src.fakestack.transport import fake_async_client
+        from src.gateway import server
+
+        store = MemoryEvaluationStore()
+        monkeypatch.setattr(server, "client", fake_async_client())
+        monkeypatch.setattr(server, "store", store)
+        server.app.dependency_overrides[server.rate_limiter] = lambda: None
+
+        async def scenario() -> str:
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as http:
+                response = await http.post("/evaluate/stream", json={"idea": "An AI platform for indoor farming"})
+                assert response.headers["content-type"].startswith("text/event-stream")
+                return response.text
+
+        try:
+            body = asyncio.run(scenario())
+        finally:
+            server.app.dependency_overrides.pop(server.rate_limiter, None)
+        frames = [frame for frame in body.split("\n\n") if frame]
+        names = [frame.split("\n")[0].removeprefix("event: ") for frame in frames]
+        assert names[0] == "stage_started" and names[-1] == "final_report"
+        assert "token" in names and names.count("stage_finished") == 6
+        final = json.loads(frames[-1].split("data: ", 1)[1])
+        assert store.get(final["evaluation_id"]).recommendation == final["recommendation"]
+
+
+class TestGatewayServer:
+    def test_health_answers_while_the_job_queue_is_locked(self, monkeypatch, job_queue):
+        import sqlite3
+
+        from src.gateway import server
+
+        monkeypatch.setattr(server, "job_pool", job_queue)
+        server.app.dependency_overrides[server.rate_limiter] = lambda: None
+        other = sqlite3.connect(job_queue.path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")  # as a worker process holding the write lock
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as http:
+                submit = asyncio.create_task(http.post("/jobs", json={"idea": "An AI platform for indoor farming"}))
+                await asyncio.sleep(0.05)
+                started = time.perf_counter()
+                health = await http.get("/health")
+                elapsed = time.perf_counter() - started
+                assert not submit.done()
+                other.execute("COMMIT")
+                return health, elapsed, await submit
+
+        try:
+            health, elapsed, submitted = asyncio.run(scenario())
+        finally:
+            server.app.dependency_overrides.pop(server.rate_limiter, None)
+            other.close()
+        assert health.status_code == 200 and elapsed < 1.0
+        assert submitted.status_code == 202
+
+    def test_import_opens_no_store_or_client(self, tmp_path):
+        env = {**os.environ, "EVALUATION_STORE": "sqlite", "EVALUATION_DB_PATH": str(tmp_path / "evaluations.db")}
+        code = "from src.gateway import server; assert server.store is None and server.client is None"
+        subprocess.run([sys.executable, "-c", code], env=env, check=True, cwd=Path(__file__).resolve().parent.parent)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_lists_and_gets_stored_evaluations(self, monkeypatch):
+        from src.gateway import server
+
+        store = MemoryEvaluationStore()
+        for i in range(3):
+            store.save(_evaluation(i, score=float(i), recommendation="GO"))
+        monkeypatch.setattr(server, "store", store)
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as http:
+                listed = await http.get("/evaluations", params={"limit": 2})
+                got = await http.get("/evaluations/eval-001")
+                missing = await http.get("/evaluations/nope")
+                return listed, got, missing
+
+        listed, got, missing = asyncio.run(scenario())
+        assert [e["id"] for e in listed.json()] == ["eval-002", "eval-001"]
+        assert listed.headers["x-next-cursor"]
+        assert got.json()["average_score"] == 1.0
+        assert missing.status_code == 404